@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Literal
+
+from .synthetic import RasterSpec, VectorSpec
+
+RASTER_DATASETS: list[RasterSpec] = [
+    RasterSpec("raster_1024_1b_byte", 1024, 1024),
+    RasterSpec("raster_4096_3b_byte", 4096, 4096, bands=3),
+    RasterSpec("raster_4096_1b_float32", 4096, 4096, dtype="Float32"),
+    RasterSpec(
+        "raster_4096_4b_uint16_striped",
+        4096,
+        4096,
+        bands=4,
+        dtype="UInt16",
+        tiled=False,
+    ),
+    RasterSpec(
+        "raster_8192_1b_int16_deflate", 8192, 8192, dtype="Int16", compress="DEFLATE"
+    ),
+]
+
+VECTOR_DATASETS: list[VectorSpec] = [
+    VectorSpec("points_100k", {"point": 100_000}),
+    VectorSpec("lines_20k_64v", {"line": 20_000}, vertices=64),
+    VectorSpec("polygons_20k_32v", {"polygon": 20_000}, vertices=32),
+    VectorSpec(
+        "mixed_9_layers",
+        {"point": 10_000, "line": 5_000, "polygon": 5_000},
+        copies=3,
+    ),
+]
+
+
+@dataclass(frozen=True)
+class AlgorithmCase:
+    """Входные данные и параметры, на которых замеряется алгоритм."""
+
+    input_kind: Literal["raster", "vector"]
+    params: dict
+
+
+# Параметры бенчмарка для каждого зарегистрированного алгоритма. Алгоритм без
+# записи здесь попадает в отчёт как пропущенный.
+ALGORITHM_CASES: dict[str, AlgorithmCase] = {
+    # Окно 10x10 км от верхнего левого угла синтетических растров (synthetic.py)
+    "RASTER_CLIP": AlgorithmCase(
+        "raster", {"bbox": [4_180_000.0, 7_500_000.0, 4_190_000.0, 7_510_000.0]}
+    ),
+    "RASTER_MOSAIC": AlgorithmCase("raster", {"srs_def": "EPSG:3857"}),
+    "RASTER_RESCALE": AlgorithmCase("raster", {"xres": 20.0, "yres": 20.0}),
+    "RASTER_STATS": AlgorithmCase("raster", {"histogram_bins": 256}),
+    "RASTER_TILES": AlgorithmCase("raster", {"min_zoom": 8, "processes": 4}),
+    "RASTER_TRANSFORM": AlgorithmCase("raster", {"srs_def": "EPSG:4326"}),
+    "RASTER_TRANSLATE": AlgorithmCase(
+        "raster",
+        {
+            "bands": [1],
+            "output_type": "Byte",
+            "scale": "auto",
+            "creation_options": {"COMPRESS": "DEFLATE", "TILED": "YES"},
+        },
+    ),
+    "VECTOR_SIMPLIFY": AlgorithmCase("vector", {"tolerance": 50.0, "xy_res": 0.01}),
+    "VECTOR_TRANSFORM": AlgorithmCase("vector", {"srs_def": "EPSG:4326"}),
+}
@@ -0,0 +1,14 @@
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Возвращает описания регрессий по времени и пиковой памяти."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None or "error" in result or "error" in base:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            if base.get(metric) and result[metric] > base[metric] * (1 + tolerance):
+                change = (result[metric] / base[metric] - 1) * 100
+                regressions.append(
+                    f"{key}: {metric} {base[metric]} -> {result[metric]} (+{change:.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,163 @@
+"""Микро-бенчмарки алгоритмов обработки на синтетических геоданных.
+
+Запуск из каталога backend:
+
+    python -m benchmarks.run                     # все алгоритмы и наборы данных
+    python -m benchmarks.run --quick             # по одному набору каждого вида
+    python -m benchmarks.run --save-baseline     # сохранить результаты как эталон
+
+Каждый замер выполняется в отдельном процессе, поэтому пиковый RSS относится
+к одному запуску алгоритма. Код возврата 1 означает регрессию относительно
+эталона больше допустимой.
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from src.services.algorithms import AlgorithmAbstractFactory
+from src.services.profiling import peak_rss_bytes, reset_peak_rss
+
+from .cases import ALGORITHM_CASES, RASTER_DATASETS, VECTOR_DATASETS
+from .regressions import compare
+from .synthetic import RasterSpec, VectorSpec, make_raster, make_vector
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+_MB = 1024 * 1024
+
+
+def _run_once(conn, algorithm_name: str, data: bytes, ext: str, params: dict) -> None:
+    """Тело дочернего процесса: один запуск алгоритма с замером времени и памяти."""
+    try:
+        algorithm = AlgorithmAbstractFactory.get_algorithm(algorithm_name)
+        validated = algorithm.get_pydantic_model().model_validate(params)
+        reset_peak_rss()
+        started = time.perf_counter()
+        output = algorithm.run(data, file_ext=ext, params=validated)
+        seconds = time.perf_counter() - started
+        conn.send(
+            {
+                "seconds": seconds,
+                "peak_rss_bytes": peak_rss_bytes(),
+                "output_bytes": len(output),
+            }
+        )
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def _measure(algorithm_name: str, data: bytes, ext: str, params: dict) -> dict:
+    # fork: входные байты наследуются дочерним процессом без сериализации
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_run_once, args=(child_conn, algorithm_name, data, ext, params)
+    )
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"error": f"процесс завершился с кодом {process.exitcode}"}
+    process.join()
+    return result
+
+
+def run_case(
+    algorithm_name: str,
+    dataset: RasterSpec | VectorSpec,
+    data: bytes,
+    params: dict,
+    repeats: int,
+) -> dict:
+    """Замеряет алгоритм на наборе данных `repeats` раз и возвращает медианы."""
+    runs = [_measure(algorithm_name, data, dataset.ext, params) for _ in range(repeats)]
+    errors = [run["error"] for run in runs if "error" in run]
+    if errors:
+        return {"error": errors[0]}
+
+    seconds = statistics.median(run["seconds"] for run in runs)
+    result = {
+        "seconds": round(seconds, 4),
+        "input_mb": round(len(data) / _MB, 2),
+        "output_mb": round(runs[0]["output_bytes"] / _MB, 2),
+        "mb_per_s": round(len(data) / _MB / seconds, 2) if seconds else None,
+        "peak_rss_mb": round(max(run["peak_rss_bytes"] for run in runs) / _MB, 1),
+    }
+    if isinstance(dataset, VectorSpec):
+        result["features_per_s"] = (
+            round(dataset.total_features / seconds) if seconds else None
+        )
+    return result
+
+
+def _datasets(kind: str, quick: bool) -> list[RasterSpec] | list[VectorSpec]:
+    datasets = RASTER_DATASETS if kind == "raster" else VECTOR_DATASETS
+    return datasets[:1] if quick else datasets
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithm", action="append", help="Только эти алгоритмы")
+    parser.add_argument("--quick", action="store_true", help="Малые наборы данных")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    selected = {name.upper() for name in args.algorithm or []}
+    inputs: dict[str, bytes] = {}
+    results: dict[str, dict] = {}
+
+    for algorithm_name in sorted(AlgorithmAbstractFactory.registry):
+        if selected and algorithm_name not in selected:
+            continue
+        case = ALGORITHM_CASES.get(algorithm_name)
+        if case is None:
+            print(f"{algorithm_name}: пропущен, нет записи в ALGORITHM_CASES")
+            continue
+        for dataset in _datasets(case.input_kind, args.quick):
+            if dataset.name not in inputs:
+                inputs[dataset.name] = (
+                    make_raster(dataset)
+                    if isinstance(dataset, RasterSpec)
+                    else make_vector(dataset)
+                )
+            key = f"{algorithm_name}/{dataset.name}"
+            results[key] = run_case(
+                algorithm_name,
+                dataset,
+                inputs[dataset.name],
+                case.params,
+                args.repeats,
+            )
+            print(f"{key}: {results[key]}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"Эталон сохранён в {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("Эталон не найден, сравнение пропущено")
+        return 0
+
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.tolerance
+    )
+    for line in regressions:
+        print(f"РЕГРЕССИЯ {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
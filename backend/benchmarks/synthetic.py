@@ -0,0 +1,159 @@
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+
+from osgeo import gdal, ogr, osr  # pyright: ignore[reportMissingImports]
+
+# Начало координат синтетических данных в EPSG:3857 (окрестности Москвы)
+_ORIGIN_X = 4_180_000.0
+_ORIGIN_Y = 7_510_000.0
+
+_GEOMETRY_TYPES = {
+    "point": ogr.wkbPoint,
+    "line": ogr.wkbLineString,
+    "polygon": ogr.wkbPolygon,
+}
+
+
+@dataclass(frozen=True)
+class RasterSpec:
+    """Параметры синтетического GeoTIFF."""
+
+    name: str
+    width: int
+    height: int
+    bands: int = 1
+    dtype: str = "Byte"
+    tiled: bool = True
+    block_size: int = 256
+    pixel_size: float = 10.0
+    epsg: int = 3857
+    compress: str | None = None
+
+    @property
+    def ext(self) -> str:
+        return "tif"
+
+
+@dataclass(frozen=True)
+class VectorSpec:
+    """Параметры синтетического GeoPackage: слой на каждый тип геометрии.
+
+    `layers` задаёт число объектов в слое по типу геометрии
+    ("point", "line", "polygon"); `copies` повторяет набор слоёв.
+    """
+
+    name: str
+    layers: dict[str, int] = field(default_factory=dict)
+    copies: int = 1
+    vertices: int = 16
+    extent: float = 50_000.0
+    epsg: int = 3857
+
+    @property
+    def ext(self) -> str:
+        return "gpkg"
+
+    @property
+    def total_features(self) -> int:
+        return sum(self.layers.values()) * self.copies
+
+
+def _read_vsimem(path: str) -> bytes:
+    f = gdal.VSIFOpenL(path, "rb")
+    gdal.VSIFSeekL(f, 0, 2)
+    size = gdal.VSIFTellL(f)
+    gdal.VSIFSeekL(f, 0, 0)
+    data = gdal.VSIFReadL(1, size, f)
+    gdal.VSIFCloseL(f)
+    gdal.Unlink(path)
+    return data
+
+
+def make_raster(spec: RasterSpec, seed: int = 0) -> bytes:
+    """Генерирует GeoTIFF по спецификации и возвращает его байты.
+
+    Пиксели заполняются псевдослучайным шумом полосами по высоте блока,
+    поэтому генерация не требует памяти на весь растр.
+    """
+    dtype = gdal.GetDataTypeByName(spec.dtype)
+    pixel_bytes = gdal.GetDataTypeSize(dtype) // 8
+    options = [f"TILED={'YES' if spec.tiled else 'NO'}", "BIGTIFF=IF_SAFER"]
+    if spec.tiled:
+        options += [f"BLOCKXSIZE={spec.block_size}", f"BLOCKYSIZE={spec.block_size}"]
+    if spec.compress:
+        options.append(f"COMPRESS={spec.compress}")
+
+    path = f"/vsimem/{uuid.uuid4().hex}.tif"
+    ds = gdal.GetDriverByName("GTiff").Create(
+        path, spec.width, spec.height, spec.bands, dtype, options=options
+    )
+    ds.SetGeoTransform(
+        (_ORIGIN_X, spec.pixel_size, 0.0, _ORIGIN_Y, 0.0, -spec.pixel_size)
+    )
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(spec.epsg)
+    ds.SetProjection(srs.ExportToWkt())
+
+    rng = random.Random(seed)
+    rows = spec.block_size if spec.tiled else 64
+    for band_index in range(1, spec.bands + 1):
+        band = ds.GetRasterBand(band_index)
+        for y in range(0, spec.height, rows):
+            h = min(rows, spec.height - y)
+            band.WriteRaster(
+                0, y, spec.width, h, rng.randbytes(spec.width * h * pixel_bytes)
+            )
+    ds = None
+    return _read_vsimem(path)
+
+
+def _geometry(kind: str, rng: random.Random, spec: VectorSpec) -> ogr.Geometry:
+    cx = _ORIGIN_X + rng.uniform(0, spec.extent)
+    cy = _ORIGIN_Y - rng.uniform(0, spec.extent)
+    if kind == "point":
+        geom = ogr.Geometry(ogr.wkbPoint)
+        geom.AddPoint_2D(cx, cy)
+        return geom
+    if kind == "line":
+        geom = ogr.Geometry(ogr.wkbLineString)
+        for i in range(spec.vertices):
+            geom.AddPoint_2D(cx + i * 25.0, cy + rng.uniform(-25.0, 25.0))
+        return geom
+
+    ring = ogr.Geometry(ogr.wkbLinearRing)
+    for i in range(spec.vertices):
+        angle = 2 * math.pi * i / spec.vertices
+        radius = rng.uniform(80.0, 120.0)
+        ring.AddPoint_2D(cx + radius * math.cos(angle), cy + radius * math.sin(angle))
+    ring.CloseRings()
+    geom = ogr.Geometry(ogr.wkbPolygon)
+    geom.AddGeometry(ring)
+    return geom
+
+
+def make_vector(spec: VectorSpec, seed: int = 0) -> bytes:
+    """Генерирует GeoPackage по спецификации и возвращает его байты."""
+    path = f"/vsimem/{uuid.uuid4().hex}.gpkg"
+    ds = gdal.GetDriverByName("GPKG").Create(path, 0, 0, 0, gdal.GDT_Unknown)
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(spec.epsg)
+    rng = random.Random(seed)
+
+    for copy in range(spec.copies):
+        for kind, count in spec.layers.items():
+            layer = ds.CreateLayer(f"{kind}_{copy}", srs, _GEOMETRY_TYPES[kind])
+            layer.CreateField(ogr.FieldDefn("name", ogr.OFTString))
+            layer.CreateField(ogr.FieldDefn("value", ogr.OFTReal))
+            defn = layer.GetLayerDefn()
+            layer.StartTransaction()
+            for i in range(count):
+                feature = ogr.Feature(defn)
+                feature.SetField("name", f"{kind}-{i}")
+                feature.SetField("value", rng.random())
+                feature.SetGeometry(_geometry(kind, rng, spec))
+                layer.CreateFeature(feature)
+            layer.CommitTransaction()
+    ds = None
+    return _read_vsimem(path)
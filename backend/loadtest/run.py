@@ -0,0 +1,232 @@
+"""Сквозной нагрузочный тест: POST /api/task -> воркер -> file_storage -> БД.
+
+Загружает входной файл в file_storage (или его заглушку), затем создаёт задачи
+с заданной частотой по открытой модели (темп не зависит от скорости ответов)
+и опрашивает их до завершения:
+
+    python -m loadtest.run --input sample.tif --algorithm RASTER_TRANSFORM \\
+        --params '{"srs_def": "EPSG:4326"}' --rate 5 --duration 60
+
+Задержка задачи считается на клиенте: от запланированного момента отправки
+до обнаружения завершения опросом (точность - интервал опроса), поэтому
+ожидание медленного POST в неё входит. Серверная задержка
+datetime_end - datetime_create выводится отдельно.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from src.services.files import FileService
+
+_TERMINAL_STATES = {"DONE", "ERROR", "STOPPED"}
+
+
+class LoadTestRun:
+    """Состояние одного прогона: отправленные, завершённые и неудачные задачи."""
+
+    def __init__(self, api_url: str, poll_interval_sec: float):
+        self._api_url = api_url.rstrip("/")
+        self._poll_interval = poll_interval_sec
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Задача -> запланированный момент отправки (time.monotonic)
+        self.in_flight: dict[str, float] = {}
+        self.finished: dict[str, dict] = {}
+        self.submit_errors = 0
+        self.max_send_lag_sec = 0.0
+
+    def submit(
+        self, intended_at: float, algorithm: str, file_id: str, params: dict
+    ) -> None:
+        """Создаёт задачу; вызывается из пула потоков по расписанию.
+
+        Args:
+            intended_at (float): Запланированный момент отправки (time.monotonic).
+            algorithm (str): Название алгоритма.
+            file_id (str): Идентификатор входного файла.
+            params (dict): Параметры алгоритма.
+        """
+        # requests.Session не рассчитан на общий доступ из нескольких потоков
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        send_lag = time.monotonic() - intended_at
+        try:
+            resp = session.post(
+                f"{self._api_url}/api/task",
+                json={
+                    "algorithm": algorithm,
+                    "input_file_id": file_id,
+                    "params": params,
+                },
+                timeout=30,
+            )
+            task_id = resp.json()["id"] if resp.ok else None
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Submit failed: {e}", file=sys.stderr)
+            task_id = None
+        with self._lock:
+            self.max_send_lag_sec = max(self.max_send_lag_sec, send_lag)
+            if task_id is not None:
+                self.in_flight[task_id] = intended_at
+            else:
+                self.submit_errors += 1
+
+    def poll(self, stop: threading.Event, drain_timeout_sec: float) -> None:
+        """Опрашивает незавершённые задачи до `stop` и их завершения.
+
+        После `stop` задачи дожидаются не дольше `drain_timeout_sec`.
+        """
+        session = requests.Session()
+        drain_deadline: float | None = None
+        while not stop.is_set() or self.in_flight:
+            if stop.is_set():
+                drain_deadline = drain_deadline or time.monotonic() + drain_timeout_sec
+                if time.monotonic() > drain_deadline:
+                    break
+            with self._lock:
+                pending = list(self.in_flight)
+            for task_id in pending:
+                try:
+                    resp = session.get(
+                        f"{self._api_url}/api/tasks/{task_id}", timeout=30
+                    )
+                except requests.RequestException as e:
+                    print(f"Poll failed: {e}", file=sys.stderr)
+                    continue
+                if resp.ok and resp.json()["state"] in _TERMINAL_STATES:
+                    observed_at = time.monotonic()
+                    with self._lock:
+                        intended_at = self.in_flight.pop(task_id)
+                        self.finished[task_id] = {
+                            **resp.json(),
+                            "client_latency_sec": observed_at - intended_at,
+                        }
+            time.sleep(self._poll_interval)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(finished: dict[str, dict], submit_errors: int) -> dict:
+    """Считает перцентили задержки и устойчивую пропускную способность.
+
+    Основные перцентили latency_* - клиентская задержка от запланированной
+    отправки (поле client_latency_sec, если есть), server_latency_* - по
+    серверным меткам. Пропускная способность - по серверным меткам.
+    """
+    done = [t for t in finished.values() if t["state"] == "DONE"]
+    summary: dict = {
+        "finished": len(finished),
+        "done": len(done),
+        "failed": len(finished) - len(done),
+        "submit_errors": submit_errors,
+    }
+    if not done:
+        return summary
+
+    created = [datetime.fromisoformat(t["datetime_create"]) for t in done]
+    ended = [datetime.fromisoformat(t["datetime_end"]) for t in done]
+    server = [(end - start).total_seconds() for start, end in zip(created, ended)]
+    client = [t["client_latency_sec"] for t in done if "client_latency_sec" in t]
+    window = (max(ended) - min(created)).total_seconds()
+    summary.update(_latency_stats("latency", client or server))
+    summary.update(_latency_stats("server_latency", server))
+    summary["tasks_per_sec"] = round(len(done) / window, 3) if window else None
+    return summary
+
+
+def _latency_stats(prefix: str, latencies: list[float]) -> dict:
+    return {
+        f"{prefix}_p50_sec": round(_percentile(latencies, 50), 3),
+        f"{prefix}_p90_sec": round(_percentile(latencies, 90), 3),
+        f"{prefix}_p95_sec": round(_percentile(latencies, 95), 3),
+        f"{prefix}_p99_sec": round(_percentile(latencies, 99), 3),
+        f"{prefix}_max_sec": round(max(latencies), 3),
+        f"{prefix}_mean_sec": round(statistics.fmean(latencies), 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--storage", default="http://localhost:8001")
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--algorithm", required=True)
+    parser.add_argument("--params", type=json.loads, default={})
+    parser.add_argument("--rate", type=float, default=1.0, help="Задач в секунду")
+    parser.add_argument("--duration", type=float, default=60.0, help="Секунд подачи")
+    parser.add_argument(
+        "--submit-threads",
+        type=int,
+        default=32,
+        help="Потоков отправки: медленный POST не сдвигает расписание",
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--drain-timeout", type=float, default=300.0)
+    parser.add_argument("--output", type=Path, help="Сохранить сводку в JSON")
+    args = parser.parse_args(argv)
+
+    file_service = FileService(host=args.storage)
+    uploaded = file_service.post_file(
+        filename=args.input.stem,
+        file_extension=args.input.suffix.lstrip("."),
+        path="/loadtest/",
+        file_content=args.input.read_bytes(),
+    )
+
+    run = LoadTestRun(args.api, args.poll_interval)
+    stop = threading.Event()
+    poller = threading.Thread(
+        target=run.poll, args=(stop, args.drain_timeout), daemon=True
+    )
+    poller.start()
+
+    interval = 1.0 / args.rate
+    started = time.monotonic()
+    sent = 0
+    # Открытая модель: отправка планируется от старта, а не от ответа на
+    # предыдущую, и выполняется в пуле потоков, поэтому медленный API не
+    # снижает нагрузку. Задержка считается от запланированного момента:
+    # ожидание свободного потока и ответа на POST в неё входит.
+    with ThreadPoolExecutor(
+        max_workers=args.submit_threads, thread_name_prefix="submit"
+    ) as pool:
+        while time.monotonic() - started < args.duration:
+            intended_at = started + sent * interval
+            delay = intended_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(
+                run.submit, intended_at, args.algorithm, uploaded.uuid, args.params
+            )
+            sent += 1
+
+    stop.set()
+    poller.join()
+
+    summary = summarize(run.finished, run.submit_errors)
+    summary["submitted"] = sent
+    summary["max_send_lag_sec"] = round(run.max_send_lag_sec, 3)
+    summary["unfinished"] = len(run.in_flight)
+    summary["target_rate"] = args.rate
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+    return 0 if summary["done"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
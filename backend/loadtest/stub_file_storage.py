@@ -0,0 +1,115 @@
+"""Локальная замена file_storage для нагрузочного тестирования.
+
+Реализует эндпоинты, которые использует FileService, и хранит файлы в памяти.
+Задержка и пропускная способность настраиваются, чтобы имитировать реальное
+хранилище:
+
+    python -m loadtest.stub_file_storage --port 8001 --latency-ms 20 --bandwidth-mbps 200
+"""
+
+import argparse
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class StubSettings:
+    """Параметры имитации; читаются из окружения, CLI их переопределяет."""
+
+    latency_sec: float = float(os.environ.get("STUB_LATENCY_MS", "0")) / 1000
+    bandwidth_bps: float = float(os.environ.get("STUB_BANDWIDTH_MBPS", "0")) * 1e6 / 8
+
+
+app = FastAPI(title="file_storage stub")
+_files: dict[str, bytes] = {}
+_meta: dict[str, dict] = {}
+
+
+async def _transfer_delay(size: int) -> None:
+    if StubSettings.bandwidth_bps:
+        await asyncio.sleep(size / StubSettings.bandwidth_bps)
+
+
+@app.middleware("http")
+async def _latency(request, call_next):
+    if StubSettings.latency_sec:
+        await asyncio.sleep(StubSettings.latency_sec)
+    return await call_next(request)
+
+
+@app.post("/files")
+async def post_file(
+    file: UploadFile = File(...),
+    filename: str = Form(...),
+    file_extension: str = Form(...),
+    path: str = Form(...),
+    comment: str | None = Form(default=None),
+) -> dict:
+    content = await file.read()
+    await _transfer_delay(len(content))
+    file_id = str(uuid.uuid4())
+    _files[file_id] = content
+    _meta[file_id] = {
+        "uuid": file_id,
+        "filename": filename,
+        "file_extension": file_extension,
+        "size": len(content),
+        "path": path,
+        "comment": comment,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": None,
+    }
+    return _meta[file_id]
+
+
+@app.get("/files/{file_id}/meta")
+async def get_file_meta(file_id: str) -> dict:
+    if file_id not in _meta:
+        raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+    return _meta[file_id]
+
+
+@app.get("/files/{file_id}")
+async def get_file(file_id: str) -> StreamingResponse:
+    if file_id not in _files:
+        raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+    content = _files[file_id]
+
+    async def stream():
+        for offset in range(0, len(content), _CHUNK_SIZE):
+            chunk = content[offset : offset + _CHUNK_SIZE]
+            await _transfer_delay(len(chunk))
+            yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/octet-stream",
+        headers={"Content-Length": str(len(content))},
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Заглушка file_storage")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--bandwidth-mbps", type=float, help="0 - без ограничения")
+    args = parser.parse_args()
+    if args.latency_ms is not None:
+        StubSettings.latency_sec = args.latency_ms / 1000
+    if args.bandwidth_mbps is not None:
+        StubSettings.bandwidth_bps = args.bandwidth_mbps * 1e6 / 8
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Исходная таблица tasks
+
+Схема в том виде, в котором её создавал Base.metadata.create_all до перехода
+на миграции. Если таблица уже существует (база создана прежним способом),
+миграция её не трогает, и база просто берётся под управление Alembic.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001"
+down_revision: str | Sequence[str] | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("tasks"):
+        return
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("algorithm", sa.String(), nullable=False),
+        sa.Column(
+            "state",
+            sa.Enum("PENDING", "RUNNING", "DONE", "ERROR", name="taskstateenum"),
+            nullable=False,
+        ),
+        sa.Column("input_file_id", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("output_file_id", sa.String(), nullable=True),
+        sa.Column("output_file_full_path", sa.String(), nullable=True),
+        sa.Column(
+            "datetime_create",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("datetime_start", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("datetime_end", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("error_code", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    sa.Enum(name="taskstateenum").drop(op.get_bind(), checkfirst=True)
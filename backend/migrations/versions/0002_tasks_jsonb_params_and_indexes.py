@@ -0,0 +1,90 @@
+"""Столбцы очереди задач, params в JSONB, GIN и частичные индексы
+
+Добавляет столбцы, появившиеся после исходной схемы (приоритеты, отмена,
+прогресс, профиль, пакеты). Все изменения идемпотентны (IF NOT EXISTS):
+базы, созданные create_all на промежуточных версиях, часть из них уже имеют.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Новое значение enum нельзя использовать в той же транзакции,
+    # поэтому индексы ниже ссылаются только на PENDING/RUNNING.
+    op.execute("ALTER TYPE taskstateenum ADD VALUE IF NOT EXISTS 'STOPPED'")
+    op.execute("""
+        ALTER TABLE tasks
+            ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 5,
+            ADD COLUMN IF NOT EXISTS client_id VARCHAR NOT NULL DEFAULT 'default',
+            ADD COLUMN IF NOT EXISTS batch_id VARCHAR,
+            ADD COLUMN IF NOT EXISTS datetime_update TIMESTAMPTZ NOT NULL DEFAULT now(),
+            ADD COLUMN IF NOT EXISTS datetime_expiration TIMESTAMPTZ,
+            ADD COLUMN IF NOT EXISTS cancel_requested BOOLEAN NOT NULL DEFAULT false,
+            ADD COLUMN IF NOT EXISTS progress DOUBLE PRECISION,
+            ADD COLUMN IF NOT EXISTS datetime_eta TIMESTAMPTZ,
+            ADD COLUMN IF NOT EXISTS collect_profile BOOLEAN NOT NULL DEFAULT false,
+            ADD COLUMN IF NOT EXISTS profile JSON
+        """)
+    op.execute("ALTER TABLE tasks ALTER COLUMN params TYPE JSONB USING params::jsonb")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_pending_claim
+            ON tasks (client_id, priority DESC, datetime_create)
+            WHERE state = 'PENDING'
+        """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_running_client
+            ON tasks (client_id)
+            WHERE state = 'RUNNING'
+        """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_active_state
+            ON tasks (state)
+            WHERE state IN ('PENDING', 'RUNNING')
+        """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_batch_update
+            ON tasks (batch_id, datetime_update)
+            WHERE batch_id IS NOT NULL
+        """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_params
+            ON tasks USING gin (params jsonb_path_ops)
+        """)
+
+
+def downgrade() -> None:
+    for index in (
+        "ix_tasks_params",
+        "ix_tasks_batch_update",
+        "ix_tasks_active_state",
+        "ix_tasks_running_client",
+        "ix_tasks_pending_claim",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+    op.execute("ALTER TABLE tasks ALTER COLUMN params TYPE JSON USING params::json")
+    op.execute("""
+        ALTER TABLE tasks
+            DROP COLUMN IF EXISTS profile,
+            DROP COLUMN IF EXISTS collect_profile,
+            DROP COLUMN IF EXISTS datetime_eta,
+            DROP COLUMN IF EXISTS progress,
+            DROP COLUMN IF EXISTS cancel_requested,
+            DROP COLUMN IF EXISTS datetime_expiration,
+            DROP COLUMN IF EXISTS datetime_update,
+            DROP COLUMN IF EXISTS batch_id,
+            DROP COLUMN IF EXISTS client_id,
+            DROP COLUMN IF EXISTS priority
+        """)
+    # Значение STOPPED из enum PostgreSQL удалить нельзя; оно остаётся.
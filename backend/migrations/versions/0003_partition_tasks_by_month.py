@@ -0,0 +1,128 @@
+"""Секционирование tasks по месяцам datetime_create и таблица архива
+
+tasks пересоздаётся как секционированная по диапазонам datetime_create
+таблица: помесячные секции tasks_pYYYY_MM (границы в UTC) и секция
+tasks_default для строк вне созданных диапазонов. Первичный ключ становится
+(id, datetime_create). Частичные индексы по PENDING/RUNNING создаются на
+каждой секции; в старых секциях активных задач нет, и их индексы пусты.
+
+Будущие секции создаёт и старые завершённые задачи переносит в
+tasks_archive сервис обслуживания (python -m src.maintenance).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:00:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | Sequence[str] | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXES = (
+    "ix_tasks_pending_claim",
+    "ix_tasks_running_client",
+    "ix_tasks_active_state",
+    "ix_tasks_batch_update",
+    "ix_tasks_params",
+)
+
+
+def _create_indexes() -> None:
+    op.execute("""
+        CREATE INDEX ix_tasks_pending_claim
+            ON tasks (client_id, priority DESC, datetime_create)
+            WHERE state = 'PENDING'
+        """)
+    op.execute("""
+        CREATE INDEX ix_tasks_running_client
+            ON tasks (client_id)
+            WHERE state = 'RUNNING'
+        """)
+    op.execute("""
+        CREATE INDEX ix_tasks_active_state
+            ON tasks (state)
+            WHERE state IN ('PENDING', 'RUNNING')
+        """)
+    op.execute("""
+        CREATE INDEX ix_tasks_batch_update
+            ON tasks (batch_id, datetime_update)
+            WHERE batch_id IS NOT NULL
+        """)
+    op.execute(
+        "CREATE INDEX ix_tasks_params ON tasks USING gin (params jsonb_path_ops)"
+    )
+
+
+def _drop_indexes() -> None:
+    for index in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+    op.execute(
+        "ALTER TABLE tasks_unpartitioned RENAME CONSTRAINT tasks_pkey TO tasks_unpartitioned_pkey"
+    )
+    _drop_indexes()
+
+    op.execute("""
+        CREATE TABLE tasks (LIKE tasks_unpartitioned INCLUDING DEFAULTS)
+            PARTITION BY RANGE (datetime_create)
+        """)
+    op.execute("ALTER TABLE tasks ADD PRIMARY KEY (id, datetime_create)")
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+    # Секции на все месяцы с существующими задачами и на три месяца вперёд
+    op.execute("""
+        DO $$
+        DECLARE
+            month timestamp;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT min(datetime_create) FROM tasks_unpartitioned),
+                        now()
+                    ) AT TIME ZONE 'UTC'),
+                    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF tasks FOR VALUES FROM (%L) TO (%L)',
+                    'tasks_p' || to_char(month, 'YYYY_MM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+        """)
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_unpartitioned")
+    op.execute("DROP TABLE tasks_unpartitioned")
+    _create_indexes()
+
+    op.execute("CREATE TABLE tasks_archive (LIKE tasks INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE tasks_archive ADD PRIMARY KEY (id, datetime_create)")
+    op.execute(
+        "CREATE INDEX ix_tasks_archive_datetime_create ON tasks_archive (datetime_create)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    op.execute(
+        "ALTER TABLE tasks_partitioned RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey"
+    )
+    _drop_indexes()
+    op.execute("CREATE TABLE tasks (LIKE tasks_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_partitioned")
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_archive")
+    # Секции удаляются вместе с родительской таблицей
+    op.execute("DROP TABLE tasks_partitioned")
+    op.execute("DROP TABLE tasks_archive")
+    op.execute("ALTER TABLE tasks ADD PRIMARY KEY (id)")
+    _create_indexes()
@@ -0,0 +1,50 @@
+"""Аренда задач воркерами: владелец, срок аренды, номер попытки
+
+Столбцы добавляются и в tasks_archive: архив хранит те же столбцы, что tasks.
+Выполняемые сейчас задачи получают аренду с запасом, чтобы reaper не вернул
+их в очередь, пока воркеры ещё не обновлены.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | Sequence[str] | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"""
+            ALTER TABLE {table}
+                ADD COLUMN lease_owner VARCHAR,
+                ADD COLUMN lease_expires_at TIMESTAMPTZ,
+                ADD COLUMN attempt INTEGER NOT NULL DEFAULT 0
+            """)
+    op.execute("""
+        UPDATE tasks
+        SET lease_expires_at = now() + interval '1 hour', attempt = 1
+        WHERE state = 'RUNNING'
+        """)
+    op.execute("""
+        CREATE INDEX ix_tasks_running_lease
+            ON tasks (lease_expires_at)
+            WHERE state = 'RUNNING'
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tasks_running_lease")
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"""
+            ALTER TABLE {table}
+                DROP COLUMN attempt,
+                DROP COLUMN lease_expires_at,
+                DROP COLUMN lease_owner
+            """)
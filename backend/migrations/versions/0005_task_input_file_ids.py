@@ -0,0 +1,29 @@
+"""Несколько входных файлов задачи: столбец input_file_ids
+
+Для задач с одним входом столбец пуст; у задач с несколькими входами
+input_file_id хранит первый из них, поэтому NOT NULL на input_file_id и
+существующие выборки по нему сохраняются.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: str | Sequence[str] | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN input_file_ids VARCHAR[]")
+
+
+def downgrade() -> None:
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN input_file_ids")
@@ -0,0 +1,25 @@
+"""Компактный результат алгоритма: столбец result
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:00:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | Sequence[str] | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN result JSONB")
+
+
+def downgrade() -> None:
+    for table in ("tasks", "tasks_archive"):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN result")
@@ -0,0 +1,27 @@
+"""Индекс PENDING-задач по входному файлу для группировки воркером
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:00:00
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | Sequence[str] | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX ix_tasks_pending_input
+            ON tasks (input_file_id)
+            WHERE state = 'PENDING'
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tasks_pending_input")
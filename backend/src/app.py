@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from src.config import fastapi_config, settings
 from src.injectors import initialize_database
 from src.routers.api import router
+from src.routers.metrics import router as metrics_router
 from src.routers.handlers import (
     global_exception_handler,
     resource_already_exists_handler,
@@ -38,8 +39,8 @@ from src.services import FileNotFoundError as StorageFileNotFoundError
 #             "schemas", {}
 #         )
 
-#         for algo_cls in AlgorithmAbstractFactory.registry.values():
-#             model = algo_cls.get_pydantic_model()
+#         for spec in AlgorithmAbstractFactory.registry.values():
+#             model = spec.params_model
 #             algo_schema = model.model_json_schema()
 #             # Вложенные $defs поднимаем в верхний уровень components/schemas
 #             for ref_name, ref_schema in algo_schema.pop("$defs", {}).items():
@@ -83,6 +84,7 @@ app.add_exception_handler(Exception, global_exception_handler)
 
 # --- routers ---
 app.include_router(router)
+app.include_router(metrics_router)
 
 # --- patch openapi schema with algorithm param models ---
 # _patch_openapi(app)
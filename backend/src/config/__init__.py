@@ -1,7 +1,9 @@
 from .fastapi import FastAPIConfig
 from .fs import FsConfig
+from .maintenance import MaintenanceConfig
 from .pg import PgConfig
 from .settings import settings
+from .worker import WorkerConfig
 
 pg_config = PgConfig(
     database_url=settings.database_url,
@@ -19,12 +21,44 @@ fastapi_config = FastAPIConfig(
     port=settings.app_port,
     log_level="debug" if settings.debug else "info",
     reload=settings.debug,
+    task_cache_size=settings.task_cache_size,
+    terminal_task_max_age_sec=settings.terminal_task_max_age,
+)
+worker_config = WorkerConfig(
+    poll_interval_sec=settings.worker_poll_interval,
+    tenant_weights=settings.tenant_weights,
+    default_tenant_weight=settings.default_tenant_weight,
+    progress_interval_sec=settings.worker_progress_interval,
+    metrics_port=settings.worker_metrics_port or None,
+    processes=max(1, settings.worker_processes),
+    max_tasks_per_child=settings.worker_max_tasks_per_child,
+    max_rss_mb=settings.worker_max_rss_mb,
+    shutdown_timeout_sec=settings.worker_shutdown_timeout,
+    lease_sec=settings.task_lease_seconds,
+    memory_budget_mb=settings.worker_memory_budget_mb,
+    admission_starvation_sec=settings.worker_admission_starvation,
+    download_concurrency=settings.worker_download_concurrency,
+    affinity_group_size=max(1, settings.worker_affinity_group_size),
+)
+maintenance_config = MaintenanceConfig(
+    interval_sec=settings.maintenance_interval,
+    partitions_ahead_months=settings.tasks_partitions_ahead,
+    retention_days=settings.tasks_retention_days,
+    retention_mode=settings.tasks_retention_mode,
+    export_dir=settings.tasks_export_dir,
+    batch_size=settings.tasks_retention_batch,
+    reaper_interval_sec=settings.reaper_interval,
+    max_attempts=settings.task_max_attempts,
 )
 __all__ = [
     "PgConfig",
     "FsConfig",
     "FastAPIConfig",
+    "WorkerConfig",
+    "MaintenanceConfig",
     "pg_config",
     "fs_config",
     "fastapi_config",
+    "worker_config",
+    "maintenance_config",
 ]
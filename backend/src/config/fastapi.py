@@ -7,3 +7,5 @@ from .config_base import ipConfig
 class FastAPIConfig(ipConfig):
     log_level: str = "info"
     reload: bool = False
+    task_cache_size: int = 10000
+    terminal_task_max_age_sec: int = 86400
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from .config_base import ConfigBase
+
+
+@dataclass
+class MaintenanceConfig(ConfigBase):
+    interval_sec: float = 3600.0
+    partitions_ahead_months: int = 3
+    retention_days: int = 0
+    retention_mode: str = "archive"
+    export_dir: str = "/var/lib/geo_img_processing/archive"
+    batch_size: int = 5000
+    reaper_interval_sec: float = 15.0
+    max_attempts: int = 3
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     app_name: str = "Image Processing API"
     app_version: str = "3.0.0"
     debug: bool = False
+    # Число завершённых задач в LRU-кэше процесса API (0 - кэш отключён)
+    task_cache_size: int = 10000
+    # Cache-Control max-age для задач в конечных состояниях
+    terminal_task_max_age: int = 86400
 
     # Настройки файлового хранилища
     file_storage_host: str = "http://localhost"
@@ -24,6 +28,50 @@ class Settings(BaseSettings):
     db_retries: int = 5
     db_retry_delay: int = 2
 
+    # Настройки воркера
+    worker_poll_interval: float = 1.0
+    # Веса клиентов для справедливого распределения, например {"interactive": 4}
+    tenant_weights: dict[str, float] = {}
+    default_tenant_weight: float = 1.0
+    # Как часто воркер записывает прогресс задачи и перечитывает флаг отмены
+    worker_progress_interval: float = 2.0
+    # Порт HTTP-экспортера метрик Prometheus в процессе воркера (0 - отключён)
+    worker_metrics_port: int = 9100
+    # Число прогретых дочерних процессов, которые супервизор держит запущенными
+    worker_processes: int = 1
+    # Перезапуск дочернего процесса после N задач или превышения RSS (0 - без лимита)
+    worker_max_tasks_per_child: int = 200
+    worker_max_rss_mb: int = 2048
+    # Сколько ждать завершения текущих задач при остановке перед SIGKILL
+    worker_shutdown_timeout: float = 300.0
+    # Общий бюджет памяти дочерних процессов воркера: задача ждёт, пока её
+    # оценка пиковой памяти не поместится в остаток (0 - без ограничения)
+    worker_memory_budget_mb: int = 0
+    # Через сколько секунд ожидания крупная задача блокирует допуск новых
+    worker_admission_starvation: float = 60.0
+    # Сколько входных файлов задачи с несколькими входами скачивается параллельно
+    worker_download_concurrency: int = 8
+    # Сколько PENDING-задач клиента с одним входным файлом воркер захватывает
+    # группой и выполняет подряд, скачав вход один раз (1 - без группировки)
+    worker_affinity_group_size: int = 4
+    # Срок аренды задачи воркером; heartbeat продлевает её трижды за срок
+    task_lease_seconds: float = 60.0
+    # Сколько раз задача с истёкшей арендой возвращается в очередь
+    task_max_attempts: int = 3
+    # Как часто reaper ищет задачи с истёкшей арендой
+    reaper_interval: float = 15.0
+
+    # Обслуживание таблицы задач (python -m src.maintenance)
+    maintenance_interval: float = 3600.0
+    # На сколько месяцев вперёд создавать секции tasks
+    tasks_partitions_ahead: int = 3
+    # Завершённые задачи старше N дней выносятся из tasks (0 - не выносить)
+    tasks_retention_days: int = 0
+    # archive - в таблицу tasks_archive, export - в gzip-файлы, drop - удалить
+    tasks_retention_mode: str = "archive"
+    tasks_export_dir: str = "/var/lib/geo_img_processing/archive"
+    tasks_retention_batch: int = 5000
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+
+from .config_base import ConfigBase
+
+
+@dataclass
+class WorkerConfig(ConfigBase):
+    poll_interval_sec: float = 1.0
+    tenant_weights: dict[str, float] = field(default_factory=dict)
+    default_tenant_weight: float = 1.0
+    progress_interval_sec: float = 2.0
+    metrics_port: int | None = None
+    processes: int = 1
+    max_tasks_per_child: int = 0
+    max_rss_mb: int = 0
+    shutdown_timeout_sec: float = 300.0
+    lease_sec: float = 60.0
+    memory_budget_mb: int = 0
+    admission_starvation_sec: float = 60.0
+    download_concurrency: int = 8
+    affinity_group_size: int = 1
@@ -5,11 +5,11 @@ from typing import Generator
 from fastapi import Depends
 from requests import Session as RequestsSession
 from sqlalchemy import create_engine as sa_create_engine
+from sqlalchemy import inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import fs_config, pg_config
-from src.models import Base
 from src.services.files import FileService
 
 
@@ -25,6 +25,10 @@ class DatabaseOperationError(DatabaseError):
     """Ошибка выполнения операции с базой данных"""
 
 
+class DatabaseSchemaError(DatabaseError):
+    """Схема базы данных не создана: миграции не применены"""
+
+
 @lru_cache(maxsize=1)
 def create_engine():
     """Создает и кэширует синхронный движок базы данных."""
@@ -42,22 +46,31 @@ def create_database() -> sessionmaker[Session]:
 
 
 def initialize_database() -> None:
-    """Создает таблицы в базе данных при старте приложения (синхронно)."""
+    """Проверяет доступность базы данных при старте приложения (синхронно).
+
+    Схема создаётся миграциями Alembic (`alembic upgrade head`), а не здесь.
+    """
 
     config = pg_config
     engine = create_engine()
     retries = getattr(config, "retries", 1)
     for attempt in range(retries):
         try:
-            Base.metadata.create_all(bind=engine)
-            return
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                has_tasks = inspect(conn).has_table("tasks")
+            break
         except SQLAlchemyError as e:
             if attempt < retries - 1:
                 time.sleep(getattr(config, "retry_delay_sec", 1))
             else:
                 raise DatabaseConnectionError(
-                    f"Error creating database after {retries} attempts: {e}"
+                    f"Error connecting to database after {retries} attempts: {e}"
                 )
+    if not has_tasks:
+        raise DatabaseSchemaError(
+            "Table 'tasks' not found: run 'alembic upgrade head' first"
+        )
 
 
 def get_db(
@@ -1,8 +1,17 @@
+from functools import lru_cache
+
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from src.config import fastapi_config, worker_config
 from src.injectors.connections import get_db, get_fs
-from src.services import FileService, TaskService, WorkerService
+from src.services import (
+    FairShareClaimPolicy,
+    FileService,
+    TaskService,
+    TerminalTaskCache,
+    WorkerService,
+)
 from src.services.algorithms import AlgorithmAbstractFactory
 
 
@@ -13,12 +22,31 @@ def get_task_service(
     return TaskService(db_session=db)
 
 
+@lru_cache(maxsize=1)
+def get_task_cache() -> TerminalTaskCache:
+    """Зависимость для получения общего на процесс кэша завершённых задач."""
+    return TerminalTaskCache(capacity=fastapi_config.task_cache_size)
+
+
 def get_worker_service(
     db: Session = Depends(get_db),
     file_service: FileService = Depends(get_fs),
 ) -> WorkerService:
     """Зависимость для получения WorkerService, привязанного к текущей сессии БД и FileService."""
-    worker_service = WorkerService(db=db, file_service=file_service)
+    claim_policy = FairShareClaimPolicy(
+        db,
+        tenant_weights=worker_config.tenant_weights,
+        default_weight=worker_config.default_tenant_weight,
+    )
+    worker_service = WorkerService(
+        db=db,
+        file_service=file_service,
+        claim_policy=claim_policy,
+        progress_interval_sec=worker_config.progress_interval_sec,
+        lease_sec=worker_config.lease_sec,
+        download_concurrency=worker_config.download_concurrency,
+        affinity_group_size=worker_config.affinity_group_size,
+    )
     return worker_service
 
 
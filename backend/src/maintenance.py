@@ -0,0 +1,84 @@
+import signal
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from src.config import maintenance_config
+from src.injectors.connections import create_database, initialize_database
+from src.services import LeaseReaper, TaskPartitionService
+
+_stop_requested = False
+
+
+def _request_stop(signum, frame) -> None:
+    """Обработчик SIGTERM/SIGINT: цикл завершится после текущего прохода."""
+    global _stop_requested
+    _stop_requested = True
+
+
+def run_once(session_factory) -> None:
+    """Один проход обслуживания: секции наперёд и вынос старых задач."""
+    config = maintenance_config
+    with session_factory() as db:
+        service = TaskPartitionService(db)
+        created = service.ensure_partitions(config.partitions_ahead_months)
+        if created:
+            print(f"Created task partitions: {', '.join(created)}")
+
+        if not config.retention_days:
+            return
+        retention = timedelta(days=config.retention_days)
+        retired = service.retire_finished(
+            older_than=retention,
+            mode=config.retention_mode,
+            export_dir=Path(config.export_dir),
+            batch_size=config.batch_size,
+        )
+        if retired:
+            print(f"Retired {retired} finished tasks ({config.retention_mode})")
+        dropped = service.drop_empty_partitions(older_than=retention)
+        if dropped:
+            print(f"Dropped empty task partitions: {', '.join(dropped)}")
+
+
+def reap_leases(session_factory) -> None:
+    """Возвращает в очередь задачи, аренда которых истекла."""
+    with session_factory() as db:
+        counts = LeaseReaper(db, max_attempts=maintenance_config.max_attempts).reap()
+    if any(counts.values()):
+        print(f"Expired task leases: {counts}")
+
+
+def main() -> None:
+    """Цикл обслуживания таблицы задач.
+
+    Reaper аренд запускается часто (`reaper_interval_sec`), обслуживание
+    секций и вынос старых задач - раз в `interval_sec`.
+    """
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    initialize_database()
+    session_factory = create_database()
+
+    next_reap = next_run = time.monotonic()
+    while not _stop_requested:
+        now = time.monotonic()
+        if now >= next_reap:
+            try:
+                reap_leases(session_factory)
+            except Exception as e:
+                print(f"Lease reaper failed: {e}")
+            next_reap = now + maintenance_config.reaper_interval_sec
+        if now >= next_run:
+            try:
+                run_once(session_factory)
+            except Exception as e:
+                # В том числе ошибки БД: цикл и reaper аренд продолжают работу
+                print(f"Maintenance failed: {e}")
+            next_run = now + maintenance_config.interval_sec
+        time.sleep(1.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, Enum, Integer, String
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy import func as sa_func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .declarative_base import Base
@@ -14,6 +24,7 @@ class TaskStateEnum(enum.Enum):
     RUNNING = "RUNNING"
     DONE = "DONE"
     ERROR = "ERROR"
+    STOPPED = "STOPPED"
 
 
 class ErrorCodeEnum(enum.Enum):
@@ -23,10 +34,69 @@ class ErrorCodeEnum(enum.Enum):
     INVALID_INPUT_PARAMS = 401
     INPUT_FILE_NOT_FOUND = 402
     OUTPUT_FILE_ALREADY_EXISTS = 403
+    TASK_EXPIRED = 404
+    TASK_CANCELLED = 405
+    WORKER_LOST = 406
 
 
 class Task(Base):
+    """Задача обработки.
+
+    Таблица секционирована по диапазонам datetime_create (по месяцам, см.
+    миграцию 0003 и services/partitions.py), поэтому ключ секционирования
+    входит в первичный ключ. Для поиска по одному id используется индекс
+    первичного ключа, ведущий столбец которого - id.
+    """
+
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Частичный индекс для выборки задач воркером: только PENDING-строки,
+        # упорядоченные так же, как в политике захвата (клиент -> приоритет -> возраст).
+        Index(
+            "ix_tasks_pending_claim",
+            "client_id",
+            text("priority DESC"),
+            "datetime_create",
+            postgresql_where=text("state = 'PENDING'"),
+        ),
+        # Группировка воркером PENDING-задач с одним входным файлом
+        Index(
+            "ix_tasks_pending_input",
+            "input_file_id",
+            postgresql_where=text("state = 'PENDING'"),
+        ),
+        Index(
+            "ix_tasks_running_client",
+            "client_id",
+            postgresql_where=text("state = 'RUNNING'"),
+        ),
+        # Поиск reaper'ом задач с истёкшей арендой
+        Index(
+            "ix_tasks_running_lease",
+            "lease_expires_at",
+            postgresql_where=text("state = 'RUNNING'"),
+        ),
+        Index(
+            "ix_tasks_active_state",
+            "state",
+            postgresql_where=text("state IN ('PENDING', 'RUNNING')"),
+        ),
+        # Поиск по содержимому параметров (params @> '{...}')
+        Index(
+            "ix_tasks_params",
+            "params",
+            postgresql_using="gin",
+            postgresql_ops={"params": "jsonb_path_ops"},
+        ),
+        # Пакетный опрос статусов: задачи пакета, изменившиеся после метки
+        Index(
+            "ix_tasks_batch_update",
+            "batch_id",
+            "datetime_update",
+            postgresql_where=text("batch_id IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (datetime_create)"},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
     algorithm: Mapped[str] = mapped_column(String, nullable=False)
@@ -34,14 +104,42 @@ class Task(Base):
         Enum(TaskStateEnum), nullable=False, default=TaskStateEnum.PENDING
     )
 
+    priority: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=5, server_default="5"
+    )
+    client_id: Mapped[str] = mapped_column(
+        String, nullable=False, default="default", server_default="default"
+    )
+
+    batch_id: Mapped[str | None] = mapped_column(String, nullable=True)
+
     input_file_id: Mapped[str] = mapped_column(String, nullable=False)
-    params: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Все входы задачи с несколькими входами; input_file_id - первый из них
+    input_file_ids: Mapped[list[str] | None] = mapped_column(
+        ARRAY(String), nullable=True
+    )
+    params: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     output_file_id: Mapped[str | None] = mapped_column(String, nullable=True)
     output_file_full_path: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Компактный результат алгоритма (например, статистика растра)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     datetime_create: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=sa_func.now(), nullable=False
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=sa_func.now(),
+        nullable=False,
+    )
+    # clock_timestamp(), а не now(): метка ставится в момент изменения строки,
+    # а не в начале транзакции. Строка видна только после коммита, поэтому
+    # метка всё равно может оказаться раньше server_time опроса; этот зазор
+    # закрывает метка из TaskService.get_statuses.
+    datetime_update: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa_func.now(),
+        onupdate=sa_func.clock_timestamp(),
+        nullable=False,
     )
     datetime_start: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -49,6 +147,34 @@ class Task(Base):
     datetime_end: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    datetime_expiration: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    cancel_requested: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+
+    progress: Mapped[float | None] = mapped_column(Float, nullable=True)
+    datetime_eta: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    # Аренда задачи воркером: владелец продлевает её heartbeat'ом, по
+    # истечении reaper возвращает задачу в очередь. lease_owner после
+    # завершения хранит последнего владельца. PENDING-задача с действующей
+    # арендой зарезервирована воркером в группе задач с общим входом.
+    lease_owner: Mapped[str | None] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    attempt: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     error: Mapped[str | None] = mapped_column(String, nullable=True)
     error_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    collect_profile: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+    profile: Mapped[dict | None] = mapped_column(JSON, nullable=True)
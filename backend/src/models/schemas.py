@@ -1,7 +1,10 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+TASK_STATUS_MAX_IDS = 1000
+TASK_MAX_INPUTS = 1000
 
 
 class TaskRead(BaseModel):
@@ -12,25 +15,146 @@ class TaskRead(BaseModel):
     id: UUID
     algorithm: str
     state: str
+    priority: int
+    client_id: str
+    batch_id: str | None = None
     input_file_id: str
+    input_file_ids: list[str] | None = Field(
+        default=None, description="ID входных файлов задачи с несколькими входами"
+    )
     params: dict | None = None
     output_file_id: str | None = None
     output_file_full_path: str | None = None
+    result: dict | None = Field(
+        default=None,
+        description="Компактный JSON-результат алгоритма (например, статистика RASTER_STATS)",
+    )
     datetime_create: datetime
+    datetime_update: datetime | None = None
     datetime_start: datetime | None = None
     datetime_end: datetime | None = None
+    datetime_expiration: datetime | None = None
+    cancel_requested: bool = False
+    progress: float | None = Field(
+        default=None, description="Процент выполнения алгоритма (0-100)"
+    )
+    datetime_eta: datetime | None = Field(
+        default=None, description="Ожидаемое время завершения алгоритма"
+    )
+    attempt: int = 0
+    lease_owner: str | None = Field(
+        default=None,
+        description="Воркер, выполняющий (или последним выполнявший) задачу",
+    )
+    lease_expires_at: datetime | None = None
     error: str | None = None
     error_code: int | None = None
+    collect_profile: bool = False
+    profile: dict | None = Field(
+        default=None,
+        description="Профиль выполнения: длительности этапов, память, размеры файлов",
+    )
 
 
 class TaskCreate(BaseModel):
     """Pydantic-модель задачи для создания новой задачи через API"""
 
     algorithm: str = Field(..., description="Название алгоритма")
-    input_file_id: str = Field(..., description="ID входного файла")
+    input_file_id: str | None = Field(default=None, description="ID входного файла")
+    input_file_ids: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=TASK_MAX_INPUTS,
+        description=(
+            "ID входных файлов для алгоритмов с несколькими входами "
+            f"(например, RASTER_MOSAIC; не больше {TASK_MAX_INPUTS})"
+        ),
+    )
     params: dict | None = Field(
         default=None, description="Параметры алгоритма (необязательно)"
     )
+    priority: int = Field(
+        default=5,
+        ge=0,
+        le=9,
+        description="Приоритет задачи внутри клиента: 0 - низший, 9 - высший",
+    )
+    client_id: str = Field(
+        default="default",
+        min_length=1,
+        max_length=128,
+        description="Идентификатор клиента (тенанта) для справедливого распределения воркеров",
+    )
+    batch_id: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Идентификатор пакета для группового опроса статусов",
+    )
+    datetime_expiration: datetime | None = Field(
+        default=None,
+        description="Время, до которого задача актуальна; позже она не будет выполняться",
+    )
+    collect_profile: bool = Field(
+        default=False,
+        description="Снять cProfile выполнения алгоритма и загрузить его рядом с результатом",
+    )
+
+    @model_validator(mode="after")
+    def _single_or_multiple_inputs(self) -> "TaskCreate":
+        if (self.input_file_id is None) == (self.input_file_ids is None):
+            raise ValueError("Нужно указать либо input_file_id, либо input_file_ids")
+        return self
+
+
+class TaskStatus(BaseModel):
+    """Облегчённая Pydantic-модель статуса задачи для пакетного опроса"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    state: str
+    progress: float | None = None
+    error_code: int | None = None
+    output_file_id: str | None = None
+    datetime_end: datetime | None = None
+    datetime_update: datetime
+
+
+class TaskStatusQuery(BaseModel):
+    """Pydantic-модель запроса пакетного опроса статусов задач"""
+
+    ids: list[UUID] = Field(
+        default_factory=list,
+        max_length=TASK_STATUS_MAX_IDS,
+        description=f"Идентификаторы задач (не больше {TASK_STATUS_MAX_IDS})",
+    )
+    batch_id: str | None = Field(
+        default=None, description="Вернуть все задачи пакета с этим идентификатором"
+    )
+    changed_since: datetime | None = Field(
+        default=None,
+        description="Вернуть только задачи, изменившиеся после этого момента",
+    )
+
+    @model_validator(mode="after")
+    def _ids_or_batch(self) -> "TaskStatusQuery":
+        if not self.ids and self.batch_id is None:
+            raise ValueError("Нужно указать ids или batch_id")
+        return self
+
+
+class TaskStatusBatch(BaseModel):
+    """Pydantic-модель ответа пакетного опроса статусов задач"""
+
+    server_time: datetime = Field(
+        ...,
+        description=(
+            "Метка для changed_since следующего опроса; может отставать от времени "
+            "БД, поэтому задачи могут повторяться - сводите их по id"
+        ),
+    )
+    tasks: list[TaskStatus]
 
 
 class AlgorithmParamsBaseModel(BaseModel):
@@ -1,4 +1,5 @@
 from .api import router
+from .metrics import router as metrics_router
 from .handlers import (
     resource_already_exists_handler,
     resource_not_found_handler,
@@ -7,6 +8,7 @@ from .handlers import (
 
 __all__ = [
     "router",
+    "metrics_router",
     "resource_already_exists_handler",
     "resource_not_found_handler",
     "global_exception_handler",
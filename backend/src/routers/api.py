@@ -1,16 +1,29 @@
+import json
 import uuid
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException, Query, Response
 from fastapi.routing import APIRouter
 
-from src.injectors.services import get_task_service
-from src.models.schemas import TaskCreate, TaskRead
+from src.config import fastapi_config
+from src.injectors.services import get_task_cache, get_task_service
+from src.models.schemas import (
+    TaskCreate,
+    TaskRead,
+    TaskStatus,
+    TaskStatusBatch,
+    TaskStatusQuery,
+)
 from src.services import (
     AlgorithmAbstractFactory,
+    CachedTask,
     InvalidAlgorithmParamsError,
+    TaskAlreadyFinishedError,
     TaskNotFoundError,
     TaskService,
+    TaskServiceError,
+    TerminalTaskCache,
 )
+from src.services.task_cache import etag_matches
 
 router = APIRouter(prefix="/api")
 
@@ -26,9 +39,9 @@ router = APIRouter(prefix="/api")
 #                         "type": "object",
 #                         "properties": {
 #                             name: {
-#                                 "$ref": f"#/components/schemas/{algo_cls.get_pydantic_model().__name__}"
+#                                 "$ref": f"#/components/schemas/{spec.params_model.__name__}"
 #                             }
-#                             for name, algo_cls in AlgorithmAbstractFactory.registry.items()
+#                             for name, spec in AlgorithmAbstractFactory.registry.items()
 #                         },
 #                     }
 #                 }
@@ -47,29 +60,96 @@ router = APIRouter(prefix="/api")
 # def get_available_algorithms() -> dict[str, dict]:
 #     """Возвращает словарь {имя_алгоритма: JSON-схема параметров}."""
 #     return {
-#         name: algo_cls.get_pydantic_model().model_json_schema()
-#         for name, algo_cls in AlgorithmAbstractFactory.registry.items()
+#         name: spec.params_model.model_json_schema()
+#         for name, spec in AlgorithmAbstractFactory.registry.items()
 #     }
 
 
 @router.get("/tasks/")
 def list_tasks(
+    params: str | None = Query(
+        default=None,
+        description='JSON-объект: только задачи, параметры которых его содержат, например {"srs_def": "EPSG:3857"}',
+    ),
     task_service: TaskService = Depends(get_task_service),
 ) -> list[TaskRead]:
-    """Возвращает список всех задач из базы данных."""
-    return [TaskRead.model_validate(task) for task in task_service.list_tasks()]
+    """Возвращает список задач из базы данных с необязательным фильтром по параметрам."""
+    params_contains = None
+    if params is not None:
+        try:
+            params_contains = json.loads(params)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid params JSON: {e}")
+        if not isinstance(params_contains, dict):
+            raise HTTPException(status_code=400, detail="params must be a JSON object")
+    tasks = task_service.list_tasks(params_contains=params_contains)
+    return [TaskRead.model_validate(task) for task in tasks]
+
+
+@router.post("/tasks/status")
+def get_task_statuses(
+    body: TaskStatusQuery,
+    task_service: TaskService = Depends(get_task_service),
+) -> TaskStatusBatch:
+    """Возвращает статусы задач по списку идентификаторов или по пакету.
+
+    С `changed_since` возвращаются только задачи, изменившиеся после этого
+    момента; для инкрементального опроса передавайте `server_time`
+    предыдущего ответа. Метка выбирается с запасом на незафиксированные
+    транзакции, поэтому задача может вернуться повторно: сводите строки по id.
+    """
+    try:
+        server_time, rows = task_service.get_statuses(
+            ids=body.ids,
+            batch_id=body.batch_id,
+            changed_since=body.changed_since,
+        )
+    except TaskServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return TaskStatusBatch(
+        server_time=server_time,
+        tasks=[TaskStatus.model_validate(row) for row in rows],
+    )
 
 
-@router.get("/tasks/{task_id}")
+def _cache_headers(cached: CachedTask) -> dict[str, str]:
+    # Завершённая задача больше не меняется и может кэшироваться прокси;
+    # активную клиент обязан перепроверять (по ETag это дешёвый ответ 304).
+    if cached.is_terminal:
+        cache_control = (
+            f"public, max-age={fastapi_config.terminal_task_max_age_sec}, immutable"
+        )
+    else:
+        cache_control = "no-cache"
+    return {"ETag": cached.etag, "Cache-Control": cache_control}
+
+
+@router.get("/tasks/{task_id}", response_model=TaskRead)
 def get_task(
     task_id: uuid.UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     task_service: TaskService = Depends(get_task_service),
-) -> TaskRead:
-    """Возвращает информацию о задаче: статус, время выполнения, результат."""
-    try:
-        return TaskRead.model_validate(task_service.get_task(task_id))
-    except TaskNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    task_cache: TerminalTaskCache = Depends(get_task_cache),
+) -> TaskRead | Response:
+    """Возвращает информацию о задаче: статус, время выполнения, результат.
+
+    Поддерживает условный запрос по If-None-Match. Завершённые задачи
+    отдаются из кэша процесса без обращения к базе данных.
+    """
+    cached = task_cache.get(task_id)
+    if cached is None:
+        try:
+            task = TaskRead.model_validate(task_service.get_task(task_id))
+        except TaskNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        cached = task_cache.put(task)
+
+    headers = _cache_headers(cached)
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return cached.task
 
 
 @router.post("/task")
@@ -78,17 +158,48 @@ def create_task(
     task_service: TaskService = Depends(get_task_service),
 ) -> TaskRead:
     try:
-        algorithm = AlgorithmAbstractFactory.get_algorithm(body.algorithm)
-        params = algorithm.get_pydantic_model().model_validate(body.params)
+        # Валидируется только модель параметров: реализация алгоритма (и GDAL)
+        # в процессе API не загружается.
+        params_model = AlgorithmAbstractFactory.get_params_model(body.algorithm)
+        params = params_model.model_validate(body.params)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if body.input_file_ids is not None and not (
+        AlgorithmAbstractFactory.accepts_multiple_inputs(body.algorithm)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Algorithm {body.algorithm} accepts a single input_file_id",
+        )
 
     try:
         task = task_service.create_task(
-            algorithm=algorithm, input_file_id=body.input_file_id, params=params
+            algorithm=body.algorithm,
+            input_file_id=body.input_file_id,
+            input_file_ids=body.input_file_ids,
+            params=params,
+            priority=body.priority,
+            client_id=body.client_id,
+            batch_id=body.batch_id,
+            datetime_expiration=body.datetime_expiration,
+            collect_profile=body.collect_profile,
         )
 
     except InvalidAlgorithmParamsError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
     return TaskRead.model_validate(task)
+
+
+@router.post("/tasks/{task_id}/cancel")
+def cancel_task(
+    task_id: uuid.UUID,
+    task_service: TaskService = Depends(get_task_service),
+) -> TaskRead:
+    """Отменяет задачу: PENDING - сразу, RUNNING - кооперативно через воркер."""
+    try:
+        return TaskRead.model_validate(task_service.cancel_task(task_id))
+    except TaskNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskAlreadyFinishedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -0,0 +1,20 @@
+from fastapi import Response
+from fastapi.routing import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+
+from src.injectors.connections import create_database
+from src.services.metrics import TaskStateCollector, build_registry
+
+router = APIRouter()
+
+# Метрики состояния очереди читаются из БД при каждом сборе, поэтому живут в
+# отдельном реестре и не зависят от многопроцессного режима prometheus_client.
+_task_state_registry = CollectorRegistry()
+_task_state_registry.register(TaskStateCollector(lambda: create_database()()))
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Экспортирует метрики в формате Prometheus."""
+    payload = generate_latest(build_registry()) + generate_latest(_task_state_registry)
+    return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
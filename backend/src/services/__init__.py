@@ -1,14 +1,22 @@
+from .admission import MemoryBudget
 from .algorithms import (
     AlgorithmAbstractFactory,
     AlgorithmExecutionError,
     AlgorithmValidationError,
     BaseAlgorithm,
     BaseAlgorithmError,
+    MultiInputAlgorithm,
 )
 from .files import FileAlreadyExistsError, FileService
 from .files import FileNotFoundError as FileServiceFileNotFoundError
+from .leases import GroupLeaseHeartbeat, LeaseHeartbeat, LeaseReaper
+from .partitions import PartitionServiceError, TaskPartitionService
+from .progress import TaskProgress
+from .scheduling import FairShareClaimPolicy
+from .task_cache import CachedTask, TerminalTaskCache
 from .tasks import (
     InvalidAlgorithmParamsError,
+    TaskAlreadyFinishedError,
     TaskNotFoundError,
     TaskService,
     TaskServiceError,
@@ -19,6 +27,7 @@ from .workers import (
 from .workers import (
     FileNotFoundError,
     FileUploadError,
+    LeaseLostError,
     WorkerService,
     WorkerServiceError,
 )
@@ -32,17 +41,30 @@ __all__ = [
     "FileAlreadyExistsError",
     "BaseAlgorithm",
     "BaseAlgorithmError",
+    "MultiInputAlgorithm",
     "AlgorithmAbstractFactory",
     "AlgorithmExecutionError",
     "AlgorithmValidationError",
+    "FairShareClaimPolicy",
+    "MemoryBudget",
+    "LeaseHeartbeat",
+    "GroupLeaseHeartbeat",
+    "LeaseReaper",
+    "TaskPartitionService",
+    "PartitionServiceError",
+    "TaskProgress",
+    "CachedTask",
+    "TerminalTaskCache",
     "TaskService",
     "TaskServiceError",
     "InvalidAlgorithmParamsError",
+    "TaskAlreadyFinishedError",
     "TaskNotFoundError",
     "WorkerService",
     "WorkerServiceError",
     "WorkerTaskNotFoundError",
     "FileNotFoundError",
     "FileUploadError",
+    "LeaseLostError",
     "WorkerAlgorithmExecutionError",
 ]
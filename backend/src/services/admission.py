@@ -0,0 +1,98 @@
+import multiprocessing
+import time
+from typing import Callable
+
+
+class MemoryBudget:
+    """Общий для процессов-воркеров бюджет памяти с допуском задач.
+
+    Создаётся супервизором до fork и наследуется дочерними процессами. Каждый
+    дочерний процесс выполняет одну задачу за раз и резервирует её оценку
+    пиковой памяти в своём слоте; сумма по слотам не превышает `limit_bytes`.
+
+    Правила допуска:
+    - задача допускается, если её резерв помещается в остаток бюджета, поэтому
+      небольшие задачи проходят мимо ждущей крупной;
+    - задача крупнее всего бюджета допускается, когда больше ничего не
+      зарезервировано;
+    - задача, ждущая дольше `starvation_sec`, помечается голодающей: пока она
+      не допущена, новые задачи не допускаются, и память освобождается для неё.
+
+    Слот освобождается самим воркером после задачи, а супервизором - при
+    смерти процесса, чтобы резерв убитого по OOM воркера не утёк.
+    """
+
+    def __init__(
+        self,
+        limit_bytes: int,
+        slots: int,
+        starvation_sec: float = 60.0,
+        ctx=multiprocessing,
+    ):
+        self._limit = limit_bytes
+        self._starvation_sec = starvation_sec
+        self._cond = ctx.Condition()
+        self._reserved = ctx.Array("q", slots, lock=False)
+        self._starving = ctx.Value("i", 0, lock=False)
+
+    @property
+    def limit_bytes(self) -> int:
+        return self._limit
+
+    def reserved_bytes(self) -> int:
+        with self._cond:
+            return sum(self._reserved)
+
+    def reserve(
+        self,
+        slot: int,
+        nbytes: int,
+        on_wait: Callable[[], None] | None = None,
+        wait_interval_sec: float = 1.0,
+    ) -> None:
+        """Ждёт, пока задача не поместится в бюджет, и резервирует память.
+
+        Args:
+            slot (int): Слот процесса-воркера.
+            nbytes (int): Оценка пиковой памяти задачи.
+            on_wait (Callable[[], None] | None): Вызывается между попытками вне
+                блокировки; может бросить исключение, чтобы прекратить ожидание
+                (например, при отмене задачи).
+            wait_interval_sec (float): Период проверки `on_wait` и старения.
+        """
+        started = time.monotonic()
+        starving = False
+        try:
+            while True:
+                with self._cond:
+                    if self._admits(nbytes, starving):
+                        self._reserved[slot] = nbytes
+                        return
+                    if (
+                        not starving
+                        and time.monotonic() - started > self._starvation_sec
+                    ):
+                        starving = True
+                        self._starving.value += 1
+                    self._cond.wait(wait_interval_sec)
+                if on_wait is not None:
+                    on_wait()
+        finally:
+            if starving:
+                with self._cond:
+                    self._starving.value -= 1
+                    self._cond.notify_all()
+
+    def release(self, slot: int) -> None:
+        """Освобождает резерв слота и будит ждущие процессы."""
+        with self._cond:
+            if self._reserved[slot]:
+                self._reserved[slot] = 0
+                self._cond.notify_all()
+
+    def _admits(self, nbytes: int, starving: bool) -> bool:
+        # Вызывается под блокировкой
+        if self._starving.value and not starving:
+            return False
+        reserved = sum(self._reserved)
+        return reserved == 0 or reserved + nbytes <= self._limit
@@ -1,8 +1,22 @@
+import importlib
 from abc import ABC, abstractmethod
-from typing import Callable, Generic, TypeVar
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, TypeVar
 
 from src.models.schemas import AlgorithmParamsBaseModel
 
+from .params import (
+    RasterClipAlgorithmParams,
+    RasterMosaicAlgorithmParams,
+    RasterRescaleAlgorithmParams,
+    RasterStatsAlgorithmParams,
+    RasterTilesAlgorithmParams,
+    RasterTransformAlgorithmParams,
+    RasterTranslateAlgorithmParams,
+    VectorSimplifyAlgorithmParams,
+    VectorTransformAlgorithmParams,
+)
+
 
 class BaseAlgorithmError(Exception):
     """Базовый класс для ошибок алгоритмов обработки данных."""
@@ -18,12 +32,46 @@ class AlgorithmExecutionError(BaseAlgorithmError):
 
 T = TypeVar("T", bound=AlgorithmParamsBaseModel)
 
+# Расширения входов-архивов, которые GDAL открывает на месте через
+# /vsizip и /vsitar; результат обработки таких входов упаковывается в zip.
+ARCHIVE_EXTENSIONS = frozenset({"zip", "tar", "tar.gz", "tgz"})
+
+
+def is_archive_extension(file_ext: str) -> bool:
+    """Проверяет, является ли расширение файла архивом с набором данных."""
+    return file_ext.lower() in ARCHIVE_EXTENSIONS
+
+
+# Сигнатура progress callback GDAL: (доля выполнения 0..1, сообщение, user_data).
+# Возврат 0 прерывает операцию GDAL, 1 - продолжает её.
+ProgressCallback = Callable[[float, Any, Any], int]
+
+
+def scaled_progress(
+    progress: ProgressCallback | None, start: float, end: float
+) -> ProgressCallback | None:
+    """Переводит прогресс этапа 0..1 в отрезок start..end общего прогресса."""
+    if progress is None:
+        return None
+    return lambda complete, message=None, user_data=None: progress(
+        start + (end - start) * complete, message, user_data
+    )
+
 
 class BaseAlgorithm(ABC, Generic[T]):
     """Базовый класс для алгоритмов обработки геопространственных данных."""
 
     _name = "BASE_ALGORITHM"
 
+    # Параметры оценки пиковой памяти задачи (см. estimate_peak_memory)
+    memory_factor: float = 4.0
+    memory_overhead_bytes: int = 256 * 1024 * 1024
+
+    # Компактный JSON-результат последнего запуска (статистика, счётчики);
+    # воркер сохраняет его в Task.result. Экземпляр алгоритма создаётся на
+    # каждую задачу, поэтому результаты разных задач не смешиваются.
+    result: dict | None = None
+
     @classmethod
     def name(cls) -> str:
         """Возвращает название алгоритма.
@@ -34,12 +82,20 @@ class BaseAlgorithm(ABC, Generic[T]):
         return cls._name
 
     @abstractmethod
-    def run(self, input_file_bytes: bytes, file_ext: str, params: T) -> bytes:
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: T,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
         """Запускает алгоритм обработки данных.
 
         Args:
             input_file_bytes (bytes): Байтовое представление входного файла.
             file_ext (str): Расширение входного файла.
+            progress (ProgressCallback | None): Callback прогресса GDAL; если он
+                вернёт 0, операция прерывается.
         Returns:
             bytes: Байтовое представление выходного файла.
         Raises:
@@ -49,6 +105,34 @@ class BaseAlgorithm(ABC, Generic[T]):
             "Метод run() должен быть реализован в дочернем классе."
         )
 
+    def output_extension(self, file_ext: str, params: T) -> str:
+        """Возвращает расширение выходного файла для входа с расширением `file_ext`.
+
+        Args:
+            file_ext (str): Расширение входного файла.
+            params (T): Параметры алгоритма.
+        Returns:
+            str: Расширение выходного файла: "zip" для архивов, иначе как у входа.
+        """
+        return "zip" if is_archive_extension(file_ext) else file_ext
+
+    def estimate_peak_memory(self, input_size: int, params: T) -> int:
+        """Оценивает пиковую память, нужную задаче, для допуска к выполнению.
+
+        Во время выполнения одновременно живут входные байты, их копия в
+        /vsimem, выходной файл в /vsimem и выходные байты, поэтому по умолчанию
+        оценка пропорциональна размеру входа плюс постоянные накладные расходы
+        GDAL (блочный кэш, буфер Warp). Алгоритмы, у которых размер результата
+        зависит от параметров, переопределяют метод.
+
+        Args:
+            input_size (int): Размер входного файла в байтах.
+            params (T): Параметры алгоритма.
+        Returns:
+            int: Оценка пиковой памяти в байтах.
+        """
+        return int(input_size * self.memory_factor) + self.memory_overhead_bytes
+
     @classmethod
     @abstractmethod
     def get_pydantic_model(cls) -> type[T]:
@@ -64,19 +148,120 @@ class BaseAlgorithm(ABC, Generic[T]):
         )
 
 
+class MultiInputAlgorithm(BaseAlgorithm[T]):
+    """Базовый класс для алгоритмов с несколькими входными файлами.
+
+    Входы передаются итератором пар (байты, расширение): воркер скачивает
+    файлы параллельно и отдаёт их по мере готовности, а алгоритм сразу
+    переносит байты в /vsimem. Так в памяти Python одновременно находятся
+    лишь несколько входов, а не все сразу.
+    """
+
+    @abstractmethod
+    def run_inputs(
+        self,
+        inputs: Iterable[tuple[bytes, str]],
+        params: T,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Запускает алгоритм над несколькими входными файлами.
+
+        Args:
+            inputs (Iterable[tuple[bytes, str]]): Байты и расширения входных файлов.
+            params (T): Параметры алгоритма.
+            progress (ProgressCallback | None): Callback прогресса GDAL.
+        Returns:
+            bytes: Байтовое представление выходного файла.
+        """
+        raise NotImplementedError(
+            "Метод run_inputs() должен быть реализован в дочернем классе."
+        )
+
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: T,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Запускает алгоритм над единственным входным файлом."""
+        return self.run_inputs([(input_file_bytes, file_ext)], params, progress)
+
+
+@dataclass
+class AlgorithmSpec:
+    """Описание зарегистрированного алгоритма.
+
+    Модель параметров доступна сразу, а класс реализации (и вместе с ним
+    GDAL/PROJ) импортируется только при первом обращении к `load()`.
+    """
+
+    name: str
+    params_model: type[AlgorithmParamsBaseModel]
+    implementation: str
+    multi_input: bool = False
+    algorithm_cls: type[BaseAlgorithm] | None = None
+
+    def load(self) -> type[BaseAlgorithm]:
+        """Импортирует модуль реализации и возвращает класс алгоритма."""
+        if self.algorithm_cls is None:
+            module_name, _, cls_name = self.implementation.partition(":")
+            module = importlib.import_module(module_name, package=__name__)
+            self.algorithm_cls = getattr(module, cls_name)
+        return self.algorithm_cls
+
+
 class AlgorithmAbstractFactory:
     registry: dict[
         str,
-        type[BaseAlgorithm],
+        AlgorithmSpec,
     ] = {}
 
+    @classmethod
+    def _get_spec(cls, name: str) -> AlgorithmSpec:
+        name = name.upper()
+        if name not in cls.registry:
+            raise ValueError(f"Алгоритм с именем '{name}' не найден.")
+        return cls.registry[name]
+
+    @classmethod
+    def get_params_model(cls, name: str) -> type[AlgorithmParamsBaseModel]:
+        """Возвращает Pydantic-модель параметров алгоритма без импорта его реализации.
+
+        Args:
+            name (str): Название алгоритма.
+
+        Returns:
+            type[AlgorithmParamsBaseModel]: Модель параметров алгоритма.
+
+        Raises:
+            ValueError: Если алгоритм с таким названием не зарегистрирован.
+        """
+        return cls._get_spec(name).params_model
+
+    @classmethod
+    def accepts_multiple_inputs(cls, name: str) -> bool:
+        """Проверяет, принимает ли алгоритм несколько входных файлов.
+
+        Args:
+            name (str): Название алгоритма.
+
+        Returns:
+            bool: True для наследников MultiInputAlgorithm.
+
+        Raises:
+            ValueError: Если алгоритм с таким названием не зарегистрирован.
+        """
+        return cls._get_spec(name).multi_input
+
     @classmethod
     def get_algorithm(cls, name: str) -> BaseAlgorithm:
         """Возвращает экземпляр алгоритма по его названию.
 
+        При первом вызове для алгоритма импортируется модуль его реализации.
+
         Args:
             name (str): Название алгоритма.
-            params (dict): Параметры алгоритма.
 
         Returns:
             BaseAlgorithm: Экземпляр алгоритма.
@@ -84,50 +269,133 @@ class AlgorithmAbstractFactory:
         Raises:
             ValueError: Если алгоритм с таким названием не зарегистрирован.
         """
-        name = name.upper()
-        if name not in cls.registry:
-            raise ValueError(f"Алгоритм с именем '{name}' не найден.")
+        spec = cls._get_spec(name)
         try:
-            algorithm = cls.registry[name]()
+            algorithm = spec.load()()
         except Exception:
-            raise ValueError(f"Ошибка при создании экземпляра алгоритма '{name}'.")
+            raise ValueError(f"Ошибка при создании экземпляра алгоритма '{spec.name}'.")
 
         return algorithm
 
     @classmethod
     def list_algorithms(cls) -> list[type[BaseAlgorithm]]:
-        """Возвращает список названий всех зарегистрированных алгоритмов.
+        """Загружает и возвращает классы всех зарегистрированных алгоритмов.
 
         Returns:
             list[type[BaseAlgorithm]]: Список классов алгоритмов.
         """
-        return list(cls.registry.values())
+        return [spec.load() for spec in cls.registry.values()]
+
+    @classmethod
+    def declare_algorithm(
+        cls,
+        algorithm_name: str,
+        params_model: type[AlgorithmParamsBaseModel],
+        implementation: str,
+        multi_input: bool = False,
+    ) -> None:
+        """Объявляет алгоритм без импорта его реализации.
+
+        Args:
+            algorithm_name (str): Название алгоритма.
+            params_model (type[AlgorithmParamsBaseModel]): Модель параметров.
+            implementation (str): Путь к классу реализации вида "модуль:Класс";
+                модуль может быть относительным к этому пакету.
+            multi_input (bool): Реализация - наследник MultiInputAlgorithm.
+        """
+        algorithm_name = algorithm_name.upper()
+        if algorithm_name in cls.registry:
+            raise ValueError(
+                f"Алгоритм с именем '{algorithm_name}' уже зарегистрирован."
+            )
+        cls.registry[algorithm_name] = AlgorithmSpec(
+            name=algorithm_name,
+            params_model=params_model,
+            implementation=implementation,
+            multi_input=multi_input,
+        )
 
     @classmethod
     def register_algorithm(
         cls,
         algorithm_name: str,
     ) -> Callable[[type[BaseAlgorithm]], type[BaseAlgorithm]]:
-        """Декоратор для регистрации алгоритмов в системе."""
+        """Декоратор для регистрации класса реализации алгоритма.
+
+        Если алгоритм уже объявлен через declare_algorithm, к объявлению
+        привязывается класс; иначе алгоритм регистрируется целиком.
+        """
         algorithm_name = algorithm_name.upper()
 
         def decorator(algorithm_cls: type[BaseAlgorithm]) -> type[BaseAlgorithm]:
             if not issubclass(algorithm_cls, BaseAlgorithm):
                 raise ValueError("Класс должен наследоваться от BaseAlgorithm")
-            if algorithm_name in AlgorithmAbstractFactory.registry:
+            spec = AlgorithmAbstractFactory.registry.get(algorithm_name)
+            if spec is None:
+                spec = AlgorithmSpec(
+                    name=algorithm_name,
+                    params_model=algorithm_cls.get_pydantic_model(),
+                    implementation=f"{algorithm_cls.__module__}:{algorithm_cls.__name__}",
+                    multi_input=issubclass(algorithm_cls, MultiInputAlgorithm),
+                )
+                AlgorithmAbstractFactory.registry[algorithm_name] = spec
+            elif spec.algorithm_cls not in (None, algorithm_cls):
                 raise ValueError(
                     f"Алгоритм с именем '{algorithm_name}' уже зарегистрирован."
                 )
             algorithm_cls._name = algorithm_name
-            AlgorithmAbstractFactory.registry[algorithm_name] = algorithm_cls
+            spec.algorithm_cls = algorithm_cls
 
             return algorithm_cls
 
         return decorator
 
 
-from .raster_rescale import RasterRescaleAlgorithm  # type: ignore  # noqa: E402, F401
-from .raster_transform import RasterTransformAlgorithm  # noqa: E402, F401
-from .vector_transform import (  # type: ignore # noqa: E402, F401
-    VectorTransformAlgorithm,  # noqa: E402, F401
+# Реализации импортируют osgeo.gdal, поэтому здесь объявляются только модели
+# параметров и пути к классам; модули реализаций загружаются по требованию.
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_RESCALE",
+    RasterRescaleAlgorithmParams,
+    ".raster_rescale:RasterRescaleAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_TRANSFORM",
+    RasterTransformAlgorithmParams,
+    ".raster_transform:RasterTransformAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "VECTOR_TRANSFORM",
+    VectorTransformAlgorithmParams,
+    ".vector_transform:VectorTransformAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_MOSAIC",
+    RasterMosaicAlgorithmParams,
+    ".raster_mosaic:RasterMosaicAlgorithm",
+    multi_input=True,
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_STATS",
+    RasterStatsAlgorithmParams,
+    ".raster_stats:RasterStatsAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_CLIP",
+    RasterClipAlgorithmParams,
+    ".raster_clip:RasterClipAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "VECTOR_SIMPLIFY",
+    VectorSimplifyAlgorithmParams,
+    ".vector_simplify:VectorSimplifyAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_TILES",
+    RasterTilesAlgorithmParams,
+    ".raster_tiles:RasterTilesAlgorithm",
+)
+AlgorithmAbstractFactory.declare_algorithm(
+    "RASTER_TRANSLATE",
+    RasterTranslateAlgorithmParams,
+    ".raster_translate:RasterTranslateAlgorithm",
 )
@@ -0,0 +1,55 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BandAccumulator:
+    """Потоковые статистики канала, объединяемые по окнам.
+
+    Среднее и сумма квадратов отклонений окон объединяются попарно (формулы
+    Чана), поэтому стандартное отклонение не теряет точности на больших
+    значениях, как при накоплении суммы квадратов.
+    """
+
+    count: int = 0
+    nodata_count: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        n = values.size
+        if n == 0:
+            return
+        values = values.astype(np.float64, copy=False)
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def as_dict(self) -> dict:
+        if self.count == 0:
+            return {
+                "count": 0,
+                "nodata_count": self.nodata_count,
+                "min": None,
+                "max": None,
+                "mean": None,
+                "stddev": None,
+            }
+        return {
+            "count": self.count,
+            "nodata_count": self.nodata_count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "stddev": math.sqrt(self.m2 / self.count),
+        }
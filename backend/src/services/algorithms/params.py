@@ -0,0 +1,398 @@
+from typing import Annotated, Any, Literal
+
+from pydantic import Field, model_validator
+
+from src.models.schemas import AlgorithmParamsBaseModel
+
+# Методы передискретизации, общие для Warp (-r) и чтения окон (RasterIO)
+ResamplingMethod = Literal[
+    "near", "bilinear", "cubic", "cubicspline", "lanczos", "average", "mode"
+]
+
+
+class WarpTuningParams(AlgorithmParamsBaseModel):
+    """Общие параметры gdal.Warp, меняющие точность на скорость.
+
+    Значения по умолчанию совпадают с поведением gdalwarp по умолчанию.
+    """
+
+    resampling: ResamplingMethod = Field(
+        default="near", description="Метод передискретизации"
+    )
+    error_threshold: float | None = Field(
+        default=None,
+        ge=0,
+        description=(
+            "Допустимая ошибка (в пикселях) приближённого преобразования координат; "
+            "по умолчанию 0.125, 0 - точное преобразование каждого пикселя"
+        ),
+    )
+    overview_level: Literal["auto", "none"] | Annotated[int, Field(ge=0)] = Field(
+        default="auto",
+        description=(
+            "Обзорный уровень источника: auto - ближайший к целевому разрешению, "
+            "none - полное разрешение, N - номер уровня (0 - первый обзорный)"
+        ),
+    )
+    target_aligned_pixels: bool = Field(
+        default=False,
+        description="Выровнять границы результата по сетке целевого разрешения (-tap)",
+    )
+
+    def warp_kwargs(self) -> dict[str, Any]:
+        """Возвращает именованные аргументы gdal.WarpOptions для этих параметров."""
+        overview_level = self.overview_level
+        if isinstance(overview_level, str):
+            overview_level = overview_level.upper()
+        return {
+            "resampleAlg": self.resampling,
+            "errorThreshold": self.error_threshold,
+            "overviewLevel": overview_level,
+            "targetAlignedPixels": self.target_aligned_pixels,
+        }
+
+
+class RasterRescaleAlgorithmParams(WarpTuningParams):
+    """Pydantic-модель для параметров алгоритма изменения разрешения растровых данных."""
+
+    xres: float = Field(
+        description="Целевое разрешение по оси X (в единицах координатной системы)",
+    )
+    yres: float = Field(
+        description="Целевое разрешение по оси Y (в единицах координатной системы)",
+    )
+    # square: bool | None = Field(
+    #     None,
+    #     description="Если True, сохранять пропорции пикселя при изменении разрешения",
+    # )
+
+    # @model_validator(mode="after")
+    # def _validate_choice(self) -> "RasterRescaleAlgorithmParams":
+    #     if self.square and (self.xres is None) and (self.yres is None):
+    #         return self
+    #     if (self.xres is None) or (self.yres is None) or (self.square is not None):
+    #         raise ValueError(
+    #             "Either 'square' must be True or both 'xres' and 'yres' must be provided"
+    #         )
+    #     return self
+
+
+class RasterTransformAlgorithmParams(WarpTuningParams):
+    """Pydantic-модель для параметров алгоритма трансформации растровых данных."""
+
+    srs_def: str = Field(
+        ..., description="Целевая система координат (например, 'EPSG:4326')"
+    )
+    s_srs: str | None = Field(
+        default=None,
+        description="Исходная система координат (необязательно, по умолчанию определяется автоматически)",
+    )
+    xres: float | None = Field(
+        default=None,
+        gt=0,
+        description="Целевое разрешение по оси X (по умолчанию подбирается GDAL)",
+    )
+    yres: float | None = Field(
+        default=None,
+        gt=0,
+        description="Целевое разрешение по оси Y (по умолчанию подбирается GDAL)",
+    )
+
+    @model_validator(mode="after")
+    def _validate_resolution(self) -> "RasterTransformAlgorithmParams":
+        if (self.xres is None) != (self.yres is None):
+            raise ValueError("xres и yres задаются вместе")
+        if self.target_aligned_pixels and self.xres is None:
+            raise ValueError("target_aligned_pixels требует xres и yres")
+        return self
+
+
+class VectorTransformAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма трансформации векторных данных."""
+
+    srs_def: str = Field(
+        ..., description="Целевая система координат (например, 'EPSG:4326')"
+    )
+    s_srs: str | None = Field(
+        default=None,
+        description="Исходная система координат (необязательно, по умолчанию определяется автоматически)",
+    )
+    bbox: tuple[float, float, float, float] | None = Field(
+        default=None,
+        description="Пространственный фильтр: minx, miny, maxx, maxy (необязательно)",
+    )
+    bbox_srs: str | None = Field(
+        default=None,
+        description="Система координат bbox (по умолчанию - как у слоя)",
+    )
+    where: str | None = Field(
+        default=None,
+        max_length=4096,
+        description="Атрибутивный фильтр в синтаксисе OGR SQL WHERE (необязательно)",
+    )
+    layers: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="Слои для обработки (по умолчанию - все слои)",
+    )
+    select_fields: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="Сохраняемые атрибуты (по умолчанию - все атрибуты)",
+    )
+
+    @model_validator(mode="after")
+    def _validate_bbox(self) -> "VectorTransformAlgorithmParams":
+        if self.bbox is not None:
+            minx, miny, maxx, maxy = self.bbox
+            if minx >= maxx or miny >= maxy:
+                raise ValueError("bbox задаётся как minx, miny, maxx, maxy")
+        return self
+
+
+class RasterMosaicAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма сборки мозаики из растров."""
+
+    srs_def: str | None = Field(
+        default=None,
+        description="Целевая система координат мозаики (по умолчанию - как у входов)",
+    )
+    xres: float | None = Field(
+        default=None,
+        gt=0,
+        description="Разрешение мозаики по оси X (по умолчанию - наивысшее среди входов)",
+    )
+    yres: float | None = Field(
+        default=None,
+        gt=0,
+        description="Разрешение мозаики по оси Y (по умолчанию - наивысшее среди входов)",
+    )
+    src_nodata: float | None = Field(
+        default=None,
+        description="Значение NoData входов: такие пиксели не перекрывают соседние тайлы",
+    )
+    dst_nodata: float | None = Field(
+        default=None, description="Значение NoData пикселей мозаики вне входов"
+    )
+
+    @model_validator(mode="after")
+    def _validate_resolution(self) -> "RasterMosaicAlgorithmParams":
+        if (self.xres is None) != (self.yres is None):
+            raise ValueError("xres и yres задаются вместе")
+        return self
+
+
+class RasterStatsAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма расчёта статистики растра."""
+
+    bands: list[int] | None = Field(
+        default=None,
+        min_length=1,
+        description="Номера каналов, начиная с 1 (по умолчанию - все каналы)",
+    )
+    nodata: float | None = Field(
+        default=None,
+        description="Значение NoData; по умолчанию - маска или NoData каналов",
+    )
+    approximate: bool = Field(
+        default=False,
+        description="Считать по обзорному уровню (overview), если он есть",
+    )
+    histogram_bins: int = Field(
+        default=256,
+        ge=0,
+        le=65536,
+        description="Число интервалов гистограммы (0 - без гистограммы)",
+    )
+    histogram_min: float | None = Field(
+        default=None,
+        description="Нижняя граница гистограммы; без границ нужен второй проход по данным",
+    )
+    histogram_max: float | None = Field(
+        default=None, description="Верхняя граница гистограммы"
+    )
+
+    @model_validator(mode="after")
+    def _validate_histogram_range(self) -> "RasterStatsAlgorithmParams":
+        if (self.histogram_min is None) != (self.histogram_max is None):
+            raise ValueError("histogram_min и histogram_max задаются вместе")
+        if self.histogram_min is not None and self.histogram_min >= self.histogram_max:
+            raise ValueError("histogram_min должен быть меньше histogram_max")
+        if self.bands is not None and min(self.bands) < 1:
+            raise ValueError("Номера каналов начинаются с 1")
+        return self
+
+
+class RasterClipAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма вырезания области из растра."""
+
+    bbox: tuple[float, float, float, float] | None = Field(
+        default=None, description="Область вырезания: minx, miny, maxx, maxy"
+    )
+    bbox_srs: str | None = Field(
+        default=None,
+        description="Система координат bbox (по умолчанию - как у растра)",
+    )
+    cutline: str | None = Field(
+        default=None,
+        description="Геометрия вырезания (POLYGON/MULTIPOLYGON) в WKT или GeoJSON",
+    )
+    cutline_srs: str | None = Field(
+        default=None,
+        description="Система координат cutline (по умолчанию - как у растра)",
+    )
+    srs_def: str | None = Field(
+        default=None,
+        description="Целевая система координат (необязательно, перепроецирование в том же проходе)",
+    )
+    xres: float | None = Field(
+        default=None, gt=0, description="Целевое разрешение по оси X (необязательно)"
+    )
+    yres: float | None = Field(
+        default=None, gt=0, description="Целевое разрешение по оси Y (необязательно)"
+    )
+
+    @model_validator(mode="after")
+    def _validate_area(self) -> "RasterClipAlgorithmParams":
+        if (self.bbox is None) == (self.cutline is None):
+            raise ValueError("Нужно указать либо bbox, либо cutline")
+        if self.bbox is not None:
+            minx, miny, maxx, maxy = self.bbox
+            if minx >= maxx or miny >= maxy:
+                raise ValueError("bbox задаётся как minx, miny, maxx, maxy")
+        if (self.xres is None) != (self.yres is None):
+            raise ValueError("xres и yres задаются вместе")
+        return self
+
+
+class VectorSimplifyAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма упрощения векторных данных."""
+
+    tolerance: float = Field(
+        ...,
+        gt=0,
+        description=(
+            "Допуск упрощения в единицах целевой СК (srs_def), без srs_def - "
+            "в единицах исходной СК"
+        ),
+    )
+    xy_res: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Точность координат результата в единицах его СК (srs_def, без неё - "
+            "исходной), например 0.000001 для градусов"
+        ),
+    )
+    srs_def: str | None = Field(
+        default=None, description="Целевая система координат (необязательно)"
+    )
+    s_srs: str | None = Field(
+        default=None,
+        description="Исходная система координат (необязательно, по умолчанию определяется автоматически)",
+    )
+    layers: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="Слои для обработки (по умолчанию - все слои)",
+    )
+    batch_size: int = Field(
+        default=20000,
+        ge=1,
+        description="Число объектов в одной транзакции записи",
+    )
+
+
+class RasterTilesAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма построения пирамиды тайлов."""
+
+    min_zoom: int = Field(default=0, ge=0, le=24, description="Минимальный уровень")
+    max_zoom: int | None = Field(
+        default=None,
+        ge=0,
+        le=24,
+        description="Максимальный уровень (по умолчанию - по разрешению растра)",
+    )
+    tile_size: Literal[256, 512] = Field(
+        default=256, description="Размер тайла в пикселях"
+    )
+    tile_format: Literal["png", "jpeg"] = Field(
+        default="png",
+        description="Формат тайлов; jpeg без прозрачности, но заметно компактнее",
+    )
+    resampling: ResamplingMethod = Field(
+        default="bilinear", description="Метод передискретизации"
+    )
+    processes: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Число процессов, параллельно отрисовывающих тайлы",
+    )
+
+    @model_validator(mode="after")
+    def _validate_zoom(self) -> "RasterTilesAlgorithmParams":
+        if self.max_zoom is not None and self.max_zoom < self.min_zoom:
+            raise ValueError("max_zoom не может быть меньше min_zoom")
+        return self
+
+
+# Драйверы результата RASTER_TRANSLATE и расширения их файлов
+TRANSLATE_DRIVER_EXTENSIONS = {
+    "GTiff": "tif",
+    "COG": "tif",
+    "PNG": "png",
+    "JPEG": "jpg",
+    "JP2OpenJPEG": "jp2",
+    "WEBP": "webp",
+}
+
+
+class RasterTranslateAlgorithmParams(AlgorithmParamsBaseModel):
+    """Pydantic-модель для параметров алгоритма выборки каналов и смены типа растра."""
+
+    bands: list[Annotated[int, Field(ge=1)]] | None = Field(
+        default=None,
+        min_length=1,
+        description="Номера каналов результата, начиная с 1 (по умолчанию - все)",
+    )
+    output_type: (
+        Literal["Byte", "UInt16", "Int16", "UInt32", "Int32", "Float32", "Float64"]
+        | None
+    ) = Field(
+        default=None, description="Тип данных результата (по умолчанию - как у входа)"
+    )
+    scale: Literal["auto"] | tuple[float, float, float, float] | None = Field(
+        default=None,
+        description=(
+            "Масштабирование значений: src_min, src_max, dst_min, dst_max или "
+            "auto - min..max каждого канала в 0..255 (как gdal_translate -scale)"
+        ),
+    )
+    nodata: float | None = Field(
+        default=None,
+        description=(
+            "NoData результата; пиксели, равные NoData входа, получают это значение "
+            "(если у входа NoData нет, значение только назначается)"
+        ),
+    )
+    driver: Literal["GTiff", "COG", "PNG", "JPEG", "JP2OpenJPEG", "WEBP"] | None = (
+        Field(
+            default=None,
+            description="Драйвер результата (по умолчанию - по расширению входа)",
+        )
+    )
+    creation_options: dict[str, str] | None = Field(
+        default=None,
+        description="Опции создания драйвера, например {'COMPRESS': 'ZSTD'}",
+    )
+
+    @model_validator(mode="after")
+    def _validate_creation_options(self) -> "RasterTranslateAlgorithmParams":
+        if self.nodata is not None and self.scale is not None:
+            # Масштабирование применилось бы и к подставленному значению NoData
+            raise ValueError("nodata нельзя задавать вместе с scale")
+        for key in self.creation_options or {}:
+            if not key.replace("_", "").isalnum():
+                raise ValueError(f"Недопустимое имя опции создания: {key}")
+        return self
@@ -0,0 +1,137 @@
+from typing import Iterable, override
+
+from osgeo import gdal  # pyright: ignore[reportMissingImports]
+
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    AlgorithmValidationError,
+    MultiInputAlgorithm,
+    ProgressCallback,
+)
+from .params import RasterMosaicAlgorithmParams
+from .vsimem import VsimemWorkspace
+
+_CREATION_OPTIONS = ["TILED=YES", "COMPRESS=DEFLATE", "BIGTIFF=IF_SAFER"]
+
+
+@AlgorithmAbstractFactory.register_algorithm("RASTER_MOSAIC")
+class RasterMosaicAlgorithm(MultiInputAlgorithm[RasterMosaicAlgorithmParams]):
+    """Алгоритм сборки мозаики из нескольких растров в один GeoTIFF."""
+
+    # Входы лежат в /vsimem по одному разу (байты Python освобождаются сразу
+    # после записи), рядом - сжатая мозаика и её байты.
+    memory_factor = 3.0
+
+    @override
+    def run_inputs(
+        self,
+        inputs: Iterable[tuple[bytes, str]],
+        params: RasterMosaicAlgorithmParams,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Собирает мозаику из входных растров.
+
+        Над входами строится VRT, поэтому пиксели читаются лениво, блоками,
+        и мозаика пишется за один проход Warp с необязательным
+        перепроецированием и изменением разрешения. Если входы лежат в разных
+        системах координат, VRT для них не строится, и Warp перепроецирует
+        каждый вход сам.
+
+        Args:
+            inputs (Iterable[tuple[bytes, str]]): Байты и расширения входных растров
+                (или .zip/.tar.gz-архивов с ними).
+            params (RasterMosaicAlgorithmParams): Параметры мозаики.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
+        Returns:
+            bytes: Байтовое представление GeoTIFF мозаики.
+        Raises:
+            AlgorithmValidationError: Если вход не открывается как растр.
+            AlgorithmExecutionError: Если GDAL не смог построить мозаику.
+        """
+        with VsimemWorkspace() as workspace:
+            paths: list[str] = []
+            srs_list = []
+            for index, (data, file_ext) in enumerate(inputs):
+                path, _ = workspace.open_input(
+                    data, file_ext, "raster", name=f"in_{index}"
+                )
+                del data
+                ds = gdal.Open(path)
+                if ds is None or ds.RasterCount == 0:
+                    raise AlgorithmValidationError(
+                        f"Вход {index} не является растром: {gdal.GetLastErrorMsg()}"
+                    )
+                srs_list.append(ds.GetSpatialRef())
+                ds = None
+                paths.append(path)
+            if not paths:
+                raise AlgorithmValidationError("Не передано ни одного входного растра")
+
+            if _same_srs(srs_list):
+                vrt_path = workspace.path("mosaic.vrt")
+                vrt_ds = gdal.BuildVRT(
+                    vrt_path,
+                    paths,
+                    options=gdal.BuildVRTOptions(
+                        resolution="highest",
+                        srcNodata=params.src_nodata,
+                        VRTNodata=params.dst_nodata,
+                    ),
+                )
+                if vrt_ds is None:
+                    raise AlgorithmExecutionError(
+                        f"GDAL BuildVRT завершился без результата: {gdal.GetLastErrorMsg()}"
+                    )
+                # Закрываем VRT, чтобы описание было записано до чтения Warp
+                vrt_ds = None
+                sources: str | list[str] = vrt_path
+            else:
+                sources = paths
+
+            opts = gdal.WarpOptions(
+                format="GTiff",
+                dstSRS=params.srs_def,
+                xRes=params.xres,
+                yRes=params.yres,
+                srcNodata=params.src_nodata,
+                dstNodata=params.dst_nodata,
+                creationOptions=_CREATION_OPTIONS,
+                multithread=True,
+                callback=progress,
+            )
+            out_ds = gdal.Warp(workspace.output_path("tif"), sources, options=opts)
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Warp завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
+            out_ds = None  # type: ignore[assignment]
+            return workspace.read_output(as_archive=False)
+
+    @override
+    def output_extension(
+        self, file_ext: str, params: RasterMosaicAlgorithmParams
+    ) -> str:
+        return "tif"
+
+    @override
+    @classmethod
+    def get_pydantic_model(cls) -> type[RasterMosaicAlgorithmParams]:
+        """Возвращает Pydantic-модель для валидации параметров алгоритма.
+
+        Returns:
+            BaseModel: Pydantic-модель параметров алгоритма.
+        """
+        return RasterMosaicAlgorithmParams
+
+
+def _same_srs(srs_list: list) -> bool:
+    """Проверяет, что все входы в одной системе координат (или все без неё)."""
+    first = srs_list[0]
+    for srs in srs_list[1:]:
+        if (first is None) != (srs is None):
+            return False
+        if first is not None and not first.IsSame(srs):
+            return False
+    return True
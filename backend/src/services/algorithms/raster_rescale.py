@@ -1,36 +1,16 @@
 from typing import override
 
 from osgeo import gdal  # pyright: ignore[reportMissingImports]
-from pydantic import Field
 
-from src.models.schemas import AlgorithmParamsBaseModel
-
-from . import AlgorithmAbstractFactory, BaseAlgorithm
-
-
-class RasterRescaleAlgorithmParams(AlgorithmParamsBaseModel):
-    """Pydantic-модель для параметров алгоритма изменения разрешения растровых данных."""
-
-    xres: float = Field(
-        description="Целевое разрешение по оси X (в единицах координатной системы)",
-    )
-    yres: float = Field(
-        description="Целевое разрешение по оси Y (в единицах координатной системы)",
-    )
-    # square: bool | None = Field(
-    #     None,
-    #     description="Если True, сохранять пропорции пикселя при изменении разрешения",
-    # )
-
-    # @model_validator(mode="after")
-    # def _validate_choice(self) -> "RasterRescaleAlgorithmParams":
-    #     if self.square and (self.xres is None) and (self.yres is None):
-    #         return self
-    #     if (self.xres is None) or (self.yres is None) or (self.square is not None):
-    #         raise ValueError(
-    #             "Either 'square' must be True or both 'xres' and 'yres' must be provided"
-    #         )
-    #     return self
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    BaseAlgorithm,
+    ProgressCallback,
+    is_archive_extension,
+)
+from .params import RasterRescaleAlgorithmParams
+from .vsimem import VsimemWorkspace
 
 
 @AlgorithmAbstractFactory.register_algorithm("RASTER_RESCALE")
@@ -43,11 +23,16 @@ class RasterRescaleAlgorithm(BaseAlgorithm[RasterRescaleAlgorithmParams]):
         input_file_bytes: bytes,
         file_ext: str,
         params: RasterRescaleAlgorithmParams,
+        progress: ProgressCallback | None = None,
     ) -> bytes:
         """Трансформирует растровые данные.
 
         Args:
-            input_file_bytes (bytes): Байтовое представление входного файла.
+            input_file_bytes (bytes): Байтовое представление входного файла
+                (или .zip/.tar.gz-архива с набором данных).
+            file_ext (str): Расширение входного файла.
+            params (RasterRescaleAlgorithmParams): Целевое разрешение и параметры Warp.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
         Returns:
             bytes: Байтовое представление выходного файла.
         """
@@ -56,32 +41,26 @@ class RasterRescaleAlgorithm(BaseAlgorithm[RasterRescaleAlgorithmParams]):
         yres = params.yres
         # square = self._params.square  # type: ignore[attr-defined]
 
-        gdal.FileFromMemBuffer(f"/vsimem/in.{file_ext}", input_file_bytes)
-
-        opts = gdal.WarpOptions(xRes=xres, yRes=yres)
-
-        out_ds = gdal.Warp(
-            f"/vsimem/out.{file_ext}", f"/vsimem/in.{file_ext}", options=opts
+        # При уменьшении разрешения overview_level="auto" читает ближайший
+        # обзорный уровень источника, а не все его пиксели.
+        opts = gdal.WarpOptions(
+            xRes=xres, yRes=yres, callback=progress, **params.warp_kwargs()
         )
 
-        f = gdal.VSIFOpenL(f"/vsimem/out.{file_ext}", "rb")
-        gdal.VSIFSeekL(f, 0, 2)
-        size = gdal.VSIFTellL(f)
-        gdal.VSIFSeekL(f, 0, 0)
-        result_bytes = gdal.VSIFReadL(1, size, f)
-        gdal.VSIFCloseL(f)
-
-        in_ds: gdal.Dataset = gdal.Open(f"/vsimem/in.{file_ext}")
-
-        # cleanup
-        gdal.Unlink(f"/vsimem/in.{file_ext}")
-        gdal.Unlink(f"/vsimem/out.{file_ext}")
-        if out_ds is not None:
+        with VsimemWorkspace() as workspace:
+            in_path, dataset_ext = workspace.open_input(
+                input_file_bytes, file_ext, "raster"
+            )
+            out_ds = gdal.Warp(
+                workspace.output_path(dataset_ext), in_path, options=opts
+            )
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Warp завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
             out_ds = None  # type: ignore[assignment]
-        if in_ds is not None:
-            in_ds = None  # type: ignore[assignment]
-
-        return result_bytes
+            return workspace.read_output(as_archive=is_archive_extension(file_ext))
 
     @override
     @classmethod
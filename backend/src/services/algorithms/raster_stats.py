@@ -0,0 +1,254 @@
+import json
+import math
+from typing import Iterator, override
+
+import numpy as np
+from osgeo import gdal  # pyright: ignore[reportMissingImports]
+
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    AlgorithmValidationError,
+    BaseAlgorithm,
+    ProgressCallback,
+)
+from .band_stats import BandAccumulator
+from .params import RasterStatsAlgorithmParams
+from .vsimem import VsimemWorkspace
+
+# Окно чтения состоит из целых блоков канала и содержит не больше стольких
+# пикселей: память алгоритма ограничена окном, а не размером растра.
+_WINDOW_PIXELS = 4 * 1024 * 1024
+
+# В приближённом режиме берётся самый грубый обзорный уровень, длинная
+# сторона которого не меньше этого размера.
+_APPROX_MIN_SIZE = 1024
+
+
+@AlgorithmAbstractFactory.register_algorithm("RASTER_STATS")
+class RasterStatsAlgorithm(BaseAlgorithm[RasterStatsAlgorithmParams]):
+    """Алгоритм расчёта статистики и гистограмм каналов растра."""
+
+    # Кроме входа и его копии в /vsimem живёт только окно чтения
+    memory_factor = 2.0
+
+    @override
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: RasterStatsAlgorithmParams,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Считает min, max, mean, stddev и гистограммы каналов растра.
+
+        Канал читается окнами из целых блоков в массивы NumPy. Без заданных
+        границ гистограммы она строится вторым проходом по диапазону
+        min..max, найденному первым.
+
+        Args:
+            input_file_bytes (bytes): Байтовое представление входного растра
+                (или .zip/.tar.gz-архива с ним).
+            file_ext (str): Расширение входного файла.
+            params (RasterStatsAlgorithmParams): Параметры расчёта.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
+        Returns:
+            bytes: JSON со статистикой каналов; он же сохраняется в `result`.
+        Raises:
+            AlgorithmValidationError: Если вход не растр или канал не существует.
+            AlgorithmExecutionError: Если чтение не удалось или было прервано.
+        """
+        with VsimemWorkspace() as workspace:
+            in_path, _ = workspace.open_input(input_file_bytes, file_ext, "raster")
+            ds = gdal.Open(in_path)
+            if ds is None or ds.RasterCount == 0:
+                raise AlgorithmValidationError(
+                    f"Вход не является растром: {gdal.GetLastErrorMsg()}"
+                )
+            band_numbers = params.bands or list(range(1, ds.RasterCount + 1))
+            invalid = [n for n in band_numbers if n > ds.RasterCount]
+            if invalid:
+                raise AlgorithmValidationError(
+                    f"В растре {ds.RasterCount} каналов, запрошены {invalid}"
+                )
+
+            tracker = _ProgressTracker(progress, len(band_numbers))
+            bands = []
+            for index, number in enumerate(band_numbers):
+                tracker.start_band(index)
+                bands.append(
+                    _band_stats(ds.GetRasterBand(number), number, params, tracker)
+                )
+            result = {
+                "width": ds.RasterXSize,
+                "height": ds.RasterYSize,
+                "band_count": ds.RasterCount,
+                "bands": bands,
+            }
+            ds = None
+
+        self.result = result
+        return json.dumps(result, ensure_ascii=False).encode("utf-8")
+
+    @override
+    def output_extension(
+        self, file_ext: str, params: RasterStatsAlgorithmParams
+    ) -> str:
+        return "json"
+
+    @override
+    @classmethod
+    def get_pydantic_model(cls) -> type[RasterStatsAlgorithmParams]:
+        """Возвращает Pydantic-модель для валидации параметров алгоритма.
+
+        Returns:
+            BaseModel: Pydantic-модель параметров алгоритма.
+        """
+        return RasterStatsAlgorithmParams
+
+
+class _ProgressTracker:
+    """Переводит пройденные окна в долю выполнения для progress callback."""
+
+    def __init__(self, progress: ProgressCallback | None, band_count: int):
+        self._progress = progress
+        self._band_count = band_count
+        self._band_index = 0
+
+    def start_band(self, index: int) -> None:
+        self._band_index = index
+
+    def report(self, band_fraction: float) -> None:
+        if self._progress is None:
+            return
+        complete = (self._band_index + band_fraction) / self._band_count
+        if not self._progress(complete, None, None):
+            raise AlgorithmExecutionError("Расчёт статистики прерван")
+
+
+def _band_stats(
+    band,
+    number: int,
+    params: RasterStatsAlgorithmParams,
+    tracker: _ProgressTracker,
+) -> dict:
+    """Считает статистику одного канала за один или два прохода."""
+    if gdal.DataTypeIsComplex(band.DataType):
+        raise AlgorithmValidationError(
+            f"Канал {number}: комплексный тип данных не поддерживается"
+        )
+    source, approximate = _source_band(band, params.approximate)
+    mask_band, nodata = _validity(source, params.nodata)
+    windows = list(_windows(source))
+
+    histogram_range = None
+    if params.histogram_bins and params.histogram_min is not None:
+        histogram_range = (params.histogram_min, params.histogram_max)
+    # Без заданных границ гистограмма строится вторым проходом
+    passes = 2 if params.histogram_bins and histogram_range is None else 1
+    histogram = np.zeros(params.histogram_bins, dtype=np.int64)
+
+    accumulator = BandAccumulator()
+    for index, window in enumerate(windows):
+        values, nodata_count = _read_valid(source, mask_band, nodata, window)
+        accumulator.update(values)
+        accumulator.nodata_count += nodata_count
+        if histogram_range is not None:
+            histogram += np.histogram(
+                values, bins=params.histogram_bins, range=histogram_range
+            )[0]
+        tracker.report((index + 1) / (len(windows) * passes))
+
+    if passes == 2 and accumulator.count:
+        histogram_range = (accumulator.min, accumulator.max)
+        for index, window in enumerate(windows):
+            values, _ = _read_valid(source, mask_band, nodata, window)
+            histogram += np.histogram(
+                values, bins=params.histogram_bins, range=histogram_range
+            )[0]
+            tracker.report((len(windows) + index + 1) / (len(windows) * passes))
+
+    stats = {
+        "band": number,
+        "data_type": gdal.GetDataTypeName(band.DataType),
+        # NaN и бесконечности не представимы в JSON/JSONB
+        "nodata": nodata if nodata is None or math.isfinite(nodata) else str(nodata),
+        "approximate": approximate,
+        **accumulator.as_dict(),
+    }
+    if approximate:
+        stats["overview_size"] = [source.XSize, source.YSize]
+    if params.histogram_bins and histogram_range is not None:
+        stats["histogram"] = {
+            "min": histogram_range[0],
+            "max": histogram_range[1],
+            "counts": histogram.tolist(),
+        }
+    return stats
+
+
+def _source_band(band, approximate: bool):
+    """Выбирает канал для чтения: сам канал или его обзорный уровень."""
+    if not approximate:
+        return band, False
+    chosen = band
+    for index in range(band.GetOverviewCount()):
+        overview = band.GetOverview(index)
+        if overview is None:
+            continue
+        if max(overview.XSize, overview.YSize) < _APPROX_MIN_SIZE:
+            continue
+        if overview.XSize * overview.YSize < chosen.XSize * chosen.YSize:
+            chosen = overview
+    return chosen, chosen is not band
+
+
+def _validity(band, nodata_override: float | None):
+    """Определяет, как отличать пиксели без данных: по маске или по значению.
+
+    Returns:
+        tuple: Канал маски (или None) и значение NoData (или None).
+    """
+    if nodata_override is not None:
+        return None, nodata_override
+    flags = band.GetMaskFlags()
+    if flags & gdal.GMF_ALL_VALID:
+        return None, None
+    if flags & gdal.GMF_NODATA:
+        # Сравнение со значением дешевле чтения вычисляемой маски
+        return None, band.GetNoDataValue()
+    return band.GetMaskBand(), None
+
+
+def _windows(band) -> Iterator[tuple[int, int, int, int]]:
+    """Разбивает канал на окна из целых блоков (xoff, yoff, xsize, ysize)."""
+    block_x, block_y = band.GetBlockSize()
+    width, height = band.XSize, band.YSize
+    win_x = min(width, block_x)
+    # Построчные (striped) растры читаются полосами из нескольких блоков
+    win_y = min(height, max(1, _WINDOW_PIXELS // win_x // block_y) * block_y)
+    for yoff in range(0, height, win_y):
+        for xoff in range(0, width, win_x):
+            yield xoff, yoff, min(win_x, width - xoff), min(win_y, height - yoff)
+
+
+def _read_valid(
+    band, mask_band, nodata: float | None, window: tuple[int, int, int, int]
+) -> tuple[np.ndarray, int]:
+    """Читает окно и возвращает значения пикселей с данными и число пропущенных."""
+    data = band.ReadAsArray(*window)
+    if data is None:
+        raise AlgorithmExecutionError(
+            f"Не удалось прочитать окно {window}: {gdal.GetLastErrorMsg()}"
+        )
+    valid = None
+    if mask_band is not None:
+        valid = mask_band.ReadAsArray(*window) > 0
+    elif nodata is not None:
+        valid = ~np.isnan(data) if math.isnan(nodata) else data != nodata
+    if np.issubdtype(data.dtype, np.floating):
+        finite = np.isfinite(data)
+        valid = finite if valid is None else valid & finite
+    if valid is None:
+        return data.ravel(), 0
+    return data[valid], int(valid.size - np.count_nonzero(valid))
@@ -0,0 +1,448 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import override
+
+from osgeo import gdal, osr  # pyright: ignore[reportMissingImports]
+
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    AlgorithmValidationError,
+    BaseAlgorithm,
+    ProgressCallback,
+    scaled_progress,
+)
+from .params import RasterTilesAlgorithmParams
+from .tile_grid import ORIGIN, native_zoom, tile_rows, tile_span
+from .vsimem import VsimemWorkspace
+
+# Доля прогресса, приходящаяся на перепроецирование; остальное - тайлы
+_REPROJECT_SHARE = 0.2
+
+_RESAMPLING = {
+    "near": gdal.GRIORA_NearestNeighbour,
+    "bilinear": gdal.GRIORA_Bilinear,
+    "cubic": gdal.GRIORA_Cubic,
+    "cubicspline": gdal.GRIORA_CubicSpline,
+    "lanczos": gdal.GRIORA_Lanczos,
+    "average": gdal.GRIORA_Average,
+    "mode": gdal.GRIORA_Mode,
+}
+
+# Блочный кэш GDAL каждого процесса отрисовки: процессы не делят кэш, а
+# тайл читает небольшое окно, поэтому кэш по умолчанию (5% RAM) им не нужен
+_CHILD_CACHE_BYTES = 64 * 1024 * 1024
+
+# Как часто проверять отмену и живость пула, пока ряды тайлов не готовы
+_POLL_SEC = 1.0
+
+# Формат тайла: драйвер GDAL, опции создания и значение format в MBTiles
+_TILE_FORMATS = {
+    "png": ("PNG", ["ZLEVEL=6"], "png"),
+    "jpeg": ("JPEG", ["QUALITY=85"], "jpg"),
+}
+
+
+@AlgorithmAbstractFactory.register_algorithm("RASTER_TILES")
+class RasterTilesAlgorithm(BaseAlgorithm[RasterTilesAlgorithmParams]):
+    """Алгоритм построения пирамиды веб-тайлов (XYZ) в архиве MBTiles."""
+
+    # Копия в Web Mercator с обзорными уровнями и архив тайлов рядом со входом
+    memory_factor = 6.0
+
+    @override
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: RasterTilesAlgorithmParams,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Строит пирамиду тайлов растра.
+
+        Растр один раз перепроецируется в EPSG:3857 (с каналом прозрачности
+        и обзорными уровнями), после чего ряды тайлов всех уровней
+        отрисовываются пулом процессов. Каждый тайл читает только своё окно,
+        мелкие уровни - из обзорных уровней. Пустые и полностью
+        прозрачные (NoData) тайлы пропускаются. Не 8-битные каналы линейно
+        масштабируются в 0..255 по приближённым min..max.
+
+        Args:
+            input_file_bytes (bytes): Байтовое представление входного растра
+                (или .zip/.tar.gz-архива с ним).
+            file_ext (str): Расширение входного файла.
+            params (RasterTilesAlgorithmParams): Параметры пирамиды.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
+        Returns:
+            bytes: Байтовое представление архива MBTiles.
+        Raises:
+            AlgorithmValidationError: Если вход не растр.
+            AlgorithmExecutionError: Если GDAL не вернул результат или
+                построение было прервано.
+        """
+        with VsimemWorkspace() as workspace:
+            in_path, _ = workspace.open_input(input_file_bytes, file_ext, "raster")
+            src_ds = gdal.Open(in_path)
+            if src_ds is None or src_ds.RasterCount == 0:
+                raise AlgorithmValidationError(
+                    f"Вход не является растром: {gdal.GetLastErrorMsg()}"
+                )
+            prepared = workspace.path("prepared.vrt")
+            vrt_ds = gdal.Translate(
+                prepared, src_ds, options=_byte_bands_options(src_ds)
+            )
+            if vrt_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Translate завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            vrt_ds = src_ds = None
+
+            merc_path = workspace.path("merc.tif")
+            opts = gdal.WarpOptions(
+                format="GTiff",
+                dstSRS="EPSG:3857",
+                dstAlpha=True,
+                resampleAlg=params.resampling,
+                creationOptions=["TILED=YES", "BIGTIFF=IF_SAFER"],
+                multithread=True,
+                callback=scaled_progress(progress, 0.0, _REPROJECT_SHARE),
+            )
+            merc_ds = gdal.Warp(merc_path, prepared, options=opts)
+            if merc_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Warp завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Мелкие уровни читают обзорные уровни, а не все пиксели растра
+            factors = _overview_factors(merc_ds, params.tile_size)
+            if factors:
+                merc_ds.BuildOverviews("AVERAGE", factors)
+            bounds = _bounds(merc_ds)
+            base_zoom = native_zoom(merc_ds.GetGeoTransform()[1], params.tile_size)
+            # Закрываем датасет до fork: дочерние процессы откроют его сами
+            merc_ds = None
+
+            max_zoom = params.max_zoom if params.max_zoom is not None else base_zoom
+            min_zoom = min(params.min_zoom, max_zoom)
+            jobs = [
+                (zoom, y, x0, x1)
+                for zoom in range(min_zoom, max_zoom + 1)
+                for y, x0, x1 in tile_rows(bounds, zoom)
+            ]
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                mbtiles_path = os.path.join(tmp_dir, "tiles.mbtiles")
+                written, skipped = _render_mbtiles(
+                    merc_path,
+                    jobs,
+                    mbtiles_path,
+                    params,
+                    _metadata(bounds, min_zoom, max_zoom, params),
+                    progress,
+                )
+                with open(mbtiles_path, "rb") as f:
+                    data = f.read()
+
+        self.result = {
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "tiles": written,
+            "tiles_skipped": skipped,
+        }
+        return data
+
+    @override
+    def estimate_peak_memory(
+        self, input_size: int, params: RasterTilesAlgorithmParams
+    ) -> int:
+        # Каждый процесс отрисовки держит собственный блочный кэш GDAL
+        return (
+            super().estimate_peak_memory(input_size, params)
+            + params.processes * _CHILD_CACHE_BYTES
+        )
+
+    @override
+    def output_extension(
+        self, file_ext: str, params: RasterTilesAlgorithmParams
+    ) -> str:
+        return "mbtiles"
+
+    @override
+    @classmethod
+    def get_pydantic_model(cls) -> type[RasterTilesAlgorithmParams]:
+        """Возвращает Pydantic-модель для валидации параметров алгоритма.
+
+        Returns:
+            BaseModel: Pydantic-модель параметров алгоритма.
+        """
+        return RasterTilesAlgorithmParams
+
+
+def _byte_bands_options(ds):
+    """Опции VRT с 1 или 3 цветными 8-битными каналами (и альфой, если есть).
+
+    Палитра разворачивается в RGBA. Не 8-битные каналы масштабируются в
+    0..255, а NoData переносится в маску VRT: после масштабирования значение
+    NoData в байт не помещается.
+    """
+    if ds.GetRasterBand(1).GetColorTable() is not None:
+        return gdal.TranslateOptions(format="VRT", rgbExpand="rgba")
+
+    numbers = range(1, ds.RasterCount + 1)
+    alpha = [
+        n
+        for n in numbers
+        if ds.GetRasterBand(n).GetColorInterpretation() == gdal.GCI_AlphaBand
+    ]
+    color = [n for n in numbers if n not in alpha]
+    color = color[:3] if len(color) >= 3 else color[:1]
+    if all(ds.GetRasterBand(n).DataType == gdal.GDT_Byte for n in color):
+        return gdal.TranslateOptions(format="VRT", bandList=color + alpha[:1])
+
+    scale_params = []
+    for n in color:
+        low, high = ds.GetRasterBand(n).ComputeRasterMinMax(True)
+        scale_params.append([low, high if high > low else low + 1, 0, 255])
+    has_nodata = any(ds.GetRasterBand(n).GetNoDataValue() is not None for n in color)
+    return gdal.TranslateOptions(
+        format="VRT",
+        bandList=color + alpha[:1],
+        outputType=gdal.GDT_Byte,
+        scaleParams=scale_params,
+        maskBand="auto" if has_nodata and not alpha else None,
+    )
+
+
+def _overview_factors(ds, tile_size: int) -> list[int]:
+    factors = []
+    factor = 2
+    while max(ds.RasterXSize, ds.RasterYSize) / factor >= tile_size:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def _bounds(ds) -> tuple[float, float, float, float]:
+    """Границы растра в EPSG:3857, обрезанные по сетке тайлов."""
+    gt = ds.GetGeoTransform()
+    minx = max(gt[0], -ORIGIN)
+    maxx = min(gt[0] + ds.RasterXSize * gt[1], ORIGIN)
+    maxy = min(gt[3], ORIGIN)
+    miny = max(gt[3] + ds.RasterYSize * gt[5], -ORIGIN)
+    return minx, miny, maxx, maxy
+
+
+def _metadata(
+    bounds: tuple[float, float, float, float],
+    min_zoom: int,
+    max_zoom: int,
+    params: RasterTilesAlgorithmParams,
+) -> dict[str, str]:
+    src = osr.SpatialReference()
+    src.ImportFromEPSG(3857)
+    dst = osr.SpatialReference()
+    dst.ImportFromEPSG(4326)
+    dst.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    transform = osr.CoordinateTransformation(src, dst)
+    west, south, _ = transform.TransformPoint(bounds[0], bounds[1])
+    east, north, _ = transform.TransformPoint(bounds[2], bounds[3])
+    return {
+        "name": "tiles",
+        "type": "overlay",
+        "version": "1.1",
+        "format": _TILE_FORMATS[params.tile_format][2],
+        "minzoom": str(min_zoom),
+        "maxzoom": str(max_zoom),
+        "bounds": f"{west:.6f},{south:.6f},{east:.6f},{north:.6f}",
+    }
+
+
+def _render_mbtiles(
+    merc_path: str,
+    jobs: list[tuple[int, int, int, int]],
+    mbtiles_path: str,
+    params: RasterTilesAlgorithmParams,
+    metadata: dict[str, str],
+    progress: ProgressCallback | None,
+) -> tuple[int, int]:
+    """Отрисовывает ряды тайлов пулом процессов и пишет их в MBTiles.
+
+    Пул создаётся через fork: дочерние процессы наследуют файл в /vsimem
+    без копирования и сериализации. В базу пишет только родитель. Пока ряды
+    не готовы, родитель раз в `_POLL_SEC` проверяет отмену; гибель дочернего
+    процесса (OOM, segfault) завершает построение ошибкой, а не зависанием.
+
+    Returns:
+        tuple[int, int]: Число записанных и пропущенных пустых тайлов.
+    """
+    conn = sqlite3.connect(mbtiles_path)
+    written = skipped = 0
+    try:
+        # Файл временный: журнал и синхронизация с диском не нужны
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+        conn.execute(
+            "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, "
+            "tile_row INTEGER, tile_data BLOB)"
+        )
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, min(params.processes, len(jobs))),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_tile_process,
+            initargs=(
+                merc_path,
+                params.tile_size,
+                params.tile_format,
+                params.resampling,
+            ),
+        )
+        try:
+            pending = {pool.submit(_render_row, job) for job in jobs}
+            done = 0
+            while pending:
+                finished, pending = wait(
+                    pending, timeout=_POLL_SEC, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    try:
+                        tiles, row_skipped = future.result()
+                    except BrokenProcessPool as e:
+                        raise AlgorithmExecutionError(
+                            f"Процесс отрисовки тайлов аварийно завершился: {e}"
+                        )
+                    # MBTiles нумерует ряды снизу (TMS), XYZ - сверху
+                    conn.executemany(
+                        "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                        [(z, x, (1 << z) - 1 - y, data) for z, x, y, data in tiles],
+                    )
+                    written += len(tiles)
+                    skipped += row_skipped
+                    done += 1
+                complete = _REPROJECT_SHARE + (1 - _REPROJECT_SHARE) * done / len(jobs)
+                if progress is not None and not progress(complete, None, None):
+                    raise AlgorithmExecutionError("Построение тайлов прервано")
+        finally:
+            # При ошибке или отмене ещё не начатые ряды не отрисовываются
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        conn.execute(
+            "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)"
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return written, skipped
+
+
+# Состояние процесса пула: открытый датасет и параметры отрисовки
+_tile_state: dict = {}
+
+
+def _init_tile_process(
+    merc_path: str, tile_size: int, tile_format: str, resampling: str
+) -> None:
+    driver_name, options, _ = _TILE_FORMATS[tile_format]
+    gdal.SetCacheMax(_CHILD_CACHE_BYTES)
+    _tile_state.update(
+        ds=gdal.Open(merc_path),
+        tile_size=tile_size,
+        driver=gdal.GetDriverByName(driver_name),
+        options=options,
+        with_alpha=tile_format == "png",
+        resample_alg=_RESAMPLING[resampling],
+    )
+
+
+def _render_row(
+    job: tuple[int, int, int, int],
+) -> tuple[list[tuple[int, int, int, bytes]], int]:
+    """Отрисовывает ряд тайлов; возвращает непустые тайлы и число пропущенных."""
+    zoom, y, x0, x1 = job
+    tiles = []
+    skipped = 0
+    for x in range(x0, x1 + 1):
+        data = _render_tile(zoom, x, y)
+        if data is None:
+            skipped += 1
+        else:
+            tiles.append((zoom, x, y, data))
+    return tiles, skipped
+
+
+def _render_tile(zoom: int, x: int, y: int) -> bytes | None:
+    ds = _tile_state["ds"]
+    tile_size = _tile_state["tile_size"]
+    resample_alg = _tile_state["resample_alg"]
+    gt = ds.GetGeoTransform()
+    span = tile_span(zoom)
+    minx = -ORIGIN + x * span
+    maxy = ORIGIN - y * span
+
+    # Окно тайла в пикселях растра (дробное) и его пересечение с растром
+    px0 = (minx - gt[0]) / gt[1]
+    px1 = (minx + span - gt[0]) / gt[1]
+    py0 = (maxy - gt[3]) / gt[5]
+    py1 = (maxy - span - gt[3]) / gt[5]
+    rx0, rx1 = max(px0, 0.0), min(px1, float(ds.RasterXSize))
+    ry0, ry1 = max(py0, 0.0), min(py1, float(ds.RasterYSize))
+    if rx1 <= rx0 or ry1 <= ry0:
+        return None
+
+    # Та же область в пикселях тайла
+    bx0 = round((rx0 - px0) * tile_size / (px1 - px0))
+    bx1 = round((rx1 - px0) * tile_size / (px1 - px0))
+    by0 = round((ry0 - py0) * tile_size / (py1 - py0))
+    by1 = round((ry1 - py0) * tile_size / (py1 - py0))
+    width, height = bx1 - bx0, by1 - by0
+    if width <= 0 or height <= 0:
+        return None
+
+    window = {
+        "xoff": rx0,
+        "yoff": ry0,
+        "xsize": rx1 - rx0,
+        "ysize": ry1 - ry0,
+        "buf_xsize": width,
+        "buf_ysize": height,
+        "resample_alg": resample_alg,
+    }
+    alpha_number = ds.RasterCount
+    alpha = ds.GetRasterBand(alpha_number).ReadRaster(**window)
+    if alpha.count(0) == len(alpha):
+        return None
+    color_bands = list(range(1, alpha_number))
+    color = ds.ReadRaster(band_list=color_bands, **window)
+
+    band_count = len(color_bands) + (1 if _tile_state["with_alpha"] else 0)
+    tile = gdal.GetDriverByName("MEM").Create(
+        "", tile_size, tile_size, band_count, gdal.GDT_Byte
+    )
+    tile.WriteRaster(bx0, by0, width, height, color, band_list=color_bands)
+    if _tile_state["with_alpha"]:
+        tile.GetRasterBand(band_count).WriteRaster(bx0, by0, width, height, alpha)
+    return _encode(tile)
+
+
+def _encode(tile) -> bytes:
+    path = f"/vsimem/tile_{os.getpid()}"
+    out = _tile_state["driver"].CreateCopy(path, tile, options=_tile_state["options"])
+    if out is None:
+        raise AlgorithmExecutionError(
+            f"Не удалось закодировать тайл: {gdal.GetLastErrorMsg()}"
+        )
+    out = None
+    f = gdal.VSIFOpenL(path, "rb")
+    try:
+        gdal.VSIFSeekL(f, 0, 2)
+        size = gdal.VSIFTellL(f)
+        gdal.VSIFSeekL(f, 0, 0)
+        return gdal.VSIFReadL(1, size, f)
+    finally:
+        gdal.VSIFCloseL(f)
+        gdal.Unlink(path)
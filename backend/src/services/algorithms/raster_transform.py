@@ -1,23 +1,16 @@
 from typing import override
 
 from osgeo import gdal  # pyright: ignore[reportMissingImports]
-from pydantic import Field
 
-from src.models.schemas import AlgorithmParamsBaseModel
-
-from . import AlgorithmAbstractFactory, BaseAlgorithm
-
-
-class RasterTransformAlgorithmParams(AlgorithmParamsBaseModel):
-    """Pydantic-модель для параметров алгоритма трансформации растровых данных."""
-
-    srs_def: str = Field(
-        ..., description="Целевая система координат (например, 'EPSG:4326')"
-    )
-    s_srs: str | None = Field(
-        default=None,
-        description="Исходная система координат (необязательно, по умолчанию определяется автоматически)",
-    )
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    BaseAlgorithm,
+    ProgressCallback,
+    is_archive_extension,
+)
+from .params import RasterTransformAlgorithmParams
+from .vsimem import VsimemWorkspace
 
 
 @AlgorithmAbstractFactory.register_algorithm("RASTER_TRANSFORM")
@@ -30,11 +23,16 @@ class RasterTransformAlgorithm(BaseAlgorithm[RasterTransformAlgorithmParams]):
         input_file_bytes: bytes,
         file_ext: str,
         params: RasterTransformAlgorithmParams,
+        progress: ProgressCallback | None = None,
     ) -> bytes:
         """Трансформирует растровые данные.
 
         Args:
-            input_file_bytes (bytes): Байтовое представление входного файла.
+            input_file_bytes (bytes): Байтовое представление входного файла
+                (или .zip/.tar.gz-архива с набором данных).
+            file_ext (str): Расширение входного файла.
+            params (RasterTransformAlgorithmParams): Целевая СК и параметры Warp.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
         Returns:
             bytes: Байтовое представление выходного файла.
         """
@@ -42,32 +40,29 @@ class RasterTransformAlgorithm(BaseAlgorithm[RasterTransformAlgorithmParams]):
         s_srs = params.s_srs
         srs_def = params.srs_def
 
-        gdal.FileFromMemBuffer(f"/vsimem/in.{file_ext}", input_file_bytes)
-
-        opts = gdal.WarpOptions(dstSRS=srs_def, srcSRS=s_srs)
-
-        out_ds = gdal.Warp(
-            f"/vsimem/out.{file_ext}", f"/vsimem/in.{file_ext}", options=opts
+        opts = gdal.WarpOptions(
+            dstSRS=srs_def,
+            srcSRS=s_srs,
+            xRes=params.xres,
+            yRes=params.yres,
+            callback=progress,
+            **params.warp_kwargs(),
         )
 
-        f = gdal.VSIFOpenL(f"/vsimem/out.{file_ext}", "rb")
-        gdal.VSIFSeekL(f, 0, 2)
-        size = gdal.VSIFTellL(f)
-        gdal.VSIFSeekL(f, 0, 0)
-        result_bytes = gdal.VSIFReadL(1, size, f)
-        gdal.VSIFCloseL(f)
-
-        in_ds: gdal.Dataset = gdal.Open(f"/vsimem/in.{file_ext}")
-
-        # cleanup
-        gdal.Unlink(f"/vsimem/in.{file_ext}")
-        gdal.Unlink(f"/vsimem/out.{file_ext}")
-        if out_ds is not None:
+        with VsimemWorkspace() as workspace:
+            in_path, dataset_ext = workspace.open_input(
+                input_file_bytes, file_ext, "raster"
+            )
+            out_ds = gdal.Warp(
+                workspace.output_path(dataset_ext), in_path, options=opts
+            )
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Warp завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
             out_ds = None  # type: ignore[assignment]
-        if in_ds is not None:
-            in_ds = None  # type: ignore[assignment]
-
-        return result_bytes
+            return workspace.read_output(as_archive=is_archive_extension(file_ext))
 
     @override
     @classmethod
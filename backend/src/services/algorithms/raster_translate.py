@@ -0,0 +1,149 @@
+from typing import override
+
+from osgeo import gdal  # pyright: ignore[reportMissingImports]
+
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    AlgorithmValidationError,
+    BaseAlgorithm,
+    ProgressCallback,
+    is_archive_extension,
+)
+from .params import TRANSLATE_DRIVER_EXTENSIONS, RasterTranslateAlgorithmParams
+from .vsimem import VsimemWorkspace
+
+
+@AlgorithmAbstractFactory.register_algorithm("RASTER_TRANSLATE")
+class RasterTranslateAlgorithm(BaseAlgorithm[RasterTranslateAlgorithmParams]):
+    """Алгоритм выборки каналов, смены типа данных и формата растра."""
+
+    # Результат обычно меньше входа: часть каналов и более узкий тип
+    memory_factor = 3.0
+
+    @override
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: RasterTranslateAlgorithmParams,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Сохраняет выбранные каналы растра в заданном типе и формате.
+
+        Выполняется одним проходом gdal.Translate без перепроецирования:
+        читаются только выбранные каналы. Если задан nodata, вход читается
+        через VRT, в котором пиксели со значением NoData входа заменены на
+        новое значение, - иначе они стали бы обычными данными.
+
+        Args:
+            input_file_bytes (bytes): Байтовое представление входного растра
+                (или .zip/.tar.gz-архива с ним).
+            file_ext (str): Расширение входного файла.
+            params (RasterTranslateAlgorithmParams): Каналы, тип, масштаб,
+                NoData, драйвер и опции создания.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
+        Returns:
+            bytes: Байтовое представление выходного файла.
+        Raises:
+            AlgorithmValidationError: Если вход не растр.
+            AlgorithmExecutionError: Если GDAL не вернул результат.
+        """
+        if params.scale == "auto":
+            scale_params = [[]]
+        elif params.scale is not None:
+            scale_params = [list(params.scale)]
+        else:
+            scale_params = None
+
+        opts = gdal.TranslateOptions(
+            format=params.driver,
+            bandList=params.bands,
+            outputType=(
+                gdal.GetDataTypeByName(params.output_type)
+                if params.output_type
+                else gdal.GDT_Unknown
+            ),
+            scaleParams=scale_params,
+            noData=params.nodata,
+            creationOptions=[
+                f"{key}={value}"
+                for key, value in (params.creation_options or {}).items()
+            ],
+            callback=progress,
+        )
+
+        with VsimemWorkspace() as workspace:
+            in_path, dataset_ext = workspace.open_input(
+                input_file_bytes, file_ext, "raster"
+            )
+            out_ext = (
+                TRANSLATE_DRIVER_EXTENSIONS[params.driver]
+                if params.driver
+                else dataset_ext
+            )
+            src_path = (
+                _remap_nodata(workspace, in_path, params.nodata)
+                if params.nodata is not None
+                else in_path
+            )
+            out_ds = gdal.Translate(
+                workspace.output_path(out_ext), src_path, options=opts
+            )
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL Translate завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
+            out_ds = None  # type: ignore[assignment]
+            return workspace.read_output(as_archive=is_archive_extension(file_ext))
+
+    @override
+    def output_extension(
+        self, file_ext: str, params: RasterTranslateAlgorithmParams
+    ) -> str:
+        if params.driver is None or is_archive_extension(file_ext):
+            return super().output_extension(file_ext, params)
+        return TRANSLATE_DRIVER_EXTENSIONS[params.driver]
+
+    @override
+    @classmethod
+    def get_pydantic_model(cls) -> type[RasterTranslateAlgorithmParams]:
+        """Возвращает Pydantic-модель для валидации параметров алгоритма.
+
+        Returns:
+            BaseModel: Pydantic-модель параметров алгоритма.
+        """
+        return RasterTranslateAlgorithmParams
+
+
+def _remap_nodata(workspace: VsimemWorkspace, in_path: str, nodata: float) -> str:
+    """Возвращает путь к VRT, в котором NoData входа заменено на `nodata`.
+
+    Источники VRT получают NoData входа (ComplexSource NODATA): такие пиксели
+    не читаются, и на их месте остаётся значение NoData канала VRT. Если у
+    входа NoData нет, возвращается исходный путь.
+    """
+    ds = gdal.Open(in_path)
+    if ds is None or ds.RasterCount == 0:
+        raise AlgorithmValidationError(
+            f"Вход не является растром: {gdal.GetLastErrorMsg()}"
+        )
+    values = [
+        ds.GetRasterBand(n).GetNoDataValue() for n in range(1, ds.RasterCount + 1)
+    ]
+    ds = None
+    if all(value is None for value in values):
+        return in_path
+
+    vrt_path = workspace.path("remapped.vrt")
+    # NaN не совпадает ни с одним значением: каналы без NoData не меняются
+    src_nodata = " ".join("nan" if value is None else repr(value) for value in values)
+    opts = gdal.BuildVRTOptions(srcNodata=src_nodata, VRTNodata=nodata)
+    vrt_ds = gdal.BuildVRT(vrt_path, [in_path], options=opts)
+    if vrt_ds is None:
+        raise AlgorithmExecutionError(
+            f"GDAL BuildVRT завершился без результата: {gdal.GetLastErrorMsg()}"
+        )
+    vrt_ds = None
+    return vrt_path
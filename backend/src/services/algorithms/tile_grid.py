@@ -0,0 +1,33 @@
+import math
+
+# Половина длины экватора в EPSG:3857: сетка тайлов занимает квадрат
+# [-ORIGIN, ORIGIN] по обеим осям.
+ORIGIN = 20037508.342789244
+
+# Самый детальный уровень, который строит RASTER_TILES
+MAX_ZOOM = 24
+
+
+def native_zoom(resolution: float, tile_size: int) -> int:
+    """Уровень, разрешение которого не грубее разрешения растра."""
+    zoom = math.ceil(math.log2(2 * ORIGIN / (tile_size * resolution)))
+    return min(max(zoom, 0), MAX_ZOOM)
+
+
+def tile_span(zoom: int) -> float:
+    """Сторона тайла уровня в метрах EPSG:3857."""
+    return 2 * ORIGIN / (1 << zoom)
+
+
+def tile_rows(
+    bounds: tuple[float, float, float, float], zoom: int
+) -> list[tuple[int, int, int]]:
+    """Ряды тайлов уровня, покрывающие границы: (y, первый x, последний x)."""
+    minx, miny, maxx, maxy = bounds
+    last = (1 << zoom) - 1
+    span = tile_span(zoom)
+    x0 = max(0, math.floor((minx + ORIGIN) / span))
+    x1 = min(last, math.ceil((maxx + ORIGIN) / span) - 1)
+    y0 = max(0, math.floor((ORIGIN - maxy) / span))
+    y1 = min(last, math.ceil((ORIGIN - miny) / span) - 1)
+    return [(y, x0, x1) for y in range(y0, y1 + 1)]
@@ -0,0 +1,239 @@
+from typing import override
+
+from osgeo import gdal  # pyright: ignore[reportMissingImports]
+
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    BaseAlgorithm,
+    ProgressCallback,
+    is_archive_extension,
+    scaled_progress,
+)
+from .params import VectorSimplifyAlgorithmParams
+from .vsimem import VsimemWorkspace
+
+# Доля прогресса на упрощение; остальное - подсчёт вершин входа и результата
+_SIMPLIFY_SHARE = 0.9
+
+# Как часто построчный подсчёт вершин сообщает прогресс и проверяет отмену
+_COUNT_REPORT_EVERY = 10000
+
+
+@AlgorithmAbstractFactory.register_algorithm("VECTOR_SIMPLIFY")
+class VectorSimplifyAlgorithm(BaseAlgorithm[VectorSimplifyAlgorithmParams]):
+    """Алгоритм упрощения и генерализации векторных данных для веб-карт."""
+
+    # Объекты читаются и пишутся потоково, результат меньше входа; при
+    # перепроецировании добавляется промежуточная копия в GeoPackage
+    memory_factor = 4.0
+
+    @override
+    def run(
+        self,
+        input_file_bytes: bytes,
+        file_ext: str,
+        params: VectorSimplifyAlgorithmParams,
+        progress: ProgressCallback | None = None,
+    ) -> bytes:
+        """Упрощает геометрии, округляет координаты и при необходимости перепроецирует.
+
+        Всё выполняется потоковыми проходами VectorTranslate. ogr2ogr
+        упрощает геометрии до перепроецирования, поэтому при заданной srs_def
+        данные сначала перепроецируются в промежуточный GeoPackage, а
+        упрощение и округление идут вторым проходом - допуск и xy_res
+        задаются в единицах целевой СК. Объекты пишутся транзакциями по
+        `batch_size`, поэтому память не растёт с числом объектов слоя.
+        Упрощение сохраняет топологию каждой геометрии (кольца не
+        самопересекаются и не исчезают), но общие границы соседних объектов
+        упрощаются независимо.
+
+        Число вершин до и после сохраняется в `result`. Оно считается одним
+        SQL-агрегатом ST_NPoints на слой (диалект SQLite); если SpatiaLite
+        недоступен, - построчным проходом без чтения атрибутов с проверкой
+        отмены.
+
+        Args:
+            input_file_bytes (bytes): Байтовое представление входного файла
+                (или .zip/.tar.gz-архива с набором данных).
+            file_ext (str): Расширение входного файла.
+            params (VectorSimplifyAlgorithmParams): Параметры упрощения.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
+        Returns:
+            bytes: Байтовое представление выходного файла.
+        Raises:
+            AlgorithmExecutionError: Если GDAL не вернул результат.
+        """
+        with VsimemWorkspace() as workspace:
+            in_path, dataset_ext = workspace.open_input(
+                input_file_bytes, file_ext, "vector"
+            )
+            src_path, layers = in_path, params.layers
+            simplify_progress = scaled_progress(progress, 0.0, _SIMPLIFY_SHARE)
+            if params.srs_def is not None:
+                src_path = workspace.path("reprojected.gpkg")
+                reproject_opts = gdal.VectorTranslateOptions(
+                    format="GPKG",
+                    srcSRS=params.s_srs,
+                    dstSRS=params.srs_def,
+                    layers=params.layers,
+                    transactionSize=params.batch_size,
+                    callback=scaled_progress(progress, 0.0, _SIMPLIFY_SHARE / 2),
+                )
+                reprojected = gdal.VectorTranslate(
+                    src_path, in_path, options=reproject_opts
+                )
+                if reprojected is None:
+                    raise AlgorithmExecutionError(
+                        f"GDAL VectorTranslate завершился без результата: {gdal.GetLastErrorMsg()}"
+                    )
+                reprojected = None  # type: ignore[assignment]
+                layers = None
+                simplify_progress = scaled_progress(
+                    progress, _SIMPLIFY_SHARE / 2, _SIMPLIFY_SHARE
+                )
+
+            opts = gdal.VectorTranslateOptions(
+                srcSRS=params.s_srs if params.srs_def is None else None,
+                layers=layers,
+                simplifyTolerance=params.tolerance,
+                xyRes=params.xy_res,
+                transactionSize=params.batch_size,
+                callback=simplify_progress,
+            )
+            out_path = workspace.output_path(dataset_ext)
+            out_ds = gdal.VectorTranslate(out_path, src_path, options=opts)
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL VectorTranslate завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
+            out_ds = None  # type: ignore[assignment]
+            if src_path != in_path:
+                gdal.Unlink(src_path)
+
+            count_share = (1 - _SIMPLIFY_SHARE) / 2
+            features, vertices_in = _count_vertices(
+                in_path,
+                params.layers,
+                scaled_progress(progress, _SIMPLIFY_SHARE, 1 - count_share),
+            )
+            _, vertices_out = _count_vertices(
+                out_path, progress=scaled_progress(progress, 1 - count_share, 1.0)
+            )
+            self.result = {
+                "features": features,
+                "vertices_in": vertices_in,
+                "vertices_out": vertices_out,
+                "vertex_reduction": (
+                    round(1 - vertices_out / vertices_in, 4) if vertices_in else None
+                ),
+            }
+            return workspace.read_output(as_archive=is_archive_extension(file_ext))
+
+    @override
+    @classmethod
+    def get_pydantic_model(cls) -> type[VectorSimplifyAlgorithmParams]:
+        """Возвращает Pydantic-модель для валидации параметров алгоритма.
+
+        Returns:
+            BaseModel: Pydantic-модель параметров алгоритма.
+        """
+        return VectorSimplifyAlgorithmParams
+
+
+def _count_vertices(
+    path: str,
+    layers: list[str] | None = None,
+    progress: ProgressCallback | None = None,
+) -> tuple[int, int]:
+    """Считает объекты и вершины геометрий набора данных, не читая атрибуты.
+
+    Returns:
+        tuple[int, int]: Число объектов и суммарное число вершин.
+    Raises:
+        AlgorithmExecutionError: Если набор данных не открылся или подсчёт
+            отменён.
+    """
+    ds = gdal.OpenEx(path, gdal.OF_VECTOR)
+    if ds is None:
+        raise AlgorithmExecutionError(
+            f"Не удалось открыть {path}: {gdal.GetLastErrorMsg()}"
+        )
+    selected = [
+        ds.GetLayer(index)
+        for index in range(ds.GetLayerCount())
+        if not layers or ds.GetLayer(index).GetName() in layers
+    ]
+    features = vertices = 0
+    for index, layer in enumerate(selected):
+        layer_progress = scaled_progress(
+            progress, index / len(selected), (index + 1) / len(selected)
+        )
+        counts = _sql_vertex_count(ds, layer)
+        if counts is None:
+            counts = _scan_vertex_count(layer, layer_progress)
+        features += counts[0]
+        vertices += counts[1]
+        _report(layer_progress, 1.0)
+    return features, vertices
+
+
+def _sql_vertex_count(ds, layer) -> tuple[int, int] | None:
+    """Считает объекты и вершины слоя одним запросом; None, если нет SpatiaLite."""
+    # В диалекте SQLite безымянная геометрия источника называется GEOMETRY
+    geometry = _quote(layer.GetGeometryColumn() or "GEOMETRY")
+    sql = (
+        f"SELECT COUNT(*), SUM(ST_NPoints({geometry})) "
+        f"FROM {_quote(layer.GetName())}"
+    )
+    gdal.PushErrorHandler("CPLQuietErrorHandler")
+    try:
+        result = ds.ExecuteSQL(sql, dialect="SQLite")
+    finally:
+        gdal.PopErrorHandler()
+        gdal.ErrorReset()
+    if result is None:
+        return None
+    try:
+        row = result.GetNextFeature()
+        if row is None:
+            return None
+        return row.GetFieldAsInteger64(0), row.GetFieldAsInteger64(1)
+    finally:
+        ds.ReleaseResultSet(result)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _scan_vertex_count(layer, progress: ProgressCallback | None) -> tuple[int, int]:
+    """Считает объекты и вершины слоя построчно, проверяя отмену."""
+    defn = layer.GetLayerDefn()
+    layer.SetIgnoredFields(
+        [defn.GetFieldDefn(i).GetName() for i in range(defn.GetFieldCount())]
+        + ["OGR_STYLE"]
+    )
+    total = layer.GetFeatureCount(force=False)
+    features = vertices = 0
+    for feature in layer:
+        features += 1
+        vertices += _vertex_count(feature.GetGeometryRef())
+        if features % _COUNT_REPORT_EVERY == 0:
+            _report(progress, features / total if total > 0 else 0.0)
+    return features, vertices
+
+
+def _report(progress: ProgressCallback | None, complete: float) -> None:
+    if progress is not None and not progress(min(complete, 1.0), None, None):
+        raise AlgorithmExecutionError("Подсчёт вершин прерван")
+
+
+def _vertex_count(geometry) -> int:
+    if geometry is None:
+        return 0
+    parts = geometry.GetGeometryCount()
+    if parts:
+        return sum(_vertex_count(geometry.GetGeometryRef(i)) for i in range(parts))
+    return geometry.GetPointCount()
@@ -1,29 +1,25 @@
 from typing import override
 
 from osgeo import gdal  # pyright: ignore[reportMissingImports]
-from pydantic import Field
 
-from src.models.schemas import AlgorithmParamsBaseModel
-
-from . import AlgorithmAbstractFactory, BaseAlgorithm
-
-
-class VectorTransformAlgorithmParams(AlgorithmParamsBaseModel):
-    """Pydantic-модель для параметров алгоритма трансформации векторных данных."""
-
-    srs_def: str = Field(
-        ..., description="Целевая система координат (например, 'EPSG:4326')"
-    )
-    s_srs: str | None = Field(
-        default=None,
-        description="Исходная система координат (необязательно, по умолчанию определяется автоматически)",
-    )
+from . import (
+    AlgorithmAbstractFactory,
+    AlgorithmExecutionError,
+    BaseAlgorithm,
+    ProgressCallback,
+    is_archive_extension,
+)
+from .params import VectorTransformAlgorithmParams
+from .vsimem import VsimemWorkspace
 
 
 @AlgorithmAbstractFactory.register_algorithm("VECTOR_TRANSFORM")
 class VectorTransformAlgorithm(BaseAlgorithm[VectorTransformAlgorithmParams]):
     """Алгоритм для трансформации векторных данных."""
 
+    # Объекты OGR в памяти заметно крупнее своего представления в файле
+    memory_factor = 6.0
+
     def print_metadata(self, dataset: gdal.Dataset):
         """Выводит базовую метадату векторного изображения."""
         print("Basic metadata")
@@ -42,11 +38,17 @@ class VectorTransformAlgorithm(BaseAlgorithm[VectorTransformAlgorithmParams]):
         input_file_bytes: bytes,
         file_ext: str,
         params: VectorTransformAlgorithmParams,
+        progress: ProgressCallback | None = None,
     ) -> bytes:
         """Трансформирует растровые данные.
 
         Args:
-            input_file_bytes (bytes): Байтовое представление входного файла.
+            input_file_bytes (bytes): Байтовое представление входного файла
+                (или .zip/.tar.gz-архива с набором данных).
+            file_ext (str): Расширение входного файла.
+            params (VectorTransformAlgorithmParams): Параметры трансформации и
+                фильтры bbox, where, layers, select_fields.
+            progress (ProgressCallback | None): Callback прогресса и отмены GDAL.
         Returns:
             bytes: Байтовое представление выходного файла.
         """
@@ -54,32 +56,34 @@ class VectorTransformAlgorithm(BaseAlgorithm[VectorTransformAlgorithmParams]):
         s_srs = params.s_srs
         srs_def = params.srs_def
 
-        gdal.FileFromMemBuffer(f"/vsimem/in.{file_ext}", input_file_bytes)
-
-        opts = gdal.VectorTranslateOptions(dstSRS=srs_def, srcSRS=s_srs)
-
-        out_ds = gdal.VectorTranslate(
-            f"/vsimem/out.{file_ext}", f"/vsimem/in.{file_ext}", options=opts
+        # Фильтры передаются драйверу: форматы с пространственным индексом
+        # (GPKG, FlatGeobuf, shp с .qix) не читают объекты вне bbox вовсе,
+        # а SQL-форматы выполняют where на своей стороне.
+        opts = gdal.VectorTranslateOptions(
+            dstSRS=srs_def,
+            srcSRS=s_srs,
+            spatFilter=list(params.bbox) if params.bbox else None,
+            spatSRS=params.bbox_srs if params.bbox else None,
+            where=params.where,
+            layers=params.layers,
+            selectFields=params.select_fields,
+            callback=progress,
         )
 
-        f = gdal.VSIFOpenL(f"/vsimem/out.{file_ext}", "rb")
-        gdal.VSIFSeekL(f, 0, 2)
-        size = gdal.VSIFTellL(f)
-        gdal.VSIFSeekL(f, 0, 0)
-        result_bytes = gdal.VSIFReadL(1, size, f)
-        gdal.VSIFCloseL(f)
-
-        in_ds = gdal.OpenEx(f"/vsimem/in.{file_ext}", gdal.OF_VECTOR)
-
-        # cleanup
-        gdal.Unlink(f"/vsimem/in.{file_ext}")
-        gdal.Unlink(f"/vsimem/out.{file_ext}")
-        if out_ds is not None:
+        with VsimemWorkspace() as workspace:
+            in_path, dataset_ext = workspace.open_input(
+                input_file_bytes, file_ext, "vector"
+            )
+            out_ds = gdal.VectorTranslate(
+                workspace.output_path(dataset_ext), in_path, options=opts
+            )
+            if out_ds is None:
+                raise AlgorithmExecutionError(
+                    f"GDAL VectorTranslate завершился без результата: {gdal.GetLastErrorMsg()}"
+                )
+            # Закрываем датасет, чтобы драйвер сбросил данные в файл до чтения
             out_ds = None  # type: ignore[assignment]
-        if in_ds is not None:
-            in_ds = None  # type: ignore[assignment]
-
-        return result_bytes
+            return workspace.read_output(as_archive=is_archive_extension(file_ext))
 
     @override
     @classmethod
@@ -0,0 +1,246 @@
+import posixpath
+import uuid
+from typing import Literal
+
+from osgeo import gdal  # pyright: ignore[reportMissingImports]
+
+from . import AlgorithmValidationError, is_archive_extension
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Вид данных, который алгоритм читает из входа
+DataKind = Literal["raster", "vector"]
+
+# Расширения основного файла набора данных внутри архива в порядке
+# предпочтения; сопутствующие файлы (.shx, .dbf, .prj, .aux.xml, .tfw) в
+# список не входят и открываются драйвером сами. Порядок только задаёт
+# очерёдность проверки: файл выбирается, если GDAL открывает его как данные
+# нужного вида, поэтому metadata.json рядом с GeoTIFF растром не считается.
+_DATASET_EXTENSIONS = (
+    "shp",
+    "gpkg",
+    "geojson",
+    "json",
+    "fgb",
+    "gml",
+    "kml",
+    "tab",
+    "mif",
+    "tif",
+    "tiff",
+    "jp2",
+    "img",
+    "vrt",
+    "csv",
+)
+
+# Пиковый объём /vsimem, зафиксированный рабочими каталогами с момента
+# последнего сброса. Воркер выполняет одну задачу за раз, поэтому счётчик
+# уровня модуля описывает текущую задачу.
+_vsimem_peak_bytes = 0
+
+
+def reset_vsimem_peak() -> None:
+    """Сбрасывает счётчик пикового объёма /vsimem перед новой задачей."""
+    global _vsimem_peak_bytes
+    _vsimem_peak_bytes = 0
+
+
+def memory_stats() -> dict[str, int]:
+    """Возвращает статистику памяти GDAL: пик /vsimem и занятость блочного кэша."""
+    return {
+        "vsimem_peak_bytes": _vsimem_peak_bytes,
+        "gdal_cache_used_bytes": gdal.GetCacheUsed(),
+        "gdal_cache_max_bytes": gdal.GetCacheMax(),
+    }
+
+
+class VsimemWorkspace:
+    """Изолированный каталог в /vsimem для файлов одного запуска алгоритма.
+
+    Каталог имеет уникальное имя, поэтому параллельные или прерванные запуски
+    не пересекаются по путям. При выходе из контекста все файлы удаляются,
+    в том числе если алгоритм завершился исключением.
+    """
+
+    def __init__(self):
+        self._root = f"/vsimem/{uuid.uuid4().hex}"
+        self._output_name: str | None = None
+
+    def __enter__(self) -> "VsimemWorkspace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        gdal.RmdirRecursive(self._root)
+
+    def path(self, name: str) -> str:
+        """Возвращает полный путь к файлу внутри рабочего каталога."""
+        return f"{self._root}/{name}"
+
+    def write(self, name: str, data: bytes) -> str:
+        """Записывает байты в файл рабочего каталога и возвращает его путь."""
+        path = self.path(name)
+        gdal.FileFromMemBuffer(path, data)
+        return path
+
+    def open_input(
+        self, data: bytes, file_ext: str, kind: DataKind, name: str = "in"
+    ) -> tuple[str, str]:
+        """Записывает входной файл и возвращает путь набора данных для GDAL.
+
+        Архив (.zip, .tar, .tar.gz) не распаковывается: возвращается путь
+        основного файла набора данных внутри него через /vsizip или /vsitar,
+        и сопутствующие файлы читаются драйвером прямо из архива.
+
+        Args:
+            data (bytes): Байты входного файла.
+            file_ext (str): Расширение входного файла.
+            kind (DataKind): Вид данных, который нужен алгоритму: в архиве
+                выбирается файл, который GDAL открывает как растр или вектор.
+            name (str): Имя файла без расширения; у каждого из нескольких
+                входов одного запуска оно должно быть своим.
+        Returns:
+            tuple[str, str]: Путь для открытия в GDAL и расширение набора данных.
+        Raises:
+            AlgorithmValidationError: Если в архиве не найден набор данных.
+        """
+        path = self.write(f"{name}.{file_ext}", data)
+        if not is_archive_extension(file_ext):
+            return path, file_ext
+
+        prefix = "/vsizip" if file_ext.lower() == "zip" else "/vsitar"
+        archive = f"{prefix}/{path}"
+        member = _find_dataset(archive, kind)
+        return f"{archive}/{member}", _extension(member)
+
+    def output_path(self, file_ext: str) -> str:
+        """Возвращает путь выходного набора данных в каталоге результатов.
+
+        Все файлы, которые драйвер создаст рядом (например, .shx/.dbf/.prj
+        шейпфайла), окажутся в этом же каталоге и попадут в архив результата.
+        """
+        self._output_name = f"out.{file_ext}"
+        gdal.Mkdir(self.path("out"), 0o755)
+        return self.path(f"out/{self._output_name}")
+
+    def read_output(self, as_archive: bool) -> bytes:
+        """Читает результат, записанный по пути из `output_path`.
+
+        Args:
+            as_archive (bool): Упаковать все файлы результата в zip.
+        Returns:
+            bytes: Байты выходного файла или zip-архива.
+        """
+        if self._output_name is None:
+            raise RuntimeError("output_path() не был вызван")
+        if not as_archive:
+            return self.read(f"out/{self._output_name}")
+        self._record_usage()
+        self._pack_zip("out", "out.zip")
+        return self.read("out.zip")
+
+    def read(self, name: str) -> bytes:
+        """Читает файл рабочего каталога целиком.
+
+        Вызывается, когда результат уже записан и вход ещё не удалён, поэтому
+        здесь же фиксируется пиковый объём /vsimem.
+        """
+        self._record_usage()
+        path = self.path(name)
+        f = gdal.VSIFOpenL(path, "rb")
+        if f is None:
+            raise FileNotFoundError(f"Файл {path} не найден в /vsimem")
+        try:
+            gdal.VSIFSeekL(f, 0, 2)
+            size = gdal.VSIFTellL(f)
+            gdal.VSIFSeekL(f, 0, 0)
+            return gdal.VSIFReadL(1, size, f)
+        finally:
+            gdal.VSIFCloseL(f)
+
+    def usage(self) -> int:
+        """Суммарный размер файлов рабочего каталога в байтах."""
+        total = 0
+        for name in gdal.ReadDirRecursive(self._root) or []:
+            stat = gdal.VSIStatL(self.path(name))
+            if stat is not None and not stat.IsDirectory():
+                total += stat.size
+        return total
+
+    def _pack_zip(self, src_dir: str, zip_name: str) -> None:
+        """Упаковывает файлы каталога в zip потоково, блоками по 1 МБ.
+
+        Каждый файл удаляется сразу после упаковки, поэтому в памяти
+        одновременно находятся архив и не больше одного исходного файла.
+        """
+        zip_path = self.path(zip_name)
+        src_root = self.path(src_dir)
+        for name in sorted(gdal.ReadDirRecursive(src_root) or []):
+            src = f"{src_root}/{name}"
+            stat = gdal.VSIStatL(src)
+            if stat is None or stat.IsDirectory():
+                continue
+            _copy_file(src, f"/vsizip/{zip_path}/{name}")
+            gdal.Unlink(src)
+
+    def _record_usage(self) -> None:
+        global _vsimem_peak_bytes
+        _vsimem_peak_bytes = max(_vsimem_peak_bytes, self.usage())
+
+
+def _extension(name: str) -> str:
+    return posixpath.splitext(name)[1].lstrip(".").lower()
+
+
+def _find_dataset(archive: str, kind: DataKind) -> str:
+    """Находит внутри архива основной файл набора данных нужного вида.
+
+    Файлы с известными расширениями проверяются в порядке
+    `_DATASET_EXTENSIONS`, остальные - после них.
+    """
+    members = [
+        name
+        for name in gdal.ReadDirRecursive(archive) or []
+        if not name.endswith("/") and not name.startswith("__MACOSX/")
+    ]
+    rank = {ext: index for index, ext in enumerate(_DATASET_EXTENSIONS)}
+    ordered = sorted(members, key=lambda name: rank.get(_extension(name), len(rank)))
+    for name in ordered:
+        if _opens_as(f"{archive}/{name}", kind):
+            return name
+    kind_name = "растр" if kind == "raster" else "вектор"
+    raise AlgorithmValidationError(
+        f"В архиве не найден {kind_name}: {', '.join(members) or 'архив пуст'}"
+    )
+
+
+def _opens_as(path: str, kind: DataKind) -> bool:
+    flags = gdal.OF_RASTER if kind == "raster" else gdal.OF_VECTOR
+    # Неподходящие файлы не должны засорять лог и последнюю ошибку GDAL
+    gdal.PushErrorHandler("CPLQuietErrorHandler")
+    try:
+        ds = gdal.OpenEx(path, flags | gdal.OF_READONLY)
+    finally:
+        gdal.PopErrorHandler()
+        gdal.ErrorReset()
+    if ds is None:
+        return False
+    if kind == "raster":
+        return ds.RasterCount > 0
+    return ds.GetLayerCount() > 0
+
+
+def _copy_file(src: str, dst: str) -> None:
+    src_f = gdal.VSIFOpenL(src, "rb")
+    if src_f is None:
+        raise FileNotFoundError(f"Файл {src} не найден в /vsimem")
+    dst_f = gdal.VSIFOpenL(dst, "wb")
+    if dst_f is None:
+        gdal.VSIFCloseL(src_f)
+        raise OSError(f"Не удалось открыть {dst} на запись")
+    try:
+        while chunk := gdal.VSIFReadL(1, _COPY_CHUNK_SIZE, src_f):
+            gdal.VSIFWriteL(chunk, 1, len(chunk), dst_f)
+    finally:
+        gdal.VSIFCloseL(dst_f)
+        gdal.VSIFCloseL(src_f)
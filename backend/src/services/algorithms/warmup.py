@@ -0,0 +1,33 @@
+from osgeo import gdal, osr  # pyright: ignore[reportMissingImports]
+
+
+def register_gdal_drivers() -> None:
+    """Регистрирует драйверы GDAL.
+
+    Безопасно до fork: регистрация не открывает файлов и соединений, поэтому
+    вызывается в процессе-супервизоре, и дочерние процессы наследуют её.
+    """
+    gdal.AllRegister()
+
+
+def warm_up_gdal() -> None:
+    """Прогревает PROJ и Warp до первой задачи.
+
+    Открывает proj.db пробным преобразованием координат и прогоняет крошечный
+    Warp в памяти. Контекст PROJ держит открытое соединение SQLite, которое
+    нельзя использовать после fork, поэтому функция вызывается в каждом
+    дочернем процессе, а не в супервизоре.
+    """
+    src = osr.SpatialReference()
+    src.ImportFromEPSG(4326)
+    src.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    dst = osr.SpatialReference()
+    dst.ImportFromEPSG(3857)
+    osr.CoordinateTransformation(src, dst).TransformPoint(37.6, 55.7)
+
+    ds = gdal.GetDriverByName("MEM").Create("", 4, 4, 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((37.0, 0.25, 0.0, 56.0, 0.0, -0.25))
+    ds.SetProjection(src.ExportToWkt())
+    if gdal.Warp("", ds, format="MEM", dstSRS="EPSG:3857") is None:
+        print(f"GDAL warm-up warp failed: {gdal.GetLastErrorMsg()}")
+    ds = None
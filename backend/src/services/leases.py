@@ -0,0 +1,195 @@
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.models.orm_models import ErrorCodeEnum, Task, TaskStateEnum
+
+
+def default_worker_id() -> str:
+    """Идентификатор владельца аренды: хост и PID процесса воркера."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def lease_deadline(lease_sec: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=lease_sec)
+
+
+class LeaseHeartbeat:
+    """Фоновый поток, продлевающий аренду выполняемой задачи.
+
+    Продление идёт через собственную сессию и соединение пула: основной поток
+    в это время может быть занят скачиванием или операцией GDAL. Если строка
+    больше не принадлежит воркеру (аренду забрал reaper), выставляется флаг
+    `lost`, и воркер прекращает работу над задачей при ближайшей проверке.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        task_id: uuid.UUID | None,
+        owner: str,
+        lease_sec: float,
+        thread_name: str | None = None,
+    ):
+        self._engine = engine
+        self._task_id = task_id
+        self._owner = owner
+        self._lease_sec = lease_sec
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name=thread_name or f"lease-{task_id}", daemon=True
+        )
+        self.lost = False
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        # Продлеваем трижды за срок аренды: один пропущенный такт не теряет её
+        while not self._stop.wait(self._lease_sec / 3):
+            try:
+                if not self.renew():
+                    self.lost = True
+                    return
+            except Exception as e:
+                # Временная ошибка БД: следующий такт попробует снова
+                print(f"Lease renewal failed ({self._thread.name}): {e}")
+
+    def renew(self) -> bool:
+        """Продлевает аренду; возвращает False, если задача воркеру больше не принадлежит."""
+        stmt = (
+            update(Task)
+            .where(
+                Task.id == self._task_id,
+                Task.state == TaskStateEnum.RUNNING,
+                Task.lease_owner == self._owner,
+            )
+            # datetime_update не трогаем: продление аренды - не изменение задачи
+            .values(
+                lease_expires_at=lease_deadline(self._lease_sec),
+                datetime_update=Task.datetime_update,
+            )
+            .returning(Task.id)
+        )
+        with Session(bind=self._engine) as session:
+            renewed = session.scalar(stmt) is not None
+            session.commit()
+        return renewed
+
+
+class GroupLeaseHeartbeat(LeaseHeartbeat):
+    """Продлевает резерв задач группы, ждущих своей очереди у воркера.
+
+    Ждущие задачи остаются PENDING с арендой воркера (см.
+    WorkerService.claim_group). Задача убирается из группы через `discard`,
+    когда воркер начинает её выполнять: дальше аренду продлевает её
+    собственный LeaseHeartbeat. Потеря резерва ждущей задачи не прерывает
+    остальные - перед запуском воркер проверяет, что задача всё ещё его.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        task_ids: Iterable[uuid.UUID],
+        owner: str,
+        lease_sec: float,
+    ):
+        super().__init__(
+            engine, None, owner, lease_sec, thread_name=f"lease-group-{owner}"
+        )
+        self._task_ids = set(task_ids)
+        self._ids_lock = threading.Lock()
+
+    def discard(self, task_id: uuid.UUID) -> None:
+        with self._ids_lock:
+            self._task_ids.discard(task_id)
+
+    def renew(self) -> bool:
+        """Продлевает резерв ждущих задач; потеря резерва группу не прерывает."""
+        with self._ids_lock:
+            task_ids = list(self._task_ids)
+        if not task_ids:
+            return True
+        stmt = (
+            update(Task)
+            .where(
+                Task.id.in_(task_ids),
+                Task.state == TaskStateEnum.PENDING,
+                Task.lease_owner == self._owner,
+            )
+            .values(
+                lease_expires_at=lease_deadline(self._lease_sec),
+                datetime_update=Task.datetime_update,
+            )
+        )
+        with Session(bind=self._engine) as session:
+            session.execute(stmt)
+            session.commit()
+        return True
+
+
+class LeaseReaper:
+    """Возвращает в очередь задачи, аренда которых истекла.
+
+    Истёкшая аренда означает, что воркер умер (например, OOM) или потерял
+    связь с БД. Задача снова становится PENDING, пока номер попытки меньше
+    `max_attempts`, иначе завершается ошибкой WORKER_LOST. Задачи с
+    запрошенной отменой переводятся в STOPPED.
+    """
+
+    def __init__(self, db: Session, max_attempts: int = 3, batch_size: int = 100):
+        self._db = db
+        self._max_attempts = max_attempts
+        self._batch_size = batch_size
+
+    def reap(self) -> dict[str, int]:
+        """Обрабатывает задачи с истёкшей арендой.
+
+        Returns:
+            dict[str, int]: Число задач, возвращённых в очередь, проваленных и остановленных.
+        """
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(Task)
+            .where(Task.state == TaskStateEnum.RUNNING, Task.lease_expires_at < now)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        counts = {"requeued": 0, "failed": 0, "stopped": 0}
+        for task in self._db.scalars(stmt):
+            task.lease_expires_at = None
+            if task.cancel_requested:
+                task.state = TaskStateEnum.STOPPED
+                task.error = "Task cancelled by request"
+                task.error_code = ErrorCodeEnum.TASK_CANCELLED.value
+                task.datetime_end = now
+                counts["stopped"] += 1
+            elif task.attempt < self._max_attempts:
+                task.state = TaskStateEnum.PENDING
+                task.datetime_start = None
+                task.progress = None
+                task.datetime_eta = None
+                counts["requeued"] += 1
+            else:
+                task.state = TaskStateEnum.ERROR
+                task.error = (
+                    f"Worker {task.lease_owner} lost the task "
+                    f"after {task.attempt} attempts"
+                )
+                task.error_code = ErrorCodeEnum.WORKER_LOST.value
+                task.datetime_end = now
+                counts["failed"] += 1
+        self._db.commit()
+        return counts
@@ -0,0 +1,118 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.models.orm_models import Task, TaskStateEnum
+
+# Границы корзин размера входного файла для меток гистограмм.
+_SIZE_BUCKETS: list[tuple[int, str]] = [
+    (1 << 20, "lt_1mb"),
+    (10 << 20, "1mb_10mb"),
+    (100 << 20, "10mb_100mb"),
+    (1 << 30, "100mb_1gb"),
+]
+
+STAGE_SECONDS = Histogram(
+    "geo_worker_stage_seconds",
+    "Длительность этапов WorkerService.run",
+    ["stage", "algorithm", "size_bucket"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+)
+BYTES_IN = Counter("geo_worker_bytes_in", "Скачано байт входных файлов", ["algorithm"])
+BYTES_OUT = Counter(
+    "geo_worker_bytes_out", "Загружено байт выходных файлов", ["algorithm"]
+)
+ERRORS = Counter("geo_worker_errors", "Задачи, завершившиеся ошибкой", ["error_code"])
+TASKS_FINISHED = Counter(
+    "geo_worker_tasks_finished", "Завершённые задачи", ["algorithm", "state"]
+)
+TASKS_IN_PROGRESS = Gauge(
+    "geo_worker_tasks_in_progress",
+    "Задачи, выполняемые воркерами в данный момент",
+    ["algorithm"],
+    multiprocess_mode="livesum",
+)
+
+
+def size_bucket(size_bytes: int | None) -> str:
+    """Возвращает метку корзины размера для входного файла."""
+    if size_bytes is None:
+        return "unknown"
+    for limit, label in _SIZE_BUCKETS:
+        if size_bytes < limit:
+            return label
+    return "gte_1gb"
+
+
+def build_registry() -> CollectorRegistry:
+    """Возвращает реестр метрик текущего процесса или всех процессов.
+
+    Если задана переменная окружения PROMETHEUS_MULTIPROC_DIR, метрики всех
+    процессов (воркеры uvicorn, дочерние процессы воркера) агрегируются из
+    файлов в этом каталоге.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class StageTimings:
+    """Накопитель длительностей этапов выполнения одной задачи."""
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self.current: str | None = None
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Замеряет длительность этапа; `current` указывает на последний начатый этап."""
+        self.current = stage
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Добавляет длительность этапа, не меняя `current` (для фоновых операций)."""
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def observe(self, algorithm: str, bucket: str) -> None:
+        """Отправляет накопленные длительности в гистограмму STAGE_SECONDS."""
+        for stage, seconds in self.seconds.items():
+            STAGE_SECONDS.labels(stage, algorithm, bucket).observe(seconds)
+
+
+class TaskStateCollector(Collector):
+    """Коллектор числа PENDING/RUNNING-задач, считываемого из БД при сборе метрик."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "geo_tasks", "Число задач в очереди по состояниям", labels=["state"]
+        )
+        with self._session_factory() as db:
+            for state in (TaskStateEnum.PENDING, TaskStateEnum.RUNNING):
+                count = db.scalar(
+                    select(func.count()).select_from(Task).where(Task.state == state)
+                )
+                gauge.add_metric([state.value], count or 0)
+        yield gauge
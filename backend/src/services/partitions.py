@@ -0,0 +1,259 @@
+import gzip
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.orm_models import Task, TaskStateEnum
+
+_PARTITION_NAME_RE = re.compile(r"^tasks_p(\d{4})_(\d{2})$")
+
+# Задачи в этих состояниях больше не меняются и могут уйти из tasks
+_FINISHED_STATES = (
+    TaskStateEnum.DONE.value,
+    TaskStateEnum.ERROR.value,
+    TaskStateEnum.STOPPED.value,
+)
+
+RETENTION_MODES = ("archive", "export", "drop")
+
+# Сколько отсоединение секции ждёт блокировки tasks, прежде чем отступить:
+# ожидающий ACCESS EXCLUSIVE выстраивает за собой все запросы к tasks
+_LOCK_TIMEOUT_MS = 2000
+
+
+class PartitionServiceError(Exception):
+    """Базовый класс для ошибок обслуживания секций задач."""
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+class TaskPartitionService:
+    """Обслуживание секционированной таблицы tasks.
+
+    Создаёт помесячные секции заранее, чтобы новые задачи не попадали в
+    секцию по умолчанию, и выносит старые завершённые задачи из tasks:
+    в таблицу tasks_archive, в сжатый файл или просто удаляет их. Опустевшие
+    секции прошлых месяцев удаляются целиком, без VACUUM.
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    def ensure_partitions(self, months_ahead: int) -> list[str]:
+        """Создаёт секции на текущий месяц и `months_ahead` месяцев вперёд.
+
+        Месяц, секцию которого создать не удалось, пропускается: остальные
+        месяцы всё равно создаются.
+
+        Args:
+            months_ahead (int): Число будущих месяцев, для которых нужны секции.
+        Returns:
+            list[str]: Имена созданных секций.
+        """
+        existing = set(self._partition_names())
+        created = []
+        month = _month_start(datetime.now(timezone.utc))
+        for _ in range(months_ahead + 1):
+            name = f"tasks_p{month:%Y_%m}"
+            if name not in existing:
+                # Имя и границы формируются из даты, а не из пользовательского ввода
+                try:
+                    self._db.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF tasks "
+                            f"FOR VALUES FROM ('{month.isoformat()}') "
+                            f"TO ('{_next_month(month).isoformat()}')"
+                        )
+                    )
+                    self._db.commit()
+                    created.append(name)
+                except Exception as e:
+                    # Обычно это значит, что строки месяца уже попали в
+                    # tasks_default: их нужно перенести вручную.
+                    self._db.rollback()
+                    print(f"Failed to create partition {name}: {e}")
+            month = _next_month(month)
+        return created
+
+    def retire_finished(
+        self,
+        older_than: timedelta,
+        mode: str = "archive",
+        export_dir: Path | None = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """Выносит из tasks завершённые задачи старше `older_than`.
+
+        Строки переносятся пачками по `batch_size`, каждая пачка - отдельная
+        транзакция, чтобы не держать долгих блокировок.
+
+        Args:
+            older_than (timedelta): Минимальный возраст задачи по datetime_create.
+            mode (str): "archive" - в tasks_archive, "export" - в gzip-файл
+                JSON Lines в `export_dir`, "drop" - удалить.
+            export_dir (Path | None): Каталог для файлов выгрузки в режиме "export".
+            batch_size (int): Размер пачки.
+        Returns:
+            int: Число вынесенных задач.
+        Raises:
+            PartitionServiceError: Если режим неизвестен или не задан каталог выгрузки.
+        """
+        if mode not in RETENTION_MODES:
+            raise PartitionServiceError(f"Unknown retention mode: {mode}")
+        if mode == "export" and export_dir is None:
+            raise PartitionServiceError("export_dir is required for export mode")
+
+        cutoff = datetime.now(timezone.utc) - older_than
+        columns = ", ".join(column.name for column in Task.__table__.columns)
+        delete_batch = f"""
+            DELETE FROM tasks
+            WHERE (id, datetime_create) IN (
+                SELECT id, datetime_create FROM tasks
+                WHERE datetime_create < :cutoff
+                  AND state::text = ANY(:states)
+                LIMIT :batch_size
+            )
+            RETURNING {columns}
+            """
+        if mode == "archive":
+            stmt = text(f"""
+                WITH moved AS ({delete_batch})
+                INSERT INTO tasks_archive ({columns})
+                SELECT {columns} FROM moved
+                """)
+        else:
+            stmt = text(delete_batch)
+        stmt = stmt.bindparams(
+            cutoff=cutoff, states=list(_FINISHED_STATES), batch_size=batch_size
+        )
+
+        total = 0
+        export_file = None
+        try:
+            while True:
+                result = self._db.execute(stmt)
+                if mode == "export":
+                    rows = result.mappings().all()
+                    moved = len(rows)
+                    if rows:
+                        export_file = export_file or self._open_export(export_dir)
+                        for row in rows:
+                            export_file.write(
+                                json.dumps(dict(row), default=str, ensure_ascii=False)
+                                + "\n"
+                            )
+                        # Файл сбрасывается до коммита: при сбое строки могут
+                        # попасть в выгрузку дважды, но не потеряются.
+                        export_file.flush()
+                else:
+                    moved = result.rowcount
+                self._db.commit()
+                total += moved
+                if moved < batch_size:
+                    break
+        except Exception as e:
+            self._db.rollback()
+            raise PartitionServiceError(f"Failed to retire finished tasks: {e}")
+        finally:
+            if export_file is not None:
+                export_file.close()
+        return total
+
+    def drop_empty_partitions(self, older_than: timedelta) -> list[str]:
+        """Удаляет пустые секции, целиком лежащие раньше `older_than`.
+
+        DROP секции берёт ACCESS EXCLUSIVE на всю tasks, поэтому секция сначала
+        отсоединяется (CONCURRENTLY, если у tasks нет секции по умолчанию), а
+        затем удаляется уже как отдельная таблица. Каждая секция обрабатывается
+        в своей транзакции с lock_timeout: если блокировку держат воркеры,
+        секция пропускается до следующего прохода, а не останавливает все
+        запросы к tasks.
+
+        Args:
+            older_than (timedelta): Возраст, после которого секция считается старой.
+        Returns:
+            list[str]: Имена удалённых секций.
+        """
+        cutoff = datetime.now(timezone.utc) - older_than
+        candidates = []
+        for name in self._partition_names():
+            match = _PARTITION_NAME_RE.match(name)
+            if match is None:
+                continue
+            month = datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+            if _next_month(month) > cutoff:
+                continue
+            if self._db.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first():
+                continue
+            candidates.append(name)
+        pending = self._detach_pending_names()
+        has_default = self._has_default_partition()
+        self._db.commit()
+
+        dropped = []
+        # DETACH ... CONCURRENTLY нельзя выполнять внутри транзакции
+        engine = self._db.get_bind()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"SET lock_timeout = {_LOCK_TIMEOUT_MS}"))
+            for name in candidates:
+                if name in pending:
+                    # Прерванное ранее отсоединение CONCURRENTLY
+                    detach = f"ALTER TABLE tasks DETACH PARTITION {name} FINALIZE"
+                elif has_default:
+                    detach = f"ALTER TABLE tasks DETACH PARTITION {name}"
+                else:
+                    detach = f"ALTER TABLE tasks DETACH PARTITION {name} CONCURRENTLY"
+                try:
+                    conn.execute(text(detach))
+                    conn.execute(text(f"DROP TABLE {name}"))
+                except Exception as e:
+                    print(f"Failed to drop partition {name}, will retry: {e}")
+                    continue
+                dropped.append(name)
+        return dropped
+
+    def _partition_names(self) -> list[str]:
+        rows = self._db.execute(text("""
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'tasks'::regclass
+                ORDER BY c.relname
+                """))
+        return [name for (name,) in rows]
+
+    def _detach_pending_names(self) -> set[str]:
+        rows = self._db.execute(text("""
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'tasks'::regclass AND i.inhdetachpending
+                """))
+        return {name for (name,) in rows}
+
+    def _has_default_partition(self) -> bool:
+        return (
+            self._db.scalar(
+                text(
+                    "SELECT partdefid <> 0 FROM pg_partitioned_table "
+                    "WHERE partrelid = 'tasks'::regclass"
+                )
+            )
+            is True
+        )
+
+    @staticmethod
+    def _open_export(export_dir: Path):
+        export_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return gzip.open(export_dir / f"tasks_{stamp}.jsonl.gz", "at", encoding="utf-8")
@@ -0,0 +1,71 @@
+import cProfile
+import marshal
+import resource
+import sys
+
+
+def reset_peak_rss() -> None:
+    """Сбрасывает пиковый RSS процесса (VmHWM), чтобы измерить пик одной задачи.
+
+    Использует /proc/self/clear_refs (Linux 4.0+). На других платформах пик
+    остаётся накопленным за всё время жизни процесса.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> int:
+    """Возвращает пиковый RSS процесса в байтах с момента последнего сброса."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss в Linux измеряется в килобайтах, в macOS - в байтах
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> int:
+    """Возвращает текущий RSS процесса в байтах (0, если /proc недоступен)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class TaskProfiler:
+    """Необязательный cProfile-профайлер для участка выполнения задачи.
+
+    Если профилирование выключено, контекстный менеджер ничего не делает.
+    Результат выгружается в формате pstats и читается через pstats.Stats.
+    """
+
+    def __init__(self, enabled: bool):
+        self._profiler = cProfile.Profile() if enabled else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._profiler is not None
+
+    def __enter__(self) -> "TaskProfiler":
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def dump(self) -> bytes:
+        """Возвращает собранную статистику в формате файла pstats."""
+        if self._profiler is None:
+            raise RuntimeError("Профилирование не было включено")
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)  # type: ignore[attr-defined]
@@ -0,0 +1,75 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+# Синхронизация с хранилищем: (процент выполнения или None, если нового значения
+# нет; ожидаемое время завершения или None) -> флаг отмены задачи.
+ProgressSync = Callable[[float | None, datetime | None], bool]
+
+
+class TaskProgress:
+    """Callback прогресса GDAL с троттлингом записи и кооперативной отменой.
+
+    Экземпляр передаётся в опции gdal.Warp/VectorTranslate как callback.
+    GDAL вызывает его очень часто, поэтому вызов лишь запоминает последнее
+    значение прогресса. Не чаще одного раза в `interval_sec` накопленное
+    значение вместе с ETA отправляется в `sync` одной операцией, которая
+    заодно возвращает актуальный флаг отмены.
+    """
+
+    def __init__(
+        self,
+        sync: ProgressSync,
+        interval_sec: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._sync = sync
+        self._interval = interval_sec
+        self._clock = clock
+        self._started = clock()
+        self._last_sync = self._started
+        self._complete: float | None = None
+        self._synced_complete: float | None = None
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Последнее известное значение флага отмены (без обращения к хранилищу)."""
+        return self._cancelled
+
+    @property
+    def percent(self) -> float | None:
+        """Последний полученный от GDAL процент выполнения."""
+        return None if self._complete is None else round(self._complete * 100, 1)
+
+    def eta(self) -> datetime | None:
+        """Оценивает время завершения по средней скорости с момента старта."""
+        if not self._complete or self._complete <= 0.01:
+            return None
+        elapsed = self._clock() - self._started
+        remaining = elapsed * (1.0 - self._complete) / self._complete
+        return datetime.now(timezone.utc) + timedelta(seconds=remaining)
+
+    def check(self) -> bool:
+        """Принудительно синхронизирует прогресс и перечитывает флаг отмены.
+
+        Returns:
+            bool: True, если задачу требуется отменить.
+        """
+        self._last_sync = self._clock()
+        if self._complete != self._synced_complete:
+            self._synced_complete = self._complete
+            cancelled = self._sync(self.percent, self.eta())
+        else:
+            cancelled = self._sync(None, None)
+        self._cancelled = self._cancelled or bool(cancelled)
+        return self._cancelled
+
+    def __call__(
+        self, complete: float, message: Any = None, user_data: Any = None
+    ) -> int:
+        """Сигнатура GDAL progress callback: 1 - продолжить, 0 - прервать операцию."""
+        self._complete = complete
+        if self._clock() - self._last_sync >= self._interval:
+            self.check()
+        return 0 if self._cancelled else 1
@@ -0,0 +1,156 @@
+from typing import Sequence
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.orm import Session
+
+from src.models.orm_models import Task, TaskStateEnum
+
+# Список клиентов с PENDING-задачами и "головой" очереди каждого из них.
+# Рекурсивный CTE делает loose index scan по ix_tasks_pending_claim: на каждого
+# клиента приходится один спуск по индексу, а не проход по всем PENDING-строкам.
+_PENDING_HEADS_SQL = text("""
+    WITH RECURSIVE clients AS (
+        (
+            SELECT client_id FROM tasks
+            WHERE state = 'PENDING'
+            ORDER BY client_id
+            LIMIT 1
+        )
+        UNION ALL
+        SELECT (
+            SELECT t.client_id FROM tasks t
+            WHERE t.state = 'PENDING' AND t.client_id > c.client_id
+            ORDER BY t.client_id
+            LIMIT 1
+        )
+        FROM clients c
+        WHERE c.client_id IS NOT NULL
+    )
+    SELECT c.client_id, h.priority, h.datetime_create
+    FROM clients c
+    CROSS JOIN LATERAL (
+        SELECT t.priority, t.datetime_create FROM tasks t
+        WHERE t.state = 'PENDING' AND t.client_id = c.client_id
+          AND (t.lease_expires_at IS NULL OR t.lease_expires_at < now())
+        ORDER BY t.priority DESC, t.datetime_create
+        LIMIT 1
+    ) h
+    WHERE c.client_id IS NOT NULL
+    """)
+
+# PENDING-задача с действующей арендой зарезервирована воркером для группы
+# задач с общим входом (WorkerService.claim_group) и не захватывается другими.
+_NOT_RESERVED = or_(Task.lease_expires_at.is_(None), Task.lease_expires_at < func.now())
+
+
+class FairShareClaimPolicy:
+    """Политика выбора следующей задачи для воркера.
+
+    Между клиентами действует взвешенная справедливая доля: первым обслуживается
+    клиент с наименьшим отношением числа выполняемых задач к его весу. Внутри
+    клиента задачи берутся по убыванию приоритета, затем в порядке создания.
+    Все запросы опираются на частичные индексы по PENDING/RUNNING-строкам.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        tenant_weights: dict[str, float] | None = None,
+        default_weight: float = 1.0,
+    ):
+        self._db = db
+        self._tenant_weights = tenant_weights or {}
+        self._default_weight = default_weight
+
+    def weight(self, client_id: str) -> float:
+        """Возвращает вес клиента (не меньше минимального положительного)."""
+        weight = self._tenant_weights.get(client_id, self._default_weight)
+        return max(weight, 1e-6)
+
+    def claim(self) -> Task | None:
+        """Блокирует и возвращает следующую задачу или None, если очередь пуста.
+
+        Строка блокируется через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+        конкурирующие воркеры не ждут друг друга. Блокировка снимается при
+        коммите транзакции вызывающей стороной.
+        """
+        running = self._running_counts()
+        heads = self._db.execute(_PENDING_HEADS_SQL).all()
+
+        for head in self.rank_heads(heads, running):
+            task = self._lock_head(head.client_id)
+            if task is not None:
+                return task
+        return None
+
+    def rank_heads(self, heads: Sequence, running: dict[str, int]) -> list:
+        """Упорядочивает головы очередей клиентов в порядке обслуживания.
+
+        Args:
+            heads (Sequence): Строки с client_id, priority и datetime_create.
+            running (dict[str, int]): Число RUNNING-задач по клиентам.
+        Returns:
+            list: Головы по возрастанию доли клиента (RUNNING / вес), затем по
+                убыванию приоритета и по времени создания.
+        """
+        return sorted(
+            heads,
+            key=lambda head: (
+                running.get(head.client_id, 0) / self.weight(head.client_id),
+                -head.priority,
+                head.datetime_create,
+            ),
+        )
+
+    def _running_counts(self) -> dict[str, int]:
+        stmt = (
+            select(Task.client_id, func.count())
+            .where(Task.state == TaskStateEnum.RUNNING)
+            .group_by(Task.client_id)
+        )
+        return {client_id: count for client_id, count in self._db.execute(stmt)}
+
+    def _lock_head(self, client_id: str) -> Task | None:
+        stmt = (
+            select(Task)
+            .where(
+                Task.state == TaskStateEnum.PENDING,
+                Task.client_id == client_id,
+                _NOT_RESERVED,
+            )
+            .order_by(Task.priority.desc(), Task.datetime_create)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return self._db.scalars(stmt).first()
+
+    def claim_same_input(self, task: Task, limit: int) -> list[Task]:
+        """Блокирует до `limit` PENDING-задач клиента с тем же входным файлом.
+
+        Задачи группы выполняются одним воркером подряд с одного скачанного
+        входа; до запуска они остаются PENDING и резервируются арендой.
+        Берутся только задачи того же клиента, чтобы группа не обходила
+        справедливую долю других клиентов, и только задачи с одним входом.
+        Как и `claim`, использует SKIP LOCKED.
+
+        Args:
+            task (Task): Уже заблокированная задача - голова группы.
+            limit (int): Максимальное число дополнительных задач.
+        Returns:
+            list[Task]: Заблокированные задачи в порядке приоритета и создания.
+        """
+        stmt = (
+            select(Task)
+            .where(
+                Task.state == TaskStateEnum.PENDING,
+                Task.input_file_id == task.input_file_id,
+                Task.client_id == task.client_id,
+                Task.input_file_ids.is_(None),
+                Task.id != task.id,
+                _NOT_RESERVED,
+            )
+            .order_by(Task.priority.desc(), Task.datetime_create)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(self._db.scalars(stmt))
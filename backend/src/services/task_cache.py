@@ -0,0 +1,72 @@
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.models.orm_models import TaskStateEnum
+from src.models.schemas import TaskRead
+
+# Состояния, после которых задача больше не меняется
+TERMINAL_STATES = frozenset(
+    {TaskStateEnum.DONE.value, TaskStateEnum.ERROR.value, TaskStateEnum.STOPPED.value}
+)
+
+
+def task_etag(task: TaskRead) -> str:
+    """Возвращает сильный ETag представления задачи (хэш её JSON)."""
+    digest = hashlib.sha1(task.model_dump_json().encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяет заголовок If-None-Match по правилам слабого сравнения (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+@dataclass(frozen=True)
+class CachedTask:
+    task: TaskRead
+    etag: str
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.task.state in TERMINAL_STATES
+
+
+class TerminalTaskCache:
+    """LRU-кэш завершённых задач в памяти процесса API.
+
+    Хранятся только задачи в конечных состояниях: они больше не меняются,
+    поэтому кэш не нуждается в инвалидации. Доступ защищён блокировкой, так как
+    синхронные эндпоинты FastAPI выполняются в пуле потоков.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._items: OrderedDict[uuid.UUID, CachedTask] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, task_id: uuid.UUID) -> CachedTask | None:
+        with self._lock:
+            cached = self._items.get(task_id)
+            if cached is not None:
+                self._items.move_to_end(task_id)
+            return cached
+
+    def put(self, task: TaskRead) -> CachedTask:
+        """Оборачивает задачу с её ETag и кэширует, если она завершена."""
+        cached = CachedTask(task=task, etag=task_etag(task))
+        if not cached.is_terminal or self._capacity <= 0:
+            return cached
+        with self._lock:
+            self._items[task.id] = cached
+            self._items.move_to_end(task.id)
+            while len(self._items) > self._capacity:
+                self._items.popitem(last=False)
+        return cached
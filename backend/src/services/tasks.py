@@ -1,10 +1,30 @@
 import uuid
+from datetime import datetime, timezone
 
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import Session
 
-from src.models.orm_models import Task, TaskStateEnum
+from src.models.orm_models import ErrorCodeEnum, Task, TaskStateEnum
 from src.models.schemas import AlgorithmParamsBaseModel
-from src.services import BaseAlgorithm
+
+# Метка для следующего опроса changed_since. datetime_update ставится внутри
+# транзакции писателя и становится видна только после её коммита, поэтому
+# строка, изменённая ещё не зафиксированной транзакцией, может получить метку
+# раньше текущего времени. Метка не превышает начала самой старой пишущей
+# транзакции (backend_xid назначен при первой записи): всё, что она запишет,
+# окажется позже метки. Транзакции без записи на метку не влияют - их будущие
+# записи получат clock_timestamp() позже текущего момента.
+_STATUS_WATERMARK_SQL = text("""
+    SELECT LEAST(
+        clock_timestamp(),
+        (
+            SELECT min(xact_start) FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND backend_xid IS NOT NULL
+              AND pid <> pg_backend_pid()
+        )
+    )
+    """)
 
 
 class TaskServiceError(Exception):
@@ -23,6 +43,10 @@ class TaskCreationError(TaskServiceError):
     """Ошибка, возникающая при создании задачи."""
 
 
+class TaskAlreadyFinishedError(TaskServiceError):
+    """Ошибка, возникающая при попытке отменить уже завершённую задачу."""
+
+
 class TaskService:
     """Сервис для управления задачами обработки геопространственных данных."""
 
@@ -31,29 +55,53 @@ class TaskService:
 
     def create_task(
         self,
-        algorithm: BaseAlgorithm,
-        input_file_id: str,
+        algorithm: str,
+        input_file_id: str | None,
         params: AlgorithmParamsBaseModel,
+        input_file_ids: list[str] | None = None,
         output_file_full_path: str | None = None,
+        priority: int = 5,
+        client_id: str = "default",
+        batch_id: str | None = None,
+        datetime_expiration: datetime | None = None,
+        collect_profile: bool = False,
     ) -> Task:
         """Создает новую задачу обработки данных.
 
         Args:
-            algorithm (BaseAlgorithm): Алгоритм для выполнения.
+            algorithm (str): Название алгоритма для выполнения.
             params (dict): Параметры алгоритма.
-            input_file_id (str): Идентификатор входного файла.
+            input_file_id (str | None): Идентификатор входного файла.
+            input_file_ids (list[str] | None): Идентификаторы входных файлов
+                задачи с несколькими входами; input_file_id по умолчанию - первый.
             output_file_full_path (str | None): Полный путь к выходному файлу (необязательно).
+            priority (int): Приоритет задачи внутри клиента (0 - низший, 9 - высший).
+            client_id (str): Идентификатор клиента (тенанта).
+            batch_id (str | None): Идентификатор пакета для группового опроса статусов.
+            datetime_expiration (datetime | None): Время, до которого задача актуальна.
+            collect_profile (bool): Снимать ли cProfile выполнения алгоритма.
         Returns:
             Task: Созданная задача.
         """
 
+        if input_file_id is None:
+            if not input_file_ids:
+                raise InvalidAlgorithmParamsError("Input file is not specified")
+            input_file_id = input_file_ids[0]
+
         task = Task(
             id=uuid.uuid4(),
-            algorithm=algorithm.name(),
+            algorithm=algorithm.upper(),
             params=params.model_dump(),
             input_file_id=input_file_id,
+            input_file_ids=input_file_ids,
             state=TaskStateEnum.PENDING,
             output_file_full_path=output_file_full_path,
+            priority=priority,
+            client_id=client_id,
+            batch_id=batch_id,
+            datetime_expiration=datetime_expiration,
+            collect_profile=collect_profile,
         )
         self._db.add(task)
         try:
@@ -63,10 +111,20 @@ class TaskService:
             raise TaskCreationError(f"Failed to create task: {e}")
         return task
 
-    def list_tasks(self) -> list[Task]:
-        """Возвращает список всех задач."""
+    def list_tasks(self, params_contains: dict | None = None) -> list[Task]:
+        """Возвращает список задач.
+
+        Args:
+            params_contains (dict | None): Вернуть только задачи, параметры
+                которых содержат этот JSON-объект (`params @> ...`, GIN-индекс).
+        Returns:
+            list[Task]: Найденные задачи.
+        """
+        query = self._db.query(Task)
+        if params_contains is not None:
+            query = query.filter(Task.params.contains(params_contains))
         try:
-            tasks = self._db.query(Task).all()
+            tasks = query.all()
         except Exception as e:
             print(f"Error listing tasks: {e}")
             raise TaskServiceError(f"Failed to list tasks: {e}")
@@ -89,3 +147,103 @@ class TaskService:
         if task is None:
             raise TaskNotFoundError(f"Task with id {task_id} not found")
         return task
+
+    def get_statuses(
+        self,
+        ids: list[uuid.UUID] | None = None,
+        batch_id: str | None = None,
+        changed_since: datetime | None = None,
+    ) -> tuple[datetime, list]:
+        """Возвращает статусы набора задач одним запросом.
+
+        Выбираются только столбцы статуса, без params и profile. Задачи
+        ищутся по первичному ключу (`id IN (...)`) и/или по индексу пакета.
+        Возвращаемая метка может отставать от текущего времени на длительность
+        пишущих транзакций, поэтому при инкрементальном опросе одна и та же
+        задача может прийти повторно; клиент сводит строки по id.
+
+        Args:
+            ids (list[uuid.UUID] | None): Идентификаторы задач.
+            batch_id (str | None): Идентификатор пакета.
+            changed_since (datetime | None): Вернуть только задачи, изменившиеся позже.
+        Returns:
+            tuple[datetime, list]: Метка для следующего changed_since и строки статусов.
+        """
+        stmt = select(
+            Task.id,
+            Task.state,
+            Task.progress,
+            Task.error_code,
+            Task.output_file_id,
+            Task.datetime_end,
+            Task.datetime_update,
+        )
+        if ids:
+            stmt = stmt.where(Task.id.in_(ids))
+        if batch_id is not None:
+            stmt = stmt.where(Task.batch_id == batch_id)
+        if changed_since is not None:
+            stmt = stmt.where(Task.datetime_update > changed_since)
+        try:
+            # Метка берётся до выборки и не позже начала незафиксированных
+            # записей: изменения, которые выборка не увидела, попадут в
+            # следующий опрос (см. _STATUS_WATERMARK_SQL).
+            server_time = self._db.scalar(_STATUS_WATERMARK_SQL)
+            rows = self._db.execute(stmt.order_by(Task.datetime_update)).all()
+        except Exception as e:
+            raise TaskServiceError(f"Failed to get task statuses: {e}")
+        return server_time, rows
+
+    def cancel_task(self, task_id: uuid.UUID) -> Task:
+        """Отменяет задачу.
+
+        Задача в PENDING сразу переводится в STOPPED. Для задачи в RUNNING
+        выставляется флаг cancel_requested: воркер прерывает операцию GDAL
+        при ближайшей проверке флага и сам переводит задачу в STOPPED.
+        Переходы выполняются условными UPDATE, поэтому воркер, захвативший
+        задачу одновременно с отменой, не получит её в STOPPED посреди работы.
+
+        Args:
+            task_id (uuid.UUID): Идентификатор задачи.
+        Returns:
+            Task: Задача после изменения.
+        Raises:
+            TaskNotFoundError: Если задача не найдена.
+            TaskAlreadyFinishedError: Если задача уже завершена.
+        """
+        stop_pending = (
+            update(Task)
+            .where(Task.id == task_id, Task.state == TaskStateEnum.PENDING)
+            .values(
+                state=TaskStateEnum.STOPPED,
+                cancel_requested=True,
+                error_code=ErrorCodeEnum.TASK_CANCELLED.value,
+                error="Task cancelled by request",
+                datetime_end=datetime.now(timezone.utc),
+            )
+            .returning(Task.id)
+        )
+        request_running = (
+            update(Task)
+            .where(Task.id == task_id, Task.state == TaskStateEnum.RUNNING)
+            .values(cancel_requested=True)
+            .returning(Task.id)
+        )
+        while True:
+            try:
+                cancelled = (
+                    self._db.scalar(stop_pending) is not None
+                    or self._db.scalar(request_running) is not None
+                )
+            except Exception as e:
+                raise TaskServiceError(f"Failed to cancel task: {e}")
+            # Строка могла измениться другой транзакцией после загрузки в сессию
+            self._db.expire_all()
+            task = self.get_task(task_id)
+            if cancelled:
+                return task
+            # Между двумя UPDATE reaper мог вернуть задачу в очередь - повторяем
+            if task.state not in (TaskStateEnum.PENDING, TaskStateEnum.RUNNING):
+                raise TaskAlreadyFinishedError(
+                    f"Task with id {task_id} is already finished ({task.state.value})"
+                )
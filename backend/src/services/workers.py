@@ -1,12 +1,37 @@
+import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable, Iterator
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from src.models.orm_models import Task, TaskStateEnum
+from src.models.orm_models import ErrorCodeEnum, Task, TaskStateEnum
 
-from .algorithms import AlgorithmAbstractFactory
-from .files import FileService
+from .admission import MemoryBudget
+from .algorithms import AlgorithmAbstractFactory, MultiInputAlgorithm
+from .files import FileAlreadyExistsError, FileMeta, FileService
+from .files import FileNotFoundError as FileServiceFileNotFoundError
+from .leases import (
+    GroupLeaseHeartbeat,
+    LeaseHeartbeat,
+    default_worker_id,
+    lease_deadline,
+)
+from .metrics import (
+    BYTES_IN,
+    BYTES_OUT,
+    ERRORS,
+    TASKS_FINISHED,
+    TASKS_IN_PROGRESS,
+    StageTimings,
+    size_bucket,
+)
+from .profiling import TaskProfiler, peak_rss_bytes, reset_peak_rss
+from .progress import TaskProgress
+from .scheduling import FairShareClaimPolicy
 
 
 class WorkerServiceError(Exception):
@@ -29,59 +54,600 @@ class AlgorithmExecutionError(WorkerServiceError):
     """Ошибка, возникающая при выполнении алгоритма."""
 
 
+class TaskCancelledError(WorkerServiceError):
+    """Ошибка, сигнализирующая об отмене задачи во время выполнения."""
+
+
+class LeaseLostError(WorkerServiceError):
+    """Ошибка, возникающая, если аренда задачи истекла и её забрал reaper."""
+
+
 class WorkerService:
     def __init__(
         self,
         db: Session,
         file_service: FileService,
+        claim_policy: FairShareClaimPolicy | None = None,
+        progress_interval_sec: float = 2.0,
+        worker_id: str | None = None,
+        lease_sec: float = 60.0,
+        memory_budget: MemoryBudget | None = None,
+        budget_slot: int = 0,
+        download_concurrency: int = 8,
+        affinity_group_size: int = 1,
     ):
         self._db = db
         self._file_service = file_service
+        self._claim_policy = claim_policy or FairShareClaimPolicy(db)
+        self._progress_interval = progress_interval_sec
+        self._worker_id = worker_id or default_worker_id()
+        self._lease_sec = lease_sec
+        self._memory_budget = memory_budget
+        self._budget_slot = budget_slot
+        self._download_concurrency = max(1, download_concurrency)
+        self._affinity_group_size = max(1, affinity_group_size)
+
+    def claim_task(self) -> uuid.UUID | None:
+        """Захватывает следующую задачу из очереди и переводит её в RUNNING.
 
-    def run(self, task_id: uuid.UUID) -> None:
-        """Запускает выполнение алгоритма обработки данных."""
-        task = self._db.get(Task, task_id)
+        Returns:
+            uuid.UUID | None: Идентификатор захваченной задачи или None, если очередь пуста.
+        """
+        task = self._claim_policy.claim()
         if task is None:
-            raise TaskNotFoundError(f"Task with id {task_id} not found.")
+            self._db.commit()
+            return None
+        self._mark_running(task)
+        return task.id
+
+    def claim_group(self) -> list[uuid.UUID]:
+        """Захватывает следующую задачу и ждущие задачи клиента с тем же входом.
+
+        Голова очереди переводится в RUNNING, остальные задачи группы (не
+        больше `affinity_group_size` всего) остаются PENDING, но резервируются
+        арендой воркера: другие воркеры их не захватывают, а в справедливой
+        доле и в API они не считаются выполняемыми. Задачи с несколькими
+        входами не группируются.
+
+        Returns:
+            list[uuid.UUID]: Идентификаторы захваченных задач, первая - голова
+                очереди; пустой список, если очередь пуста.
+        """
+        task = self._claim_policy.claim()
+        if task is None:
+            self._db.commit()
+            return []
+        siblings = []
+        if self._affinity_group_size > 1 and task.input_file_ids is None:
+            siblings = self._claim_policy.claim_same_input(
+                task, self._affinity_group_size - 1
+            )
+        if siblings:
+            self._db.execute(
+                update(Task)
+                .where(Task.id.in_([sibling.id for sibling in siblings]))
+                # Резерв - не изменение задачи для клиента, datetime_update не трогаем
+                .values(
+                    lease_owner=self._worker_id,
+                    lease_expires_at=lease_deadline(self._lease_sec),
+                    datetime_update=Task.datetime_update,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        self._mark_running(task)
+        return [task.id] + [sibling.id for sibling in siblings]
+
+    def run_next(self, should_stop: Callable[[], bool] | None = None) -> int:
+        """Захватывает и выполняет следующую задачу (или группу задач) из очереди.
+
+        Args:
+            should_stop (Callable[[], bool] | None): Проверка запроса остановки
+                воркера; задачи группы, не начатые к остановке, возвращаются
+                в очередь.
+        Returns:
+            int: Число запущенных задач; 0, если очередь пуста.
+        """
+        timings = StageTimings()
+        with timings.measure("claim"):
+            task_ids = self.claim_group()
+        if not task_ids:
+            return 0
+        if len(task_ids) == 1:
+            self.run(task_ids[0], timings=timings)
+            return 1
+        return self._run_group(task_ids, timings, should_stop)
+
+    def _run_group(
+        self,
+        task_ids: list[uuid.UUID],
+        timings: StageTimings,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> int:
+        """Выполняет группу задач с общим входным файлом подряд.
+
+        Вход скачивается первой задачей и переиспользуется остальными. Состояние
+        каждой задачи обновляется отдельно: любая ошибка одной задачи (в том
+        числе ошибка БД) не прерывает группу. Пока задача ждёт своей очереди,
+        её резерв продлевает общий heartbeat; не начатые из-за прерывания или
+        остановки воркера задачи снимаются с резерва и сразу доступны другим
+        воркерам.
+
+        Returns:
+            int: Число запущенных задач группы.
+        """
+        shared_input: dict[str, bytes] = {}
+        waiting = deque(task_ids[1:])
+        started = 0
+        with GroupLeaseHeartbeat(
+            self._db.get_bind(), waiting, self._worker_id, self._lease_sec
+        ) as group_heartbeat:
+            try:
+                for index, task_id in enumerate(task_ids):
+                    if index:
+                        if should_stop is not None and should_stop():
+                            print(
+                                f"Worker is stopping, {len(waiting)} reserved "
+                                "tasks returned to the queue"
+                            )
+                            break
+                        waiting.popleft()
+                        group_heartbeat.discard(task_id)
+                    try:
+                        if index and not self._start_group_member(task_id):
+                            print(f"Task {task_id} is no longer reserved, skipped")
+                            continue
+                        started += 1
+                        self.run(
+                            task_id,
+                            timings=timings if index == 0 else StageTimings(),
+                            shared_input=shared_input,
+                        )
+                    except Exception as e:
+                        self._db.rollback()
+                        print(f"Task {task_id} failed: {e}")
+            finally:
+                if waiting:
+                    self._release_reserved(list(waiting))
+        return started
+
+    def _mark_running(self, task: Task) -> None:
         task.state = TaskStateEnum.RUNNING
         task.datetime_start = datetime.now(timezone.utc)
+        task.lease_owner = self._worker_id
+        task.lease_expires_at = lease_deadline(self._lease_sec)
+        task.attempt += 1
         self._db.commit()
 
-        try:
-            algorithm = AlgorithmAbstractFactory.get_algorithm(task.algorithm)
-            params = algorithm.get_pydantic_model().model_validate(task.params)
-
-            file_meta = self._file_service.get_file_meta(task.input_file_id)
-            file_bytes = self._file_service.get_file(task.input_file_id)
+    def _start_group_member(self, task_id: uuid.UUID) -> bool:
+        """Переводит зарезервированную задачу группы в RUNNING.
 
-            output_bytes = algorithm.run(
-                file_bytes, file_ext=file_meta.file_extension, params=params
+        Returns:
+            bool: False, если задачу отменили или резерв истёк и её забрал
+                другой воркер.
+        """
+        stmt = (
+            update(Task)
+            .where(
+                Task.id == task_id,
+                Task.state == TaskStateEnum.PENDING,
+                Task.lease_owner == self._worker_id,
             )
-
-            file_name = f"processed_{file_meta.filename}"
-            file_extension = file_meta.file_extension
-            file_path = file_meta.path
-
-            uploaded = self._file_service.post_file(
-                filename=file_name,
-                file_extension=file_extension,
-                path=file_path,
-                file_content=output_bytes,
-                comment=(
-                    f"Processed file: {file_meta.filename}\n"
-                    f"uuid: {file_meta.uuid}\nalgorithm: {algorithm.name()}\nparams: {params.model_dump()}"
-                ),
+            .values(
+                state=TaskStateEnum.RUNNING,
+                datetime_start=datetime.now(timezone.utc),
+                lease_expires_at=lease_deadline(self._lease_sec),
+                attempt=Task.attempt + 1,
             )
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        started = self._db.scalar(stmt) is not None
+        self._db.commit()
+        return started
 
-            task.output_file_id = uploaded.uuid
-            task.output_file_full_path = f"{uploaded.path.rstrip('/')}/{uploaded.filename}.{uploaded.file_extension}"
-            task.state = TaskStateEnum.DONE
-            task.datetime_end = datetime.now(timezone.utc)
+    def _release_reserved(self, task_ids: list[uuid.UUID]) -> None:
+        """Снимает резерв воркера с не начатых задач группы."""
+        stmt = (
+            update(Task)
+            .where(
+                Task.id.in_(task_ids),
+                Task.state == TaskStateEnum.PENDING,
+                Task.lease_owner == self._worker_id,
+            )
+            .values(
+                lease_owner=None,
+                lease_expires_at=None,
+                datetime_update=Task.datetime_update,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            self._db.rollback()
+            self._db.execute(stmt)
             self._db.commit()
+        except Exception as e:
+            # Резерв истечёт сам через lease_sec
+            print(f"Failed to release reserved tasks {task_ids}: {e}")
+
+    def run(
+        self,
+        task_id: uuid.UUID,
+        timings: StageTimings | None = None,
+        shared_input: dict[str, bytes] | None = None,
+    ) -> None:
+        """Запускает выполнение алгоритма обработки данных.
+
+        Args:
+            task_id (uuid.UUID): Идентификатор задачи.
+            timings (StageTimings | None): Накопитель длительностей этапов, если
+                часть этапов (захват задачи) уже замерена вызывающей стороной.
+            shared_input (dict[str, bytes] | None): Скачанные входные файлы по
+                идентификатору, общие для группы задач; вход задачи с одним
+                файлом берётся отсюда или скачивается и сохраняется сюда.
+        """
+        # Первичный ключ составной (id, datetime_create), поэтому не db.get()
+        task = self._db.scalars(select(Task).where(Task.id == task_id)).first()
+        if task is None:
+            raise TaskNotFoundError(f"Task with id {task_id} not found.")
+        if task.state != TaskStateEnum.RUNNING:
+            self._mark_running(task)
+
+        # Просроченная задача завершается до скачивания входного файла.
+        if self._is_expired(task):
+            self._stop(task, ErrorCodeEnum.TASK_EXPIRED, "Task expired before start")
+            return
+
+        timings = timings or StageTimings()
+        algorithm_name = task.algorithm
+        bucket = size_bucket(None)
+        heartbeat = LeaseHeartbeat(
+            self._db.get_bind(), task_id, self._worker_id, self._lease_sec
+        )
+        # Потеря аренды прерывает операцию GDAL так же, как отмена
+        progress = TaskProgress(
+            sync=lambda percent, eta: (
+                self._sync_progress(task_id, percent, eta, timings) or heartbeat.lost
+            ),
+            interval_sec=self._progress_interval,
+        )
+        profiler = TaskProfiler(enabled=task.collect_profile)
+        input_size: int | None = None
+        output_size: int | None = None
+        memory_estimate: int | None = None
+        reset_peak_rss()
+        # GDAL импортируется лениво: этот модуль загружает и процесс API
+        from .algorithms.vsimem import reset_vsimem_peak
+
+        reset_vsimem_peak()
+
+        TASKS_IN_PROGRESS.labels(algorithm_name).inc()
+        try:
+            with heartbeat:
+                algorithm = AlgorithmAbstractFactory.get_algorithm(task.algorithm)
+                params = algorithm.get_pydantic_model().model_validate(task.params)
+
+                input_ids = task.input_file_ids or [task.input_file_id]
+                if len(input_ids) > 1 and not isinstance(
+                    algorithm, MultiInputAlgorithm
+                ):
+                    raise ValueError(
+                        f"Algorithm {algorithm_name} accepts a single input file"
+                    )
+                with timings.measure("meta_fetch"):
+                    metas = self._fetch_metas(input_ids)
+                # Имя, путь и расширение результата берутся от первого входа
+                file_meta = metas[0]
+                total_size = sum(meta.size for meta in metas)
+                bucket = size_bucket(total_size)
+
+                # Крупная задача ждёт здесь, пока в общем бюджете не освободится
+                # память, а не падает по OOM вместе с процессом.
+                memory_estimate = algorithm.estimate_peak_memory(total_size, params)
+                if self._memory_budget is not None:
+                    with timings.measure("admission"):
+                        self._memory_budget.reserve(
+                            self._budget_slot,
+                            memory_estimate,
+                            on_wait=lambda: self._raise_if_cancelled(progress),
+                            wait_interval_sec=self._progress_interval,
+                        )
+
+                if len(metas) == 1:
+                    file_bytes = (
+                        shared_input.get(input_ids[0])
+                        if shared_input is not None
+                        else None
+                    )
+                    if file_bytes is None:
+                        with timings.measure("download"):
+                            file_bytes = self._file_service.get_file(input_ids[0])
+                        BYTES_IN.labels(algorithm_name).inc(len(file_bytes))
+                        if shared_input is not None:
+                            shared_input[input_ids[0]] = file_bytes
+                    input_size = len(file_bytes)
+                    self._raise_if_cancelled(progress)
+
+                    with timings.measure("algorithm"), profiler:
+                        output_bytes = algorithm.run(
+                            file_bytes,
+                            file_ext=file_meta.file_extension,
+                            params=params,
+                            progress=progress,
+                        )
+                    del file_bytes
+                else:
+                    # Скачивание идёт параллельно с записью входов в /vsimem,
+                    # поэтому этап algorithm включает ожидание файлов; чистое
+                    # ожидание скачивания учитывается отдельно в download.
+                    inputs = self._download_inputs(
+                        metas, algorithm_name, progress, timings
+                    )
+                    with timings.measure("algorithm"), profiler:
+                        output_bytes = algorithm.run_inputs(
+                            inputs, params=params, progress=progress
+                        )
+                    input_size = total_size
+                self._raise_if_cancelled(progress)
+
+                file_name = f"processed_{file_meta.filename}"
+                file_extension = algorithm.output_extension(
+                    file_meta.file_extension, params
+                )
+                file_path = file_meta.path
+
+                with timings.measure("upload"):
+                    uploaded = self._file_service.post_file(
+                        filename=file_name,
+                        file_extension=file_extension,
+                        path=file_path,
+                        file_content=output_bytes,
+                        comment=(
+                            f"Processed file: {file_meta.filename}\n"
+                            f"uuid: {file_meta.uuid}\nalgorithm: {algorithm.name()}\nparams: {params.model_dump()}"
+                        ),
+                    )
+                output_size = len(output_bytes)
+                BYTES_OUT.labels(algorithm_name).inc(output_size)
+                del output_bytes
+
+                profile_file_id = None
+                if profiler.enabled:
+                    with timings.measure("profile_upload"):
+                        profile_file_id = self._upload_profile(
+                            profiler, file_name, file_path, task_id
+                        )
+
+                # Строка блокируется до коммита: reaper не заберёт задачу между
+                # проверкой аренды и записью результата.
+                if not self._owns_lease(task_id):
+                    raise LeaseLostError(f"Task {task_id} lease was lost")
+                task.profile = self._build_profile(
+                    timings, input_size, output_size, memory_estimate, profile_file_id
+                )
+                task.lease_expires_at = None
+                task.result = algorithm.result
+                task.output_file_id = uploaded.uuid
+                task.output_file_full_path = f"{uploaded.path.rstrip('/')}/{uploaded.filename}.{uploaded.file_extension}"
+                task.state = TaskStateEnum.DONE
+                task.progress = 100.0
+                task.datetime_eta = None
+                task.datetime_end = datetime.now(timezone.utc)
+                with timings.measure("db_commit"):
+                    self._db.commit()
 
         except Exception as e:
+            self._db.rollback()
+            # Задачу, отданную reaper'ом другому воркеру, не трогаем: результат
+            # этой попытки (в том числе загруженный файл) отбрасывается.
+            if isinstance(e, LeaseLostError) or not self._owns_lease(task_id):
+                self._db.rollback()  # снимает блокировку строки из _owns_lease
+                raise LeaseLostError(f"Task {task_id} lease was lost: {e}")
+            # Прерванная через callback операция GDAL выглядит как обычная ошибка,
+            # поэтому отмену определяем по флагу, а не по типу исключения.
+            if progress.cancelled or isinstance(e, TaskCancelledError):
+                self._stop(
+                    task, ErrorCodeEnum.TASK_CANCELLED, "Task cancelled by request"
+                )
+                return
+            error_code = self._error_code(e, timings.current)
             task.state = TaskStateEnum.ERROR
             task.error = str(e)
+            task.error_code = error_code.value
+            task.profile = self._build_profile(
+                timings, input_size, output_size, memory_estimate
+            )
+            task.lease_expires_at = None
             task.datetime_end = datetime.now(timezone.utc)
             self._db.commit()
+            ERRORS.labels(error_code.name).inc()
             raise AlgorithmExecutionError(f"Algorithm execution failed: {e}")
+
+        finally:
+            if self._memory_budget is not None:
+                self._memory_budget.release(self._budget_slot)
+            TASKS_IN_PROGRESS.labels(algorithm_name).dec()
+            TASKS_FINISHED.labels(algorithm_name, task.state.value).inc()
+            timings.observe(algorithm_name, bucket)
+
+    def _fetch_metas(self, file_ids: list[str]) -> list[FileMeta]:
+        """Получает метаданные входных файлов, для нескольких - параллельно."""
+        if len(file_ids) == 1:
+            return [self._file_service.get_file_meta(file_ids[0])]
+        with ThreadPoolExecutor(
+            max_workers=self._download_concurrency, thread_name_prefix="file-meta"
+        ) as pool:
+            return list(pool.map(self._file_service.get_file_meta, file_ids))
+
+    def _download_inputs(
+        self,
+        metas: list[FileMeta],
+        algorithm_name: str,
+        progress: TaskProgress,
+        timings: StageTimings,
+    ) -> Iterator[tuple[bytes, str]]:
+        """Скачивает входные файлы параллельно и отдаёт их в исходном порядке.
+
+        Вперёд скачивается не больше `download_concurrency` файлов: пока
+        алгоритм переносит очередной вход в /vsimem, следующие уже качаются,
+        но скачанные и ещё не взятые байты не копятся в памяти без предела.
+
+        Args:
+            metas (list[FileMeta]): Метаданные входных файлов.
+            algorithm_name (str): Название алгоритма для метрик.
+            progress (TaskProgress): Прогресс задачи для проверки отмены между входами.
+            timings (StageTimings): Накопитель длительностей этапов.
+        Yields:
+            tuple[bytes, str]: Байты и расширение очередного входного файла.
+        """
+        remaining = iter(metas)
+        with ThreadPoolExecutor(
+            max_workers=self._download_concurrency, thread_name_prefix="download"
+        ) as pool:
+            pending = deque()
+            for meta in remaining:
+                pending.append(
+                    (meta, pool.submit(self._file_service.get_file, meta.uuid))
+                )
+                if len(pending) == self._download_concurrency:
+                    break
+            try:
+                while pending:
+                    meta, future = pending.popleft()
+                    started = time.perf_counter()
+                    data = future.result()
+                    timings.add("download", time.perf_counter() - started)
+                    next_meta = next(remaining, None)
+                    if next_meta is not None:
+                        pending.append(
+                            (
+                                next_meta,
+                                pool.submit(
+                                    self._file_service.get_file, next_meta.uuid
+                                ),
+                            )
+                        )
+                    BYTES_IN.labels(algorithm_name).inc(len(data))
+                    self._raise_if_cancelled(progress)
+                    yield data, meta.file_extension
+                    del data
+            finally:
+                # При ошибке или отмене не ждём скачивания ещё не начатых файлов
+                for _, future in pending:
+                    future.cancel()
+
+    def _upload_profile(
+        self, profiler: TaskProfiler, file_name: str, file_path: str, task_id: uuid.UUID
+    ) -> str:
+        """Загружает дамп cProfile в файловое хранилище рядом с результатом."""
+        uploaded = self._file_service.post_file(
+            filename=f"profile_{file_name}",
+            file_extension="prof",
+            path=file_path,
+            file_content=profiler.dump(),
+            comment=f"cProfile dump (pstats) for task {task_id}",
+        )
+        return uploaded.uuid
+
+    @staticmethod
+    def _build_profile(
+        timings: StageTimings,
+        input_size: int | None,
+        output_size: int | None,
+        memory_estimate: int | None = None,
+        profile_file_id: str | None = None,
+    ) -> dict:
+        """Собирает профиль выполнения задачи для колонки Task.profile.
+
+        Длительность финального коммита в профиль не попадает (профиль
+        сохраняется этим же коммитом); она есть в метрике db_commit.
+        """
+        from .algorithms.vsimem import memory_stats
+
+        profile = {
+            "timings_sec": {
+                stage: round(seconds, 4) for stage, seconds in timings.seconds.items()
+            },
+            "input_bytes": input_size,
+            "output_bytes": output_size,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "memory_estimate_bytes": memory_estimate,
+            **memory_stats(),
+        }
+        if profile_file_id is not None:
+            profile["profile_file_id"] = profile_file_id
+        return profile
+
+    @staticmethod
+    def _error_code(error: Exception, stage: str | None) -> ErrorCodeEnum:
+        """Сопоставляет исключение и этап, на котором оно возникло, коду ошибки."""
+        if isinstance(error, FileServiceFileNotFoundError):
+            return ErrorCodeEnum.INPUT_FILE_NOT_FOUND
+        if isinstance(error, FileAlreadyExistsError):
+            return ErrorCodeEnum.OUTPUT_FILE_ALREADY_EXISTS
+        if stage == "algorithm":
+            return ErrorCodeEnum.ALGORITHM_EXECUTION_FAILED
+        if stage == "upload":
+            return ErrorCodeEnum.FILE_CREATION_FAILED
+        if isinstance(error, ValueError):
+            # Неизвестный алгоритм или ValidationError параметров
+            return ErrorCodeEnum.INVALID_INPUT_PARAMS
+        return ErrorCodeEnum.UNKNOWN_ERROR
+
+    @staticmethod
+    def _is_expired(task: Task) -> bool:
+        return (
+            task.datetime_expiration is not None
+            and task.datetime_expiration <= datetime.now(timezone.utc)
+        )
+
+    def _sync_progress(
+        self,
+        task_id: uuid.UUID,
+        percent: float | None,
+        eta: datetime | None,
+        timings: StageTimings,
+    ) -> bool:
+        """Записывает прогресс задачи и возвращает флаг отмены за один запрос."""
+        started = time.perf_counter()
+        try:
+            if percent is None:
+                stmt = select(Task.cancel_requested).where(Task.id == task_id)
+                return bool(self._db.scalar(stmt))
+            stmt = (
+                update(Task)
+                .where(Task.id == task_id)
+                .values(progress=percent, datetime_eta=eta)
+                .returning(Task.cancel_requested)
+            )
+            cancelled = bool(self._db.scalar(stmt))
+            self._db.commit()
+            return cancelled
+        finally:
+            timings.add("db_progress", time.perf_counter() - started)
+
+    def _owns_lease(self, task_id: uuid.UUID) -> bool:
+        """Блокирует строку задачи и проверяет, что воркер всё ещё её владелец."""
+        stmt = (
+            select(Task.state, Task.lease_owner)
+            .where(Task.id == task_id)
+            .with_for_update()
+        )
+        row = self._db.execute(stmt).one_or_none()
+        return (
+            row is not None
+            and row.state == TaskStateEnum.RUNNING
+            and row.lease_owner == self._worker_id
+        )
+
+    @staticmethod
+    def _raise_if_cancelled(progress: TaskProgress) -> None:
+        if progress.check():
+            raise TaskCancelledError("Task cancelled by request")
+
+    def _stop(self, task: Task, error_code: ErrorCodeEnum, message: str) -> None:
+        task.state = TaskStateEnum.STOPPED
+        task.lease_expires_at = None
+        task.error = message
+        task.error_code = error_code.value
+        task.datetime_end = datetime.now(timezone.utc)
+        self._db.commit()
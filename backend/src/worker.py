@@ -0,0 +1,240 @@
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+
+from prometheus_client import multiprocess, start_http_server
+from sqlalchemy import text
+
+from src.config import WorkerConfig, fs_config, worker_config
+from src.injectors.connections import (
+    create_database,
+    create_engine,
+    initialize_database,
+)
+from src.services import (
+    AlgorithmAbstractFactory,
+    FairShareClaimPolicy,
+    FileService,
+    MemoryBudget,
+    WorkerService,
+    WorkerServiceError,
+)
+from src.services.metrics import build_registry
+from src.services.profiling import current_rss_bytes
+
+_MB = 1024 * 1024
+# Пауза перед повторным запуском процесса, завершившегося с ошибкой,
+# чтобы падение при старте не превращалось в бесконечный цикл fork
+_RESPAWN_BACKOFF_SEC = 1.0
+
+_stop_requested = False
+
+
+def _request_stop(signum, frame) -> None:
+    """Обработчик SIGTERM/SIGINT: воркер завершится после текущей задачи."""
+    global _stop_requested
+    _stop_requested = True
+
+
+def _should_recycle(config: WorkerConfig, tasks_done: int) -> bool:
+    """Проверяет, пора ли перезапустить дочерний процесс.
+
+    GDAL и аллокатор не всегда возвращают память системе, поэтому процесс
+    заменяется свежим после `max_tasks_per_child` задач или при превышении
+    `max_rss_mb`.
+    """
+    if config.max_tasks_per_child and tasks_done >= config.max_tasks_per_child:
+        return True
+    return bool(config.max_rss_mb) and current_rss_bytes() > config.max_rss_mb * _MB
+
+
+def _serve_metrics(port: int) -> None:
+    """Процесс HTTP-сервера метрик.
+
+    Сервер работает в отдельном процессе: его поток в супервизоре был бы
+    унаследован дочерними процессами при fork вместе с захваченными блокировками.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    start_http_server(port, registry=build_registry())
+    while True:
+        time.sleep(3600)
+
+
+def _child_main(
+    config: WorkerConfig, slot: int, memory_budget: MemoryBudget | None
+) -> None:
+    """Цикл дочернего процесса: захватывает задачи из очереди по одной."""
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    # Пул соединений наследуется от супервизора пустым; открываем соединение
+    # заранее, чтобы первая задача не ждала подключения к БД.
+    with create_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    # PROJ (и его соединение с proj.db) прогревается уже после fork
+    from src.services.algorithms.warmup import warm_up_gdal
+
+    warm_up_gdal()
+    session_factory = create_database()
+    file_service = FileService(
+        host=fs_config.host,
+        port=fs_config.port,
+        timeout_seconds=fs_config.timeout_seconds,
+    )
+
+    tasks_done = 0
+    while not _stop_requested:
+        with session_factory() as db:
+            worker_service = WorkerService(
+                db=db,
+                file_service=file_service,
+                claim_policy=FairShareClaimPolicy(
+                    db,
+                    tenant_weights=config.tenant_weights,
+                    default_weight=config.default_tenant_weight,
+                ),
+                progress_interval_sec=config.progress_interval_sec,
+                lease_sec=config.lease_sec,
+                download_concurrency=config.download_concurrency,
+                affinity_group_size=config.affinity_group_size,
+                memory_budget=memory_budget,
+                budget_slot=slot,
+            )
+            try:
+                ran = worker_service.run_next(should_stop=lambda: _stop_requested)
+            except WorkerServiceError as e:
+                print(f"Task failed: {e}")
+                ran = 1
+
+        if not ran:
+            time.sleep(config.poll_interval_sec)
+            continue
+        tasks_done += ran
+        if _should_recycle(config, tasks_done):
+            print(
+                f"Worker {os.getpid()} recycled after {tasks_done} tasks, "
+                f"rss={current_rss_bytes() // _MB} MB"
+            )
+            return
+
+
+class WorkerSupervisor:
+    """Супервизор пула прогретых процессов-воркеров.
+
+    Родительский процесс один раз загружает GDAL (с драйверами) и реализации
+    алгоритмов, после чего порождает дочерние процессы через fork: они
+    наследуют загруженные модули, а PROJ прогревают сами до первой задачи.
+    Завершившийся процесс заменяется новым. По SIGTERM дочерние процессы
+    дорабатывают текущую задачу и выходят, возвращая в очередь не начатые
+    задачи группы; не успевшие за `shutdown_timeout_sec` завершаются
+    принудительно.
+    """
+
+    def __init__(self, config: WorkerConfig):
+        self._config = config
+        self._ctx = multiprocessing.get_context("fork")
+        self._children: dict[int, BaseProcess] = {}
+        self._stopping = False
+        self._memory_budget = (
+            MemoryBudget(
+                limit_bytes=config.memory_budget_mb * _MB,
+                slots=config.processes,
+                starvation_sec=config.admission_starvation_sec,
+                ctx=self._ctx,
+            )
+            if config.memory_budget_mb
+            else None
+        )
+
+    def request_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        """Запускает дочерние процессы и следит за ними до остановки."""
+        for slot in range(self._config.processes):
+            self._spawn(slot)
+
+        while not self._stopping:
+            slots = {process.sentinel: slot for slot, process in self._children.items()}
+            for sentinel in wait(list(slots), timeout=1.0):
+                slot = slots[sentinel]
+                exitcode = self._reap(slot)
+                if self._stopping:
+                    break
+                if exitcode != 0:
+                    print(f"Worker slot {slot} exited with code {exitcode}")
+                    time.sleep(_RESPAWN_BACKOFF_SEC)
+                self._spawn(slot)
+
+        self._drain()
+
+    def _spawn(self, slot: int) -> None:
+        # Не демонический процесс: алгоритмы могут порождать собственные пулы
+        process = self._ctx.Process(
+            target=_child_main,
+            args=(self._config, slot, self._memory_budget),
+            name=f"geo-worker-{slot}",
+            daemon=False,
+        )
+        process.start()
+        self._children[slot] = process
+
+    def _reap(self, slot: int) -> int | None:
+        process = self._children.pop(slot)
+        process.join()
+        # Резерв памяти убитого (например, по OOM) процесса иначе бы утёк
+        if self._memory_budget is not None:
+            self._memory_budget.release(slot)
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            multiprocess.mark_process_dead(process.pid)
+        return process.exitcode
+
+    def _drain(self) -> None:
+        for process in self._children.values():
+            process.terminate()
+
+        deadline = time.monotonic() + self._config.shutdown_timeout_sec
+        for process in self._children.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"Worker {process.pid} did not stop in time, killing")
+                process.kill()
+        for slot in list(self._children):
+            self._reap(slot)
+
+
+def main() -> None:
+    """Точка входа воркера: прогрев в супервизоре и запуск дочерних процессов."""
+    supervisor = WorkerSupervisor(worker_config)
+    signal.signal(signal.SIGTERM, supervisor.request_stop)
+    signal.signal(signal.SIGINT, supervisor.request_stop)
+
+    if worker_config.metrics_port:
+        multiprocessing.get_context("fork").Process(
+            target=_serve_metrics,
+            args=(worker_config.metrics_port,),
+            name="geo-worker-metrics",
+            daemon=True,
+        ).start()
+
+    # Реализации алгоритмов (и GDAL) загружаются лениво; супервизор загружает
+    # их и регистрирует драйверы до fork, чтобы не платить за это в каждом
+    # дочернем процессе. Ни потоков, ни открытых файлов PROJ у супервизора
+    # к моменту fork нет.
+    AlgorithmAbstractFactory.list_algorithms()
+    from src.services.algorithms.warmup import register_gdal_drivers
+
+    register_gdal_drivers()
+
+    initialize_database()
+    # Соединения нельзя разделять между процессами: закрываем пул до fork
+    create_engine().dispose()
+
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()
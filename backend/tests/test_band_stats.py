@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.services.algorithms.band_stats import BandAccumulator
+
+
+def test_windows_merge_to_whole_array_statistics():
+    rng = np.random.default_rng(0)
+    # Большое смещение: наивная сумма квадратов здесь теряет точность
+    values = rng.normal(1e6, 3.0, size=10_000)
+    accumulator = BandAccumulator()
+    for window in np.array_split(values, [1, 17, 4000, 4001, 9000]):
+        accumulator.update(window)
+
+    stats = accumulator.as_dict()
+
+    assert stats["count"] == values.size
+    assert stats["min"] == values.min()
+    assert stats["max"] == values.max()
+    assert stats["mean"] == pytest.approx(values.mean(), rel=1e-12)
+    assert stats["stddev"] == pytest.approx(values.std(), rel=1e-9)
+
+
+def test_integer_windows_are_widened_before_summing():
+    values = np.full(1000, 250, dtype=np.uint8)
+    accumulator = BandAccumulator()
+    accumulator.update(values[:400])
+    accumulator.update(values[400:])
+
+    stats = accumulator.as_dict()
+
+    assert stats["mean"] == 250.0
+    assert stats["stddev"] == 0.0
+
+
+def test_empty_windows_are_ignored():
+    accumulator = BandAccumulator()
+    accumulator.update(np.array([], dtype=np.float32))
+    accumulator.update(np.array([1.0, 3.0]))
+    accumulator.update(np.array([], dtype=np.float32))
+
+    stats = accumulator.as_dict()
+
+    assert stats["count"] == 2
+    assert stats["mean"] == 2.0
+    assert stats["stddev"] == 1.0
+
+
+def test_band_without_valid_pixels():
+    accumulator = BandAccumulator(nodata_count=5)
+
+    assert accumulator.as_dict() == {
+        "count": 0,
+        "nodata_count": 5,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "stddev": None,
+    }
+    assert accumulator.min == math.inf
@@ -0,0 +1,33 @@
+from benchmarks.regressions import compare
+
+
+def test_reports_metrics_above_tolerance():
+    baseline = {"A/x": {"seconds": 1.0, "peak_rss_mb": 100.0}}
+    results = {"A/x": {"seconds": 1.5, "peak_rss_mb": 110.0}}
+
+    assert compare(results, baseline, tolerance=0.2) == [
+        "A/x: seconds 1.0 -> 1.5 (+50%)"
+    ]
+
+
+def test_change_within_tolerance_is_not_a_regression():
+    baseline = {"A/x": {"seconds": 1.0, "peak_rss_mb": 100.0}}
+    results = {"A/x": {"seconds": 1.2, "peak_rss_mb": 90.0}}
+
+    assert compare(results, baseline, tolerance=0.2) == []
+
+
+def test_new_cases_and_errors_are_skipped():
+    baseline = {
+        "A/x": {"error": "boom"},
+        "A/y": {"seconds": 1.0, "peak_rss_mb": 100.0},
+        "A/z": {"seconds": 0, "peak_rss_mb": 100.0},
+    }
+    results = {
+        "A/x": {"seconds": 9.0, "peak_rss_mb": 900.0},
+        "A/y": {"error": "boom"},
+        "A/z": {"seconds": 5.0, "peak_rss_mb": 100.0},
+        "B/new": {"seconds": 9.0, "peak_rss_mb": 900.0},
+    }
+
+    assert compare(results, baseline, tolerance=0.2) == []
@@ -0,0 +1,51 @@
+import pytest
+
+from loadtest.run import summarize
+
+
+def _task(state: str, created_sec: float, ended_sec: float, **extra) -> dict:
+    return {
+        "state": state,
+        "datetime_create": f"2026-01-01T00:00:{created_sec:06.3f}+00:00",
+        "datetime_end": f"2026-01-01T00:00:{ended_sec:06.3f}+00:00",
+        **extra,
+    }
+
+
+def test_nothing_done():
+    finished = {"1": _task("ERROR", 0, 1)}
+
+    assert summarize(finished, submit_errors=2) == {
+        "finished": 1,
+        "done": 0,
+        "failed": 1,
+        "submit_errors": 2,
+    }
+
+
+def test_latency_prefers_client_measurement():
+    finished = {
+        "1": _task("DONE", 0, 1, client_latency_sec=3.0),
+        "2": _task("DONE", 1, 3, client_latency_sec=5.0),
+        "3": _task("ERROR", 2, 4),
+    }
+
+    summary = summarize(finished, submit_errors=0)
+
+    assert summary["done"] == 2
+    assert summary["failed"] == 1
+    assert summary["latency_max_sec"] == 5.0
+    assert summary["latency_mean_sec"] == 4.0
+    assert summary["server_latency_max_sec"] == 2.0
+    assert summary["server_latency_mean_sec"] == 1.5
+    # Две задачи от первого создания до последнего завершения за 3 с
+    assert summary["tasks_per_sec"] == pytest.approx(0.667)
+
+
+def test_latency_falls_back_to_server_timestamps():
+    finished = {str(i): _task("DONE", i, i + 2) for i in range(10)}
+
+    summary = summarize(finished, submit_errors=0)
+
+    assert summary["latency_p50_sec"] == 2.0
+    assert summary["latency_p99_sec"] == summary["server_latency_p99_sec"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.services.scheduling import FairShareClaimPolicy
+
+_T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _head(client_id: str, priority: int = 5, age_sec: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(
+        client_id=client_id,
+        priority=priority,
+        datetime_create=_T0 - timedelta(seconds=age_sec),
+    )
+
+
+def _clients(heads) -> list[str]:
+    return [head.client_id for head in heads]
+
+
+def test_client_with_fewer_running_tasks_goes_first():
+    policy = FairShareClaimPolicy(MagicMock())
+    heads = [_head("a", priority=9), _head("b", priority=1)]
+
+    ranked = policy.rank_heads(heads, {"a": 2, "b": 1})
+
+    assert _clients(ranked) == ["b", "a"]
+
+
+def test_running_share_is_divided_by_weight():
+    policy = FairShareClaimPolicy(MagicMock(), tenant_weights={"a": 4.0})
+    heads = [_head("a"), _head("b")]
+
+    # a: 3 / 4 = 0.75, b: 1 / 1 = 1.0
+    ranked = policy.rank_heads(heads, {"a": 3, "b": 1})
+
+    assert _clients(ranked) == ["a", "b"]
+
+
+def test_equal_share_is_broken_by_priority_then_age():
+    policy = FairShareClaimPolicy(MagicMock())
+    heads = [
+        _head("low", priority=1, age_sec=100),
+        _head("new", priority=7, age_sec=1),
+        _head("old", priority=7, age_sec=50),
+    ]
+
+    ranked = policy.rank_heads(heads, {})
+
+    assert _clients(ranked) == ["old", "new", "low"]
+
+
+def test_weight_uses_default_and_stays_positive():
+    policy = FairShareClaimPolicy(
+        MagicMock(), tenant_weights={"zero": 0.0}, default_weight=2.0
+    )
+
+    assert policy.weight("unknown") == 2.0
+    assert policy.weight("zero") > 0
+
+
+def test_claim_tries_heads_in_ranked_order_until_one_is_locked():
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [_head("a"), _head("b"), _head("c")]
+    policy = FairShareClaimPolicy(db)
+    policy._running_counts = MagicMock(return_value={"a": 2, "b": 1})
+    task = object()
+    # c (0 running) уже заблокирована другим воркером, следующей идёт b
+    policy._lock_head = MagicMock(side_effect=[None, task])
+
+    assert policy.claim() is task
+    assert [call.args[0] for call in policy._lock_head.call_args_list] == ["c", "b"]
+
+
+def test_claim_returns_none_when_every_head_is_locked():
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [_head("a")]
+    policy = FairShareClaimPolicy(db)
+    policy._running_counts = MagicMock(return_value={})
+    policy._lock_head = MagicMock(return_value=None)
+
+    assert policy.claim() is None
+
+
+def test_claim_same_input_selects_unreserved_single_input_tasks_of_the_client():
+    db = MagicMock()
+    db.scalars.return_value = iter([])
+    task = SimpleNamespace(id="head", input_file_id="file-1", client_id="acme")
+
+    FairShareClaimPolicy(db).claim_same_input(task, limit=3)
+
+    sql = str(db.scalars.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "tasks.input_file_id = %(input_file_id_1)s" in sql
+    assert "tasks.client_id = %(client_id_1)s" in sql
+    assert "tasks.input_file_ids IS NULL" in sql
+    assert "tasks.lease_expires_at IS NULL OR tasks.lease_expires_at < now()" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
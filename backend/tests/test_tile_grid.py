@@ -0,0 +1,56 @@
+import pytest
+
+from src.services.algorithms.tile_grid import (
+    MAX_ZOOM,
+    ORIGIN,
+    native_zoom,
+    tile_rows,
+    tile_span,
+)
+
+
+def test_tile_span_halves_with_each_zoom():
+    assert tile_span(0) == 2 * ORIGIN
+    assert tile_span(1) == ORIGIN
+    assert tile_span(10) == pytest.approx(2 * ORIGIN / 1024)
+
+
+def test_native_zoom_is_not_coarser_than_raster():
+    # На уровне z пиксель 256-тайла равен 2 * ORIGIN / 256 / 2**z метров
+    pixel_z10 = 2 * ORIGIN / 256 / 1024
+    assert native_zoom(pixel_z10, 256) == 10
+    assert native_zoom(pixel_z10 * 1.5, 256) == 10
+    assert native_zoom(pixel_z10 * 0.9, 256) == 11
+    assert native_zoom(pixel_z10, 512) == 9
+
+
+def test_native_zoom_is_clamped():
+    assert native_zoom(1e9, 256) == 0
+    assert native_zoom(1e-6, 256) == MAX_ZOOM
+
+
+def test_whole_world_covers_every_tile():
+    world = (-ORIGIN, -ORIGIN, ORIGIN, ORIGIN)
+
+    assert tile_rows(world, 0) == [(0, 0, 0)]
+    assert tile_rows(world, 2) == [(y, 0, 3) for y in range(4)]
+
+
+def test_rows_go_from_north_to_south():
+    # Северо-восточная четверть мира на уровне 1 - тайл x=1, y=0
+    assert tile_rows((1.0, 1.0, ORIGIN, ORIGIN), 1) == [(0, 1, 1)]
+    # Юго-западная четверть - тайл x=0, y=1
+    assert tile_rows((-ORIGIN, -ORIGIN, -1.0, -1.0), 1) == [(1, 0, 0)]
+
+
+def test_bounds_on_tile_edge_do_not_add_neighbour_tiles():
+    span = tile_span(3)
+    bounds = (-ORIGIN + span, ORIGIN - 3 * span, -ORIGIN + 3 * span, ORIGIN - span)
+
+    assert tile_rows(bounds, 3) == [(1, 1, 2), (2, 1, 2)]
+
+
+def test_bounds_outside_the_grid_are_clipped():
+    bounds = (-2 * ORIGIN, -2 * ORIGIN, 2 * ORIGIN, 2 * ORIGIN)
+
+    assert tile_rows(bounds, 1) == [(0, 0, 1), (1, 0, 1)]
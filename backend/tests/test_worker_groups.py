@@ -0,0 +1,145 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.orm_models import TaskStateEnum
+from src.services.workers import WorkerService
+
+
+def _worker(affinity_group_size: int) -> tuple[WorkerService, MagicMock, MagicMock]:
+    db, policy = MagicMock(), MagicMock()
+    worker = WorkerService(
+        db,
+        MagicMock(),
+        claim_policy=policy,
+        worker_id="w1",
+        affinity_group_size=affinity_group_size,
+    )
+    return worker, db, policy
+
+
+def _task(input_file_ids: list[str] | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        state=TaskStateEnum.PENDING,
+        input_file_ids=input_file_ids,
+        attempt=0,
+    )
+
+
+def test_claim_group_returns_empty_list_for_empty_queue():
+    worker, db, policy = _worker(affinity_group_size=4)
+    policy.claim.return_value = None
+
+    assert worker.claim_group() == []
+    db.commit.assert_called_once()
+
+
+def test_claim_group_without_affinity_claims_only_the_head():
+    worker, db, policy = _worker(affinity_group_size=1)
+    head = _task()
+    policy.claim.return_value = head
+
+    assert worker.claim_group() == [head.id]
+    policy.claim_same_input.assert_not_called()
+    assert head.state == TaskStateEnum.RUNNING
+    assert head.lease_owner == "w1"
+    assert head.attempt == 1
+
+
+def test_claim_group_reserves_siblings_but_leaves_them_pending():
+    worker, db, policy = _worker(affinity_group_size=3)
+    head, siblings = _task(), [_task(), _task()]
+    policy.claim.return_value = head
+    policy.claim_same_input.return_value = siblings
+
+    assert worker.claim_group() == [head.id] + [s.id for s in siblings]
+    policy.claim_same_input.assert_called_once_with(head, 2)
+    assert head.state == TaskStateEnum.RUNNING
+    assert all(s.state == TaskStateEnum.PENDING for s in siblings)
+    reserve = db.execute.call_args.args[0]
+    assert reserve.is_update
+    assert "lease_owner" in str(reserve)
+
+
+def test_claim_group_does_not_group_multi_input_head():
+    worker, db, policy = _worker(affinity_group_size=3)
+    head = _task(input_file_ids=["a", "b"])
+    policy.claim.return_value = head
+
+    assert worker.claim_group() == [head.id]
+    policy.claim_same_input.assert_not_called()
+
+
+@patch("src.services.workers.GroupLeaseHeartbeat")
+def test_run_group_isolates_member_failures(heartbeat):
+    worker, db, _ = _worker(affinity_group_size=3)
+    ids = [uuid.uuid4() for _ in range(3)]
+    worker._start_group_member = MagicMock(return_value=True)
+    worker._release_reserved = MagicMock()
+    worker.run = MagicMock(side_effect=[None, RuntimeError("boom"), None])
+
+    assert worker._run_group(ids, MagicMock()) == 3
+
+    assert [call.args[0] for call in worker.run.call_args_list] == ids
+    db.rollback.assert_called_once()
+    worker._release_reserved.assert_not_called()
+    # Вход первой задачи переиспользуется остальными
+    shared = {id(call.kwargs["shared_input"]) for call in worker.run.call_args_list}
+    assert len(shared) == 1
+
+
+@patch("src.services.workers.GroupLeaseHeartbeat")
+def test_run_group_skips_members_that_are_no_longer_reserved(heartbeat):
+    worker, _, _ = _worker(affinity_group_size=3)
+    ids = [uuid.uuid4() for _ in range(3)]
+    worker._start_group_member = MagicMock(side_effect=[False, True])
+    worker._release_reserved = MagicMock()
+    worker.run = MagicMock()
+
+    worker._run_group(ids, MagicMock())
+
+    assert [call.args[0] for call in worker.run.call_args_list] == [ids[0], ids[2]]
+
+
+@patch("src.services.workers.GroupLeaseHeartbeat")
+def test_run_group_releases_waiting_members_when_interrupted(heartbeat):
+    worker, _, _ = _worker(affinity_group_size=3)
+    ids = [uuid.uuid4() for _ in range(3)]
+    worker._release_reserved = MagicMock()
+    worker.run = MagicMock(side_effect=KeyboardInterrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        worker._run_group(ids, MagicMock())
+
+    worker._release_reserved.assert_called_once_with(ids[1:])
+
+
+@patch("src.services.workers.GroupLeaseHeartbeat")
+def test_run_group_stops_before_next_member_and_releases_the_rest(heartbeat):
+    worker, _, _ = _worker(affinity_group_size=4)
+    ids = [uuid.uuid4() for _ in range(4)]
+    worker._start_group_member = MagicMock(return_value=True)
+    worker._release_reserved = MagicMock()
+    worker.run = MagicMock()
+    stop_after_two = iter([False, True])
+
+    started = worker._run_group(ids, MagicMock(), lambda: next(stop_after_two))
+
+    assert started == 2
+    assert [call.args[0] for call in worker.run.call_args_list] == ids[:2]
+    worker._release_reserved.assert_called_once_with(ids[2:])
+
+
+def test_run_next_counts_tasks_not_groups():
+    worker, _, _ = _worker(affinity_group_size=3)
+    ids = [uuid.uuid4() for _ in range(3)]
+    worker.claim_group = MagicMock(return_value=ids)
+    worker._run_group = MagicMock(return_value=3)
+
+    assert worker.run_next() == 3
+
+    worker.claim_group.return_value = []
+    assert worker.run_next() == 0